@@ -0,0 +1,314 @@
+"""
+Micro-benchmarks de los caminos calientes del cliente, con líneas de referencia.
+
+Cada caso se mide con datos sintéticos de 10, 100, 1000 y 10000 líneas (los
+que no dependen del tamaño, como generar un código de barras, se miden por
+operación). El tiempo es el mínimo por llamada de varias repeticiones
+(timeit). Los resultados se comparan con benchmarks/baselines.json y el
+proceso sale con código 1 si algún caso empeora más que la tolerancia.
+
+Casos:
+  scan_lookup            PackingEngine.find_product_id_by_scan (último producto del pedido)
+  scan_apply             PackingEngine.scan (escaneo aceptado + diario desactivado)
+  progress               PackingEngine.product_progress + all_products_complete
+  populate_order_rows    Carga del pedido y filas de la tabla de productos (sin Tk)
+  populate_order_tree    populate_current_order_products_table: TreeModel.sync en un ttk.Treeview (*)
+  process_list_rows      fetch_and_populate: filas del listado + índice de búsqueda (sin Tk)
+  process_list_tree      fetch_and_populate: VirtualTreeview.set_rows (*)
+  detail_json            fast_json.loads de la respuesta de PACKING_VIEW
+  detail_decode          PACKING_VIEW -> ProcessDetail (JSON + modelos)
+  barcode_render         render_barcode_image (la parte PIL de create_barcode_widget)
+  thumbnail_decode       decode_thumbnail de una imagen de producto JPEG 600x600
+  (*) necesitan pantalla; sin ella se omiten.
+
+Uso:
+    python -m benchmarks.bench_hot_paths                   (compara con las líneas de referencia)
+    python -m benchmarks.bench_hot_paths --quick --filter scan
+    python -m benchmarks.bench_hot_paths --save            (guarda los resultados como referencia)
+"""
+import io
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+
+from controllers.warehouse.packing_engine import PackingEngine
+from models.packing import ProcessDetail
+from services import fast_json
+from tools.fake_packing_api import sample_process_order, sample_process_detail
+
+SIZES = (10, 100, 1000, 10000)
+PER_OPERATION = (1,)
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Un caso empeora si tarda más de (1 + tolerancia) veces su referencia
+DEFAULT_TOLERANCE = 1.0
+# ...y además la diferencia supera este margen (ruido de los casos de menos de 1 µs).
+# Los cambios que interesan (búsquedas lineales, trabajo cuadrático) son de varias veces.
+MIN_DELTA = 1e-6
+
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes=SIZES, needs_display=False):
+    """Registra setup(n) -> función a medir."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes, needs_display)
+        return setup
+    return register
+
+
+# ----------------------------------------------------------------------
+# Datos sintéticos
+# ----------------------------------------------------------------------
+def order_detail(lines, quantity=None):
+    """ProcessDetail con un único pedido pendiente de 'lines' líneas."""
+    order = sample_process_order(0, lines, finished=False)
+    if quantity is not None:
+        for line in order["packing_process_order_product"]:
+            line["quantity"] = quantity
+    return ProcessDetail.from_response({
+        "success": True,
+        "data": {"process": {"id": 1, "packing_process_orders": [order]}, "pendingProcessOrder": order},
+    })
+
+def loaded_engine(lines, quantity=None):
+    engine = PackingEngine(None, 1)
+    engine.load(order_detail(lines, quantity))
+    return engine
+
+def detail_payload(lines):
+    """Respuesta de PACKING_VIEW (bytes) con 'lines' líneas en total (10 por pedido)."""
+    return json.dumps(sample_process_detail(max(1, lines // 10), min(lines, 10))).encode("utf-8")
+
+def list_processes(count):
+    """Filas del listado de procesos de packing (paginador de PACKING_LIST)."""
+    return [
+        {
+            "id": i,
+            "name": f"Packing {i}",
+            "started_at": "2024-03-01 09:00:00",
+            "finished_at": "2024-03-01 12:00:00" if i % 3 == 0 else None,
+            "created_by": {"name": f"Operario {i % 7}"},
+            "containers": [{"container": {"bar_code": f"CST{i:05d}"}}],
+        }
+        for i in range(count)
+    ]
+
+_tk_root = None
+
+def tk_root():
+    """Ventana Tk oculta compartida por los casos que necesitan widgets."""
+    global _tk_root
+    if _tk_root is None:
+        import tkinter as tk
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
+
+# ----------------------------------------------------------------------
+# Casos
+# ----------------------------------------------------------------------
+@benchmark("scan_lookup")
+def bench_scan_lookup(n):
+    engine = loaded_engine(n)
+    last_code = list(engine.scanned_quantities.values())[-1]["bar_code"]
+    return lambda: engine.find_product_id_by_scan(last_code)
+
+@benchmark("scan_apply")
+def bench_scan_apply(n):
+    engine = loaded_engine(n, quantity=10 ** 9)
+    last_code = list(engine.scanned_quantities.values())[-1]["bar_code"]
+    return lambda: engine.scan(last_code)
+
+@benchmark("progress")
+def bench_progress(n):
+    engine = loaded_engine(n)
+
+    def run():
+        engine.product_progress()
+        engine.all_products_complete()
+    return run
+
+@benchmark("populate_order_rows")
+def bench_populate_order_rows(n):
+    from views.warehouse.packing.show_view import product_row_values, product_scan_tag
+    detail = order_detail(n)
+    engine = PackingEngine(None, 1)
+
+    def run():
+        engine.load(detail)
+        for info in engine.scanned_quantities.values():
+            product_row_values(info)
+            product_scan_tag(info)
+    return run
+
+@benchmark("populate_order_tree", needs_display=True)
+def bench_populate_order_tree(n):
+    from tkinter import ttk
+    from components.tree_model import TreeModel
+    from views.warehouse.packing.show_view import product_row_values, product_scan_tag
+    root = tk_root()
+    tree = ttk.Treeview(root, columns=("producto", "ref", "sku", "cantidad"))
+    model = TreeModel(tree, key=lambda info: info["product_id"], row_values=product_row_values,
+                      row_tags=lambda info: (product_scan_tag(info),))
+    rows = list(loaded_engine(n).scanned_quantities.values())
+
+    def run():
+        model.sync(rows)
+        model.sync([])
+    return run
+
+@benchmark("process_list_rows")
+def bench_process_list_rows(n):
+    from services.search_index import SearchIndex
+    from views.warehouse.packing.list_view import process_row_values, process_search_fields
+    rows = list_processes(n)
+
+    def run():
+        for process in rows:
+            process_row_values(process)
+        SearchIndex(process_search_fields, key=lambda process: process.get("id")).add_many(rows)
+    return run
+
+@benchmark("process_list_tree", needs_display=True)
+def bench_process_list_tree(n):
+    from components.virtual_tree import VirtualTreeview
+    from views.warehouse.packing.list_view import process_row_values
+    root = tk_root()
+    table = VirtualTreeview(root, columns=("ID", "Nombre", "Iniciado", "Finalizado", "Estado", "Creado por", "Acciones"),
+                            row_values=process_row_values, key=lambda process: process.get("id"))
+    rows = list_processes(n)
+
+    def run():
+        table.set_rows(rows)
+        table.set_rows([])
+    return run
+
+@benchmark("detail_json")
+def bench_detail_json(n):
+    payload = detail_payload(n)
+    return lambda: fast_json.loads(payload)
+
+@benchmark("detail_decode")
+def bench_detail_decode(n):
+    payload = detail_payload(n)
+    return lambda: ProcessDetail.from_response(fast_json.loads(payload))
+
+@benchmark("barcode_render", sizes=PER_OPERATION)
+def bench_barcode_render(n):
+    from components.barcode_widget import render_barcode_image
+    return lambda: render_barcode_image("CST00042")
+
+@benchmark("thumbnail_decode", sizes=PER_OPERATION)
+def bench_thumbnail_decode(n):
+    from PIL import Image
+    from views.warehouse.packing.show_view import decode_thumbnail
+    buffer = io.BytesIO()
+    Image.radial_gradient("L").resize((600, 600)).convert("RGB").save(buffer, "JPEG", quality=85)
+    content = buffer.getvalue()
+    return lambda: decode_thumbnail(content)
+
+
+# ----------------------------------------------------------------------
+# Medición y líneas de referencia
+# ----------------------------------------------------------------------
+def measure(run, repeat=5):
+    """Segundos por llamada (mínimo de 'repeat' rondas de ~0.2 s)."""
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def is_regression(seconds, base, tolerance):
+    return seconds > base * (1 + tolerance) and seconds - base > MIN_DELTA
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def machine_info():
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {"machine": None, "results": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baselines(path, baselines, results):
+    baselines["machine"] = machine_info()
+    baselines["results"].update({key: round(value, 9) for key, value in results.items()})
+    baselines["results"] = dict(sorted(baselines["results"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+def display_available():
+    try:
+        tk_root()
+        return True
+    except Exception:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--quick", action="store_true", help="Sin el tamaño de 10000 líneas")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save", action="store_true", help="Guardar los resultados como referencia")
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baseline)
+    reference = baselines.get("results", {})
+    if baselines.get("machine") and baselines["machine"] != machine_info():
+        print(f"Aviso: las referencias se midieron en otro entorno ({baselines['machine']['platform']}, "
+              f"Python {baselines['machine']['python']}); compare con cautela.\n")
+    has_display = display_available()
+
+    results = {}
+    regressions = []
+    print(f"{'caso':<22} {'n':>6} {'tiempo':>12} {'referencia':>12} {'ratio':>7}")
+    for name, (setup, sizes, needs_display) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        if needs_display and not has_display:
+            print(f"{name:<22} {'-':>6} {'omitido (sin pantalla)':>33}")
+            continue
+        for n in sizes:
+            if args.quick and n > 1000:
+                continue
+            key = f"{name}[{n}]"
+            seconds = measure(setup(n), args.repeat)
+            base = reference.get(key)
+            if base and is_regression(seconds, base, args.tolerance):
+                # Una regresión tiene que repetirse en una segunda medición (ruido de la máquina)
+                seconds = min(seconds, measure(setup(n), args.repeat))
+            results[key] = seconds
+            ratio = seconds / base if base else None
+            flag = ""
+            if base and is_regression(seconds, base, args.tolerance):
+                regressions.append(key)
+                flag = "  REGRESIÓN"
+            print(f"{name:<22} {n:>6} {format_time(seconds):>12} "
+                  f"{format_time(base) if base else '-':>12} {f'{ratio:.2f}' if ratio else '-':>7}{flag}")
+
+    if args.save:
+        save_baselines(args.baseline, baselines, results)
+        print(f"\nReferencias guardadas en {args.baseline} ({len(results)} casos).")
+        return
+    if regressions:
+        print(f"\nFALLO: {len(regressions)} casos más lentos que la referencia (+{args.tolerance:.0%}): {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nOK: sin regresiones respecto a la referencia.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark de los modelos de dominio (models/packing.py) frente a dicts crudos.
+
+Genera la respuesta de detalle de un proceso de packing grande (N órdenes con
+M líneas cada una) y mide, para cada decodificador JSON disponible (json y
+orjson si está instalado):
+  - parse:   bytes -> árbol de dicts.
+  - modelos: bytes -> ProcessDetail (parse + construcción de los modelos).
+  - memoria retenida (tracemalloc) del árbol de dicts y de los modelos una vez
+    descartado el árbol, que es lo que la vista conserva mientras está abierta.
+
+Uso:
+    python -m benchmarks.bench_models
+    python -m benchmarks.bench_models --orders 2000 --lines 10 --runs 5
+"""
+import gc
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+
+from models.packing import ProcessDetail
+from tools.fake_packing_api import sample_process_detail
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decoders():
+    found = [("json", json.loads)]
+    if orjson is not None:
+        found.append(("orjson", orjson.loads))
+    return found
+
+def median_ms(func, payload, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(payload)
+        times.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(times)
+
+def retained_bytes(build):
+    """Memoria que sigue ocupando el resultado de build() (tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=8, help="Líneas por orden")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = json.dumps(sample_process_detail(args.orders, args.lines)).encode("utf-8")
+    print(f"Respuesta: {args.orders} órdenes x {args.lines} líneas, {len(payload) / 1024:.0f} KiB")
+    print(f"{'decodificador':<14} {'parse ms':>10} {'modelos ms':>11} {'dicts KiB':>10} {'modelos KiB':>12}")
+
+    for name, loads in decoders():
+        parse_ms = median_ms(loads, payload, args.runs)
+        models_ms = median_ms(lambda data: ProcessDetail.from_response(loads(data)), payload, args.runs)
+        dict_size = retained_bytes(lambda: loads(payload))
+        model_size = retained_bytes(lambda: ProcessDetail.from_response(loads(payload)))
+        print(f"{name:<14} {parse_ms:>10.1f} {models_ms:>11.1f} {dict_size / 1024:>10.0f} {model_size / 1024:>12.0f}")
+
+    if orjson is None:
+        print("\norjson no está instalado: las respuestas se decodifican con json.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark de latencia de impresión de extremo a extremo.
+
+Compara, para N etiquetas de envío:
+  - "servidor": URL de etiqueta -> descarga (con latencia simulada de generación
+    en el servidor) -> spooler -> impresora.
+  - "local":    generación local de la etiqueta -> spooler -> impresora.
+
+La impresora es la impresora falsa de tools/fake_printer.py (backend raw 9100)
+y el servidor de etiquetas es un http.server local, así que no hace falta
+ni Windows ni la API real.
+
+Uso:
+    python -m benchmarks.bench_print_latency --labels 50 --server-latency 0.3
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.label_downloader import LabelDownloader
+from services.label_renderer import LabelRenderer, FORMAT_ZPL, build_zpl
+from services.print_spooler import PrintSpooler, JOB_SENT, JOB_FAILED
+from services.printer_backends import RawTcpBackend
+from tools.fake_printer import FakePrinterServer
+
+
+def sample_order(i):
+    return {
+        "id": 100000 + i,
+        "name": f"Cliente {i}",
+        "address": "Calle Falsa 123",
+        "address_2": "Piso 2",
+        "city": "Madrid",
+        "province": "Madrid",
+        "zip": "28001",
+        "country_code": "ES",
+        "tracking_code": f"TRK{i:09d}",
+        "shipping_method_name": "Estándar",
+    }
+
+
+def start_label_server(latency):
+    """Servidor HTTP que imita la generación de etiquetas del backend."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            i = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+            order = sample_order(i)
+            body = build_zpl(order["shipping_method_name"], [order["name"], order["address"]], order["tracking_code"])
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_case(name, labels, submit):
+    """Encola las etiquetas una a una y mide el tiempo hasta que cada una se envía."""
+    latencies = []
+    for i in range(labels):
+        done = threading.Event()
+        start = time.perf_counter()
+        submit(i, done)
+        if not done.wait(30):
+            raise RuntimeError(f"{name}: la etiqueta {i} no se imprimió a tiempo")
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"{name:<10} n={len(latencies):<5} media={statistics.mean(latencies) * 1000:8.1f} ms "
+          f"p50={statistics.median(latencies) * 1000:8.1f} ms p95={p95 * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", type=int, default=50)
+    parser.add_argument("--server-latency", type=float, default=0.3,
+                        help="Segundos que tarda el servidor en generar cada etiqueta")
+    args = parser.parse_args()
+
+    printer = FakePrinterServer().start()
+    label_server = start_label_server(args.server_latency)
+    base_url = f"http://127.0.0.1:{label_server.server_address[1]}/label"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = RawTcpBackend([printer.address])
+        downloader = LabelDownloader(spool_dir=f"{tmp}/spool")
+        renderer = LabelRenderer(output_dir=f"{tmp}/spool", default_format=FORMAT_ZPL)
+        spooler = PrintSpooler(
+            download=downloader.fetch, send=backend.send, release=downloader.release,
+            queue_file=f"{tmp}/queue.json"
+        )
+        waiters = {}
+
+        def on_update(job):
+            if job.status in (JOB_SENT, JOB_FAILED) and job.id in waiters:
+                waiters.pop(job.id).set()
+
+        spooler.subscribe(on_update)
+        spooler.start()
+
+        def submit_server(i, done):
+            job_id = spooler.submit(f"{base_url}/{i}.zpl", printer=printer.address)
+            waiters[job_id] = done
+            if spooler.get_job(job_id).status == JOB_SENT:
+                done.set()
+
+        def submit_local(i, done):
+            path = renderer.render_shipping_label(sample_order(i))
+            job_id = spooler.submit(None, printer=printer.address, file_path=path)
+            waiters[job_id] = done
+            if spooler.get_job(job_id).status == JOB_SENT:
+                done.set()
+
+        server_latencies = run_case("servidor", args.labels, submit_server)
+        local_latencies = run_case("local", args.labels, submit_local)
+        spooler.stop(timeout=5)
+
+    label_server.shutdown()
+    printer.stop()
+
+    print(f"Latencia de impresión (submit -> enviado) con {args.server_latency * 1000:.0f} ms de generación en servidor")
+    report("servidor", server_latencies)
+    report("local", local_latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de arranque: tiempo de importación del camino de inicio.
+
+Ejecuta 'python -X importtime -c "import main"' varias veces en procesos
+nuevos, resume el informe de importtime (total, módulos más pesados) y lo
+compara con un presupuesto. También falla si alguno de los módulos pesados
+que solo se necesitan después del login (requests, PIL, barcode, win32...)
+entra en el camino de arranque.
+
+Uso:
+    python -m benchmarks.bench_startup_imports
+    python -m benchmarks.bench_startup_imports --module views.auth.login_view --budget-ms 150
+"""
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+# Presupuesto del import de main.py (hasta poder mostrar la ventana)
+DEFAULT_BUDGET_MS = 60.0
+# Módulos que no deben cargarse antes de mostrar la ventana
+HEAVY_MODULES = ("requests", "urllib3", "PIL", "barcode", "win32print", "win32api", "win32ui", "playsound")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """[(self_us, cumulative_us, profundidad, módulo)] en el orden del informe."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return entries
+
+def subtree(entries, module):
+    """Entrada de 'module' (nivel superior) y las de los módulos que importó."""
+    for index, entry in enumerate(entries):
+        if entry[3] == module and entry[2] == 0:
+            start = index
+            while start > 0 and entries[start - 1][2] > 0:
+                start -= 1
+            return entry, entries[start:index]
+    return None, []
+
+def run_once(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+    root, children = subtree(parse_importtime(result.stderr), module)
+    if root is None:
+        raise RuntimeError(f"El informe de importtime no contiene '{module}'")
+    return root, children
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Módulo de arranque a medir")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Módulos más pesados a mostrar")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    totals = []
+    self_times = {}
+    heavy = set()
+    for _ in range(args.runs):
+        root, children = run_once(args.module)
+        totals.append(root[1] / 1000.0)
+        for self_us, _, _, name in children + [root]:
+            self_times.setdefault(name, []).append(self_us / 1000.0)
+            if name.split(".")[0] in HEAVY_MODULES:
+                heavy.add(name.split(".")[0])
+
+    total_ms = statistics.median(totals)
+    print(f"import {args.module}: mediana {total_ms:.1f} ms (min {min(totals):.1f}, max {max(totals):.1f}) "
+          f"en {args.runs} ejecuciones, {len(self_times)} módulos")
+    print(f"{'módulo':<48} {'propio ms':>10}")
+    heaviest = sorted(self_times.items(), key=lambda kv: -statistics.median(kv[1]))[:args.top]
+    for name, values in heaviest:
+        print(f"{name:<48} {statistics.median(values):>10.2f}")
+
+    failed = False
+    if heavy:
+        print(f"\nFALLO: módulos pesados en el camino de arranque: {', '.join(sorted(heavy))}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\nFALLO: {total_ms:.1f} ms supera el presupuesto de {args.budget_ms:.0f} ms")
+        failed = True
+    else:
+        print(f"\nOK: dentro del presupuesto de {args.budget_ms:.0f} ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
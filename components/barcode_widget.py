@@ -15,11 +15,11 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
-def create_barcode_widget(master, barcode_value, width=200, height=100):
+def render_barcode_image(barcode_value, width=200, height=100):
     """
-    Genera un widget (Label) que muestra el código de barras correspondiente a 'barcode_value'.
+    Genera la imagen (PIL) del código de barras CODE128 de 'barcode_value',
+    redimensionada a width x height. No necesita Tk.
     """
-
     CODE128 = barcode.get_barcode_class('code128')
 
     # Intenta usar una fuente predeterminada
@@ -31,7 +31,9 @@ def create_barcode_widget(master, barcode_value, width=200, height=100):
 
     # Generar código de barras con ImageWriter y fuente específica
     my_code = CODE128(barcode_value, writer=ImageWriter())
-    my_code.default_writer_options['font_path'] = font_path if font else None
+    if font:
+        my_code.default_writer_options['font_path'] = font_path
+    # Sin arial.ttf se deja la fuente que incluye python-barcode (None hace fallar el writer)
 
     # Guardar la imagen en memoria
     buffer = io.BytesIO()
@@ -40,7 +42,13 @@ def create_barcode_widget(master, barcode_value, width=200, height=100):
 
     # Abrir la imagen con PIL
     image = Image.open(buffer)
-    image = image.resize((width, height), Image.LANCZOS)
+    return image.resize((width, height), Image.LANCZOS)
+
+def create_barcode_widget(master, barcode_value, width=200, height=100):
+    """
+    Genera un widget (Label) que muestra el código de barras correspondiente a 'barcode_value'.
+    """
+    image = render_barcode_image(barcode_value, width, height)
 
     # Convertir la imagen para usarla en Tkinter
     photo = ImageTk.PhotoImage(image)
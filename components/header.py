@@ -1,10 +1,6 @@
 import tkinter as tk
-import json
-from pathlib import Path
 from assets.css.styles import PRIMARY_COLOR, BUTTON_STYLE
-
-# Ruta de tu archivo de credenciales
-CREDENTIALS_FILE = Path("config/credentials.json")
+from services.settings_store import get_credentials_store
 
 class Header(tk.Frame):
     def __init__(self, master=None, controller=None, on_back_callback=None, on_logout_callback=None):
@@ -15,7 +11,9 @@ class Header(tk.Frame):
         
         # Cargar credenciales y obtener el nombre del usuario
         self.credentials = self.load_credentials()
-        user_name = self.credentials["token_data"]["user"]["name"]
+        user = (self.controller.get_logged_user() if self.controller else None) \
+            or (self.credentials.get("token_data") or {}).get("user") or {}
+        user_name = user.get("name", "")
         
         # Contenedor (izquierda) para el nombre de usuario
         user_container = tk.Frame(self, bg=PRIMARY_COLOR)
@@ -46,9 +44,8 @@ class Header(tk.Frame):
         self.btn_logout.pack()
 
     def load_credentials(self):
-        """Lee y retorna los datos del archivo de credenciales JSON."""
-        with open(CREDENTIALS_FILE, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        """Retorna las credenciales guardadas (en memoria, sin leer el archivo)."""
+        return get_credentials_store().all()
 
     def handle_logout(self):
         """Lógica para cerrar sesión (redirige a login o realiza las acciones que desees)."""
@@ -1,72 +1,367 @@
 import os
-import json
-import tempfile
-import requests
-import win32api
-import win32print
-import traceback
+import time
+import uuid
 
-# Archivo de configuración donde se guarda la impresora seleccionada.
-PRINTER_CONFIG_FILE = "printer_config.json"
+from services.print_spooler import PrintSpooler, JOB_SENT, JOB_FAILED, JOB_DOWNLOADING
+from services.label_downloader import LabelDownloader
+from services.label_cache import LabelCache
+from services.label_renderer import LabelRenderer, FORMAT_PDF, FORMAT_ZPL
+from services.printer_backends import BACKEND_RAW
+from services.printer_backends import create_backend
+from services.printer_router import PrinterRouter, LABEL_ORDER, LABEL_PROCESS
+from services.printer_inventory import PrinterInventory
+from services.settings_store import get_printer_settings
+from services.logger import get_logger
+from services.tracing import get_tracer
+
+logger = get_logger(__name__)
+
+# Hilos del spooler: cada impresora atiende un trabajo a la vez, así que
+# este es el máximo de impresoras de un pool imprimiendo en paralelo.
+SPOOLER_WORKERS = 4
+
+# Spooler y descargador compartidos por toda la aplicación (se crean al primer uso).
+_spooler = None
+_downloader = None
+_label_cache = None
+_router = None
+_inventory = None
+# Backend de impresión activo y la configuración con la que se creó.
+_backend = None
+_backend_key = None
+# Trazas de los trabajos encolados: {job_id: {"parent": (trace_id, span_id), "attempt_start": ts}}
+_job_traces = {}
+
+def load_printer_settings():
+    """
+    Carga el archivo JSON de configuración de impresión completo.
+    Estructura esperada (todas las claves son opcionales):
+    {
+        "selected_printer": "Nombre de la impresora",
+        "backend": "win32" | "raw" | "cups",
+        "raw_printers": ["192.168.1.50:9100"],
+        "local_labels": false,
+        "label_templates": {...},
+        "printer_pools": {"pool": ["Impresora 1", "Impresora 2"]},
+        "routing_rules": [{"label_type": "process", "pool": "pool"}],
+        "batch_window_ms": 0,
+        "batch_max_latency_ms": 1500,
+        "batch_max_size": 20
+    }
+
+    La configuración se mantiene en memoria (services/settings_store.py) y se
+    recarga sola si el archivo se edita fuera de la aplicación.
+    """
+    return get_printer_settings().all()
 
 def load_printer_config():
     """
     Carga la impresora seleccionada desde el archivo JSON.
     Si no existe o hay error, se utilizará la impresora por defecto del sistema.
     """
-    if not os.path.exists(PRINTER_CONFIG_FILE):
-        print(f"[INFO] No se encontró '{PRINTER_CONFIG_FILE}'. Usando impresora por defecto.")
-        return None
-    try:
-        with open(PRINTER_CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            printer = data.get("selected_printer")
-            print(f"[INFO] Impresora cargada desde config: {printer}")
-            return printer
-    except Exception as e:
-        print(f"[ERROR] Error al leer la configuración de impresora: {e}")
-        traceback.print_exc()
-        return None
+    return get_printer_settings().get("selected_printer")
+
+def get_printer_backend(settings=None):
+    """
+    Retorna el backend de impresión elegido en printer_config.json
+    (ShellExecute en Windows, `lp` de CUPS en Linux o raw TCP 9100).
+    Se reutiliza mientras la configuración no cambie.
+    """
+    global _backend, _backend_key
+    settings = load_printer_settings() if settings is None else settings
+    key = (settings.get("backend"), tuple(settings.get("raw_printers", [])))
+    if _backend is None or key != _backend_key:
+        _backend = create_backend(settings)
+        _backend_key = key
+        logger.info(f"Backend de impresión: {_backend.name}")
+    return _backend
+
+def list_printers():
+    """Retorna (lista de impresoras, impresora por defecto) según el backend activo."""
+    backend = get_printer_backend()
+    return backend.list_printers(), backend.default_printer()
+
+def get_printer_inventory():
+    """
+    Retorna el inventario de impresoras compartido. La enumeración se hace en
+    segundo plano, así que reconstruir una vista no vuelve a enumerar.
+    """
+    global _inventory
+    if _inventory is None:
+        _inventory = PrinterInventory(list_printers)
+        _inventory.start()
+    return _inventory
+
+def get_default_printer():
+    return get_printer_backend().default_printer()
 
 def print_document(file_path, printer):
     """
-    Envía el documento especificado a la impresora.
-    Se utiliza ShellExecute de win32api para realizar la impresión.
+    Envía el documento especificado a la impresora con el backend configurado.
+    Lanza la excepción si falla, para que el spooler pueda reintentar.
     """
-    try:
-        print(f"[INFO] Enviando '{file_path}' a la impresora: {printer}")
-        win32api.ShellExecute(0, "print", file_path, f'/d:"{printer}"', ".", 0)
-        print(f"[INFO] Documento enviado a la impresora: {printer}")
-    except Exception as e:
-        print(f"[ERROR] Error al enviar el documento a imprimir: {e}")
-        traceback.print_exc()
+    logger.info(f"Enviando '{file_path}' a la impresora: {printer}")
+    get_printer_backend().send(file_path, printer)
+    logger.info(f"Documento enviado a la impresora: {printer}")
 
-def print_from_url(url):
+def get_label_downloader():
     """
-    Descarga el archivo desde la URL dada y lo imprime usando la impresora configurada.
-    Se registran mensajes de información y error en la consola.
+    Retorna el descargador de etiquetas compartido (sesión HTTP reutilizada
+    y carpeta de spool con deduplicación por URL).
     """
-    # Se obtiene la impresora desde el archivo JSON o la por defecto
-    printer = load_printer_config() or win32print.GetDefaultPrinter()
+    global _downloader
+    if _downloader is None:
+        _downloader = LabelDownloader()
+    return _downloader
+
+def download_label(url):
+    """
+    Descarga la etiqueta desde la URL al spool y retorna su ruta.
+    Si ya se descargó antes (reimpresión o reintento) se reutiliza el archivo.
+    """
+    return get_label_downloader().fetch(url)
+
+def get_label_cache():
+    """Retorna la caché de etiquetas por pedido compartida."""
+    global _label_cache
+    if _label_cache is None:
+        _label_cache = LabelCache()
+    return _label_cache
+
+def _cache_sent_label(job):
+    """Al enviarse la etiqueta de un pedido, se guarda una copia para reimpresiones."""
+    if job.status != JOB_SENT or not job.order_id or not job.file_path:
+        return
     try:
-        print(f"[INFO] Descargando archivo desde: {url}")
-        response = requests.get(url)
-        if response.status_code == 200:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(response.content)
-                temp_file = tmp.name
-                print(f"[INFO] Archivo temporal creado: {temp_file}")
-            print_document(temp_file, printer)
-            os.remove(temp_file)
-            print(f"[INFO] Archivo temporal eliminado: {temp_file}")
-        else:
-            print(f"[ERROR] Falló la descarga. Código de estado: {response.status_code}")
-    except Exception as e:
-        print(f"[ERROR] Excepción durante la impresión desde URL: {e}")
-        traceback.print_exc()
+        get_label_cache().put(job.order_id, job.url, job.file_path, shipping_method=job.shipping_method)
+    except OSError as e:
+        logger.error(f"No se pudo guardar la etiqueta del pedido {job.order_id} en caché: {e}")
+
+def _mark_printer_up(job):
+    """Una impresora que vuelve a imprimir deja de estar marcada como caída."""
+    if job.status == JOB_SENT and _router is not None:
+        _router.mark_up(job.printer)
+
+def _trace_job(job_id, span):
+    """Asocia el trabajo al span que lo encoló para trazar su paso por el spooler."""
+    if job_id and span.tracer.enabled:
+        _job_traces[job_id] = {"parent": span.context(), "attempt_start": None}
+
+def _trace_print_job(job):
+    """
+    Registra en la traza del pedido cada intento del spooler (descarga + envío)
+    y, al terminar, el trabajo completo desde que se encoló.
+    """
+    trace = _job_traces.get(job.id)
+    if trace is None:
+        return
+    tracer = get_tracer()
+    if job.status == JOB_DOWNLOADING:
+        if trace["attempt_start"] is None:
+            tracer.record("print.queue_wait", job.created_at, job.updated_at, parent=trace["parent"])
+        trace["attempt_start"] = job.updated_at
+        return
+    if trace["attempt_start"] is not None:
+        attempt = tracer.start_span(
+            "print.attempt", parent=trace["parent"], start=trace["attempt_start"],
+            attempt=job.attempts, printer=job.printer
+        )
+        if job.status != JOB_SENT:
+            attempt.set_error(job.error)
+        attempt.end(job.updated_at)
+        trace["attempt_start"] = None
+    if job.status in (JOB_SENT, JOB_FAILED):
+        _job_traces.pop(job.id, None)
+        span = tracer.start_span(
+            "print.job", parent=trace["parent"], start=job.created_at,
+            job_id=job.id, printer=job.printer, attempts=job.attempts, status=job.status
+        )
+        if job.status == JOB_FAILED:
+            span.set_error(job.error)
+        span.end(job.updated_at)
+
+def get_printer_router(settings=None):
+    """
+    Retorna el enrutador de impresoras compartido, actualizado con los pools
+    y reglas de printer_config.json. Se reconfigura solo cuando la
+    configuración cambia.
+    """
+    global _router
+    if _router is None:
+        _router = PrinterRouter(load_printer_settings(), queue_depth=lambda: get_print_spooler().pending_by_printer())
+        get_printer_settings().subscribe(_router.configure)
+    if settings is not None:
+        _router.configure(settings)
+    return _router
+
+def resolve_printer(label_type=LABEL_ORDER, shipping_method=None, settings=None):
+    """Impresora que debe imprimir la etiqueta según pools, reglas y carga actual."""
+    return get_printer_router(settings).route(label_type, shipping_method) or get_default_printer()
+
+def merge_label_files(paths):
+    """
+    Une varias etiquetas en un solo archivo para enviarlas como un único trabajo.
+    - ZPL/EPL: se concatenan en un solo flujo raw.
+    - PDF: se unen en un PDF multipágina si está instalado pypdf.
+    Retorna la ruta del archivo unido, o None si esos archivos no se pueden unir.
+    """
+    exts = {os.path.splitext(path)[1].lower() for path in paths}
+    if len(exts) != 1:
+        return None
+    ext = exts.pop()
+    target = os.path.join(get_label_downloader().spool_dir, f"batch_{int(time.time())}_{uuid.uuid4().hex[:6]}{ext}")
+
+    if ext in (".zpl", ".epl", ".raw"):
+        with open(target, "wb") as out:
+            for path in paths:
+                with open(path, "rb") as f:
+                    out.write(f.read())
+                out.write(b"\n")
+        return target
+
+    if ext == ".pdf":
+        try:
+            from pypdf import PdfWriter
+        except ImportError:
+            return None
+        writer = PdfWriter()
+        for path in paths:
+            writer.append(path)
+        with open(target, "wb") as out:
+            writer.write(out)
+        return target
+
+    return None
+
+def get_print_spooler():
+    """Retorna el spooler de impresión compartido, arrancándolo si hace falta."""
+    global _spooler
+    if _spooler is None:
+        settings = load_printer_settings()
+        downloader = get_label_downloader()
+        _spooler = PrintSpooler(
+            download=download_label,
+            send=print_document,
+            release=downloader.release,
+            reroute=lambda job: get_printer_router().failover(job),
+            workers=SPOOLER_WORKERS,
+            merge=merge_label_files,
+            batch_window=settings.get("batch_window_ms", 0) / 1000.0,
+            max_batch_latency=settings.get("batch_max_latency_ms", 1500) / 1000.0,
+            max_batch_size=settings.get("batch_max_size", 20)
+        )
+        _spooler.subscribe(_cache_sent_label)
+        _spooler.subscribe(_mark_printer_up)
+        _spooler.subscribe(_trace_print_job)
+        _spooler.start()
+    return _spooler
+
+def print_from_url(url, description="", order_id=None, label_type=LABEL_ORDER, shipping_method=None):
+    """
+    Encola la impresión de la etiqueta de la URL dada en la impresora que le
+    corresponda según las reglas de enrutado (por defecto, la configurada).
+    No bloquea: la descarga y el envío ocurren en el hilo del spooler.
+    Si se indica order_id, la etiqueta queda en caché para reimprimirla al instante.
+    Retorna el id del trabajo de impresión.
+    """
+    with get_tracer().span("print.submit", url=url, order_id=order_id, label_type=label_type) as span:
+        printer = resolve_printer(label_type, shipping_method)
+        job_id = get_print_spooler().submit(
+            url, printer=printer, description=description, order_id=order_id,
+            label_type=label_type, shipping_method=shipping_method
+        )
+        span.set_attributes(printer=printer, job_id=job_id)
+        _trace_job(job_id, span)
+    return job_id
+
+def get_label_renderer(settings=None):
+    """
+    Crea el generador local de etiquetas con las plantillas de la configuración.
+    El formato por defecto es ZPL con el backend raw y PDF con el resto.
+    """
+    settings = load_printer_settings() if settings is None else settings
+    default_format = FORMAT_ZPL if settings.get("backend") == BACKEND_RAW else FORMAT_PDF
+    return LabelRenderer(
+        templates=settings.get("label_templates", {}),
+        output_dir=get_label_downloader().spool_dir,
+        default_format=default_format
+    )
+
+def uses_local_labels(settings=None):
+    """
+    Si las etiquetas se generan en local: con "local_labels": true o con el
+    backend raw, que solo imprime ZPL/EPL y no puede con los PDF del servidor.
+    """
+    settings = load_printer_settings() if settings is None else settings
+    return bool(settings.get("local_labels")) or settings.get("backend") == BACKEND_RAW
+
+def _submit_rendered(render, label_url, description, order_id=None, label_type=LABEL_ORDER, shipping_method=None):
+    """
+    Si la generación local está activa (ver uses_local_labels), genera la etiqueta
+    con render(renderer) y la encola; si falla o está desactivada, se usa la URL
+    del servidor. Retorna el id del trabajo o None si no hay nada que imprimir.
+    """
+    settings = load_printer_settings()
+    if uses_local_labels(settings):
+        try:
+            with get_tracer().span("print.submit", order_id=order_id, label_type=label_type, local=True) as span:
+                with get_tracer().span("label.render"):
+                    file_path = render(get_label_renderer(settings))
+                printer = resolve_printer(label_type, shipping_method, settings)
+                logger.info(f"Etiqueta generada localmente: {file_path}")
+                job_id = get_print_spooler().submit(
+                    label_url, printer=printer, description=description,
+                    order_id=order_id, file_path=file_path,
+                    label_type=label_type, shipping_method=shipping_method
+                )
+                span.set_attributes(printer=printer, job_id=job_id)
+                _trace_job(job_id, span)
+            return job_id
+        except Exception as e:
+            logger.exception(f"No se pudo generar la etiqueta localmente, se usa la URL del servidor: {e}")
+    if not label_url:
+        return None
+    return print_from_url(
+        label_url, description=description, order_id=order_id,
+        label_type=label_type, shipping_method=shipping_method
+    )
+
+def print_order_label(order_data, label_url=None, description=""):
+    """Imprime la etiqueta de envío del pedido (local o desde la URL del servidor)."""
+    return _submit_rendered(
+        lambda renderer: renderer.render_shipping_label(order_data),
+        label_url, description, order_id=order_data.get("id"),
+        label_type=LABEL_ORDER, shipping_method=order_data.get("shipping_method_name")
+    )
+
+def print_process_label(process, label_url=None, description=""):
+    """Imprime la etiqueta del proceso de packing (local o desde la URL del servidor)."""
+    return _submit_rendered(
+        lambda renderer: renderer.render_process_label(process),
+        label_url, description, label_type=LABEL_PROCESS
+    )
+
+def reprint_cached_label(order_id, description=""):
+    """
+    Reimprime la última etiqueta del pedido si está en caché, sin consultar
+    la API ni descargar nada. Retorna el id del trabajo o None si no hay caché.
+    """
+    entry = get_label_cache().get(order_id)
+    if not entry:
+        return None
+    # Mismas reglas de enrutado que la etiqueta original (p.ej. por método de envío)
+    shipping_method = entry.get("shipping_method")
+    printer = resolve_printer(LABEL_ORDER, shipping_method)
+    logger.info(f"Reimprimiendo etiqueta en caché del pedido {order_id}")
+    return get_print_spooler().submit(
+        entry["url"], printer=printer, description=description, file_path=entry["path"],
+        label_type=LABEL_ORDER, shipping_method=shipping_method
+    )
 
 # Ejemplo de uso: se puede llamar a print_from_url(url) desde cualquier parte de la aplicación.
 if __name__ == "__main__":
     # Reemplaza este URL por uno real para pruebas.
     test_url = "http://example.com/sample.pdf"
     print_from_url(test_url)
+    while get_print_spooler().pending_count():
+        time.sleep(0.5)
@@ -0,0 +1,72 @@
+import queue
+import tkinter as tk
+
+from services.print_spooler import JOB_QUEUED, JOB_DOWNLOADING, JOB_SENT, JOB_FAILED
+
+STATUS_TEXT = {
+    JOB_QUEUED: "En cola",
+    JOB_DOWNLOADING: "Descargando",
+    JOB_SENT: "Enviada",
+    JOB_FAILED: "Fallida",
+}
+
+STATUS_COLOR = {
+    JOB_QUEUED: "white",
+    JOB_DOWNLOADING: "white",
+    JOB_SENT: "white",
+    JOB_FAILED: "yellow",
+}
+
+class PrintStatusLabel(tk.Label):
+    """
+    Etiqueta que muestra el estado del último trabajo de impresión y
+    cuántos quedan en cola. Los eventos llegan desde el hilo del spooler,
+    así que se encolan y se consumen desde el hilo de Tk con after().
+    """
+    POLL_MS = 200
+
+    def __init__(self, master=None, spooler=None, **kwargs):
+        kwargs.setdefault("text", "Impresión: -")
+        super().__init__(master, **kwargs)
+        self.spooler = spooler
+        self._events = queue.Queue()
+        self._after_id = None
+
+        if self.spooler:
+            self.spooler.subscribe(self._on_job_update)
+            self._after_id = self.after(self.POLL_MS, self._poll)
+        self.bind("<Destroy>", self._on_destroy)
+
+    def _on_job_update(self, job):
+        # Hilo del spooler: no se toca Tk aquí
+        self._events.put(job)
+
+    def _poll(self):
+        last_job = None
+        while True:
+            try:
+                last_job = self._events.get_nowait()
+            except queue.Empty:
+                break
+        if last_job is not None:
+            self._render(last_job)
+        self._after_id = self.after(self.POLL_MS, self._poll)
+
+    def _render(self, job):
+        label = job.description or job.id[:8]
+        text = f"Impresión {label}: {STATUS_TEXT.get(job.status, job.status)}"
+        if job.status == JOB_FAILED and job.error:
+            text += f" ({job.error})"
+        pending = self.spooler.pending_count()
+        if pending:
+            text += f" | {pending} en cola"
+        self.config(text=text, fg=STATUS_COLOR.get(job.status, "white"))
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self._after_id:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        if self.spooler:
+            self.spooler.unsubscribe(self._on_job_update)
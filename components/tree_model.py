@@ -0,0 +1,132 @@
+def write_cells(tree, iid, values, previous):
+    """Escribe en la fila solo las celdas que cambiaron respecto a 'previous'."""
+    columns = tree["columns"]
+    for column, value, old in zip(columns, values, previous):
+        if value != old:
+            tree.set(iid, column, value)
+
+
+class TreeModel:
+    """
+    Modelo con clave para un ttk.Treeview plano: sync() reconcilia las filas
+    de la tabla con una lista de objetos en lugar de borrar y reinsertar todo.
+
+    - Solo se insertan las claves nuevas, solo se reescriben las filas cuyos
+      valores, tags o imagen cambiaron y solo se borran las que ya no están.
+    - Las filas se mueven únicamente si cambió su posición.
+    - Como el iid de cada fila es su clave, la selección y el desplazamiento
+      se conservan entre refrescos.
+
+    :param key: Función key(obj) -> clave única de la fila (p.ej. el id).
+    :param row_values: Función row_values(obj) -> tupla de columnas.
+    :param row_tags: Función opcional row_tags(obj) -> tupla de tags.
+    :param row_image: Función opcional row_image(obj) -> imagen de la columna #0.
+    """
+    def __init__(self, tree, key, row_values, row_tags=None, row_image=None):
+        self.tree = tree
+        self.key = key
+        self.row_values = row_values
+        self.row_tags = row_tags
+        self.row_image = row_image
+        self._rows = {}      # iid -> objeto
+        self._rendered = {}  # iid -> (valores, tags, imagen) escritos en Tk
+        self._order = []     # iids en el orden mostrado
+
+    # ------------------------------------------------------------------
+    # Reconciliación
+    # ------------------------------------------------------------------
+    def sync(self, rows):
+        """Deja la tabla mostrando exactamente 'rows', en ese orden."""
+        new_order = []
+        new_rows = {}
+        for obj in rows:
+            iid = self.iid_for(self.key(obj))
+            if iid in new_rows:
+                continue  # clave duplicada: se muestra la primera
+            new_rows[iid] = obj
+            new_order.append(iid)
+
+        removed = [iid for iid in self._order if iid not in new_rows]
+        if removed:
+            self.tree.delete(*removed)
+            for iid in removed:
+                self._rendered.pop(iid, None)
+
+        current = [iid for iid in self._order if iid in new_rows]
+        self._rows = new_rows
+        for index, iid in enumerate(new_order):
+            if iid in self._rendered:
+                self._write(iid)
+                if index >= len(current) or current[index] != iid:
+                    self.tree.move(iid, "", index)
+                    current.remove(iid)
+                    current.insert(index, iid)
+            else:
+                rendered = self._render(new_rows[iid])
+                options = {"values": rendered[0], "tags": rendered[1]}
+                if rendered[2] is not None:
+                    options["image"] = rendered[2]
+                self.tree.insert("", index, iid=iid, **options)
+                self._rendered[iid] = rendered
+                current.insert(index, iid)
+        self._order = new_order
+
+    def update(self, obj):
+        """Reescribe una sola fila (si sus valores cambiaron). Retorna False si no está en la tabla."""
+        iid = self.iid_for(self.key(obj))
+        if iid not in self._rows:
+            return False
+        self._rows[iid] = obj
+        self._write(iid)
+        return True
+
+    def clear(self):
+        self.sync([])
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    @staticmethod
+    def iid_for(key):
+        return str(key)
+
+    def row(self, iid):
+        """Objeto de la fila 'iid' (o None)."""
+        return self._rows.get(iid)
+
+    def selected_row(self):
+        selection = self.tree.selection()
+        return self._rows.get(selection[0]) if selection else None
+
+    def rows(self):
+        return [self._rows[iid] for iid in self._order]
+
+    def __len__(self):
+        return len(self._order)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _render(self, obj):
+        values = tuple(self.row_values(obj))
+        tags = tuple(self.row_tags(obj)) if self.row_tags else ()
+        image = self.row_image(obj) if self.row_image else None
+        return values, tags, image
+
+    def _write(self, iid):
+        rendered = self._render(self._rows[iid])
+        previous = self._rendered.get(iid)
+        if rendered == previous:
+            return
+        options = {}
+        if previous is None or len(rendered[0]) != len(previous[0]):
+            options["values"] = rendered[0]
+        elif rendered[0] != previous[0]:
+            write_cells(self.tree, iid, rendered[0], previous[0])
+        if previous is None or rendered[1] != previous[1]:
+            options["tags"] = rendered[1]
+        if rendered[2] is not None and (previous is None or rendered[2] is not previous[2]):
+            options["image"] = rendered[2]
+        if options:
+            self.tree.item(iid, **options)
+        self._rendered[iid] = rendered
@@ -0,0 +1,58 @@
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ViewRouter:
+    """
+    Navegación por pila sobre un mismo contenedor. La vista de abajo no se
+    destruye al abrir otra encima: solo se oculta (pack_forget), así al volver
+    aparece al instante con su estado (tabla, scroll, búsqueda, hilos).
+
+        router = ViewRouter(root, list_view)
+        router.push(lambda master: PackingShowView(master, ..., on_back=router.back))
+        router.back()   # destruye el detalle y vuelve a mostrar list_view
+
+    Al ocultarse, si la vista define on_view_hidden() se llama para que pause
+    lo que no hace falta mientras no se ve (sondeos, streams). Al volver a
+    mostrarse, si define on_view_shown() se llama para que refresque sus datos
+    en segundo plano.
+    """
+    def __init__(self, master, root_view=None):
+        self.master = master
+        self._stack = []
+        if root_view is not None:
+            self._stack.append(root_view)
+
+    @property
+    def current(self):
+        return self._stack[-1] if self._stack else None
+
+    def push(self, factory):
+        """Oculta la vista actual y muestra la que crea factory(master). Retorna la vista nueva."""
+        current = self.current
+        if current is not None:
+            current.pack_forget()
+            on_view_hidden = getattr(current, "on_view_hidden", None)
+            if on_view_hidden:
+                on_view_hidden()
+        view = factory(self.master)
+        view.pack(expand=True, fill="both")
+        self._stack.append(view)
+        logger.debug(f"Vista {type(view).__name__} abierta sobre {type(current).__name__}")
+        return view
+
+    def back(self):
+        """Destruye la vista actual y vuelve a mostrar la anterior (sin reconstruirla)."""
+        if len(self._stack) < 2:
+            return None
+        view = self._stack.pop()
+        view.destroy()
+        previous = self._stack[-1]
+        if not previous.winfo_exists():
+            return None
+        previous.pack(expand=True, fill="both")
+        on_view_shown = getattr(previous, "on_view_shown", None)
+        if on_view_shown:
+            on_view_shown()
+        return previous
@@ -0,0 +1,210 @@
+import tkinter as tk
+from tkinter import ttk
+
+from components.tree_model import write_cells
+
+
+class VirtualTreeview(tk.Frame):
+    """
+    Treeview virtualizado: solo existen tantas filas de Tk como caben en
+    pantalla y al desplazarse se reescriben sus valores con la ventana de
+    datos visible. Insertar miles de filas cuesta lo mismo que insertar una
+    pantalla.
+
+    - set_rows()/append_rows() cambian los datos (cualquier lista de objetos).
+    - row_values(obj) convierte un objeto en la tupla de columnas.
+    - on_near_end() se llama cuando la ventana visible se acerca al final de
+      los datos cargados (para pedir la siguiente página).
+    - selected_row() retorna el objeto seleccionado.
+    - Con 'key', la selección se conserva por clave al reemplazar los datos y
+      al redibujar solo se escriben las celdas que cambiaron.
+
+    :param key: Función opcional key(obj) -> clave única de la fila.
+    :param prefetch_rows: Filas antes del final a partir de las que se llama a on_near_end.
+    """
+    def __init__(self, master, columns, row_values, on_near_end=None, prefetch_rows=50, style="Treeview",
+                 key=None, **kwargs):
+        kwargs.setdefault("bg", "white")
+        super().__init__(master, **kwargs)
+        self.row_values = row_values
+        self.key = key
+        self.on_near_end = on_near_end
+        self.prefetch_rows = prefetch_rows
+        self.rows = []
+        self.offset = 0
+        self.visible = 1
+        self._selected_index = None
+        self._selected_key = None
+        self._items = []
+        self._item_values = {}  # iid -> valores escritos en Tk
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", style=style, selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", expand=True, fill="both")
+
+        row_height = ttk.Style().lookup(style, "rowheight")
+        self._row_height = int(row_height) if row_height else 20
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", self._on_key_up)
+        self.tree.bind("<Down>", self._on_key_down)
+        self.tree.bind("<Prior>", lambda e: self._scroll_key(-self.visible))
+        self.tree.bind("<Next>", lambda e: self._scroll_key(self.visible))
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+    def set_rows(self, rows, keep_position=False):
+        """
+        Reemplaza los datos. Con keep_position=True se mantiene el
+        desplazamiento (p.ej. al refrescar); si no, se vuelve al principio.
+        La fila seleccionada se conserva si su clave sigue presente.
+        """
+        self.rows = rows
+        if not keep_position:
+            self.offset = 0
+        self.offset = max(0, min(self.offset, len(self.rows) - self.visible))
+        self._selected_index = None
+        if self.key and self._selected_key is not None:
+            for index, obj in enumerate(self.rows):
+                if self.key(obj) == self._selected_key:
+                    self._selected_index = index
+                    break
+        self.render()
+
+    def append_rows(self, rows):
+        self.rows.extend(rows)
+        self.render()
+
+    def refresh(self):
+        """Vuelve a dibujar la ventana visible (p.ej. tras modificar self.rows)."""
+        self.render()
+
+    def selected_row(self):
+        if self._selected_index is None or self._selected_index >= len(self.rows):
+            return None
+        return self.rows[self._selected_index]
+
+    def row_at(self, item_id):
+        """Objeto que muestra la fila de Tk 'item_id' (o None)."""
+        if item_id not in self._items:
+            return None
+        index = self.offset + self._items.index(item_id)
+        return self.rows[index] if index < len(self.rows) else None
+
+    # ------------------------------------------------------------------
+    # Desplazamiento
+    # ------------------------------------------------------------------
+    def scroll(self, delta):
+        self.scroll_to(self.offset + delta)
+
+    def scroll_to(self, offset):
+        max_offset = max(0, len(self.rows) - self.visible)
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+        self._check_near_end()
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.rows))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            self.scroll(amount * (self.visible if unit == "pages" else 1))
+
+    def _on_mousewheel(self, event):
+        # Windows: delta = ±120 por paso; macOS: ±1
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll(-3 * steps)
+        return "break"
+
+    def _scroll_key(self, delta):
+        self.scroll(delta)
+        return "break"
+
+    def _on_key_up(self, event):
+        if self._selected_index is not None and self._selected_index > 0:
+            self._select_index(self._selected_index - 1)
+        return "break"
+
+    def _on_key_down(self, event):
+        if self._selected_index is None:
+            self._select_index(self.offset)
+        elif self._selected_index < len(self.rows) - 1:
+            self._select_index(self._selected_index + 1)
+        return "break"
+
+    def _set_selected(self, index):
+        self._selected_index = index
+        if self.key and index < len(self.rows):
+            self._selected_key = self.key(self.rows[index])
+
+    def _select_index(self, index):
+        self._set_selected(index)
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.visible:
+            self.scroll_to(index - self.visible + 1)
+        self.render()
+
+    # ------------------------------------------------------------------
+    # Dibujado
+    # ------------------------------------------------------------------
+    def _on_configure(self, event):
+        # Una fila menos por la cabecera
+        visible = max(1, event.height // self._row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.offset)
+            self.render()
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection and selection[0] in self._items:
+            self._set_selected(self.offset + self._items.index(selection[0]))
+
+    def render(self):
+        """Ajusta las filas de Tk a la ventana visible y escribe sus valores."""
+        count = max(0, min(self.visible, len(self.rows) - self.offset))
+        while len(self._items) < count:
+            self._items.append(self.tree.insert("", "end", values=()))
+        while len(self._items) > count:
+            item_id = self._items.pop()
+            self.tree.delete(item_id)
+            self._item_values.pop(item_id, None)
+
+        selected_item = None
+        for i, item_id in enumerate(self._items):
+            index = self.offset + i
+            values = tuple(self.row_values(self.rows[index]))
+            previous = self._item_values.get(item_id)
+            if previous is None or len(previous) != len(values):
+                self.tree.item(item_id, values=values)
+            elif previous != values:
+                write_cells(self.tree, item_id, values, previous)
+            self._item_values[item_id] = values
+            if index == self._selected_index:
+                selected_item = item_id
+        if selected_item:
+            self.tree.selection_set(selected_item)
+            self.tree.focus(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if self.rows:
+            first = self.offset / len(self.rows)
+            last = min(1.0, (self.offset + self.visible) / len(self.rows))
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._check_near_end()
+
+    def _check_near_end(self):
+        if self.on_near_end and self.offset + self.visible + self.prefetch_rows >= len(self.rows):
+            self.on_near_end()
@@ -1,3 +1,6 @@
-API_BASE_URL = "http://192.168.101.71:8000/api/auth/scanner"
+import os
+
+# CEREBRO_API_URL permite apuntar la aplicación a otro servidor (p.ej. tools/fake_event_server.py)
+API_BASE_URL = os.environ.get("CEREBRO_API_URL", "http://192.168.101.71:8000/api/auth/scanner")
 
 REQUEST_TIMEOUT = 100
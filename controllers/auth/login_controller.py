@@ -1,18 +1,29 @@
-import os
-import json
+import time
+
 from services.api_client import ApiClient
 from services.api_routes import API_ROUTES
+from services.settings_store import get_credentials_store, CREDENTIALS_FILE
+from services.secret_store import protect, unprotect, is_protected
+from services.logger import get_logger, fields
+
+logger = get_logger(__name__)
+
+# Un token guardado se da por caducado este margen antes de su expiración real
+TOKEN_EXPIRY_MARGIN = 300
 
 class LoginController:
     def __init__(self, 
                  on_token_expired_callback=None,
                  on_login_success_callback=None,
                  on_logout_callback=None,  # Callback para redirigir al login
-                 credentials_file="config/credentials.json"):
+                 credentials_file=CREDENTIALS_FILE,
+                 auto_login=True):
         self.api_client = ApiClient(on_token_expired_callback=on_token_expired_callback)
+        self.api_client.on_token_refreshed_callback = self._on_token_refreshed
         self.on_login_success_callback = on_login_success_callback
         self.on_logout_callback = on_logout_callback  # Guardamos la función para redirigir
         self.credentials_file = credentials_file
+        self.credentials_store = get_credentials_store(credentials_file)
 
         self.saved_email = None
         self.saved_password = None
@@ -21,13 +32,53 @@ class LoginController:
 
         self.user_data = None
 
-        # Intentar autologin si hay credenciales guardadas
-        if self.saved_email and self.saved_password:
-            success = self._login_internal(self.saved_email, self.saved_password)
-            if success:
-                print("Inicio de sesión automático exitoso.")
-            else:
-                print("No se pudo iniciar sesión automáticamente con credenciales guardadas.")
+        # Intentar autologin si hay credenciales guardadas (la vista de login lo
+        # desactiva y llama a auto_login() en segundo plano)
+        if auto_login:
+            self.auto_login()
+
+    def restore_session(self):
+        """
+        Retoma la sesión guardada sin pedir login al servidor si el token aún no
+        ha caducado (issued_at + expires_in). Retorna True si se restauró.
+
+        El token se valida de forma perezosa: la primera petición de la vista
+        (en segundo plano) lo usa y, si el servidor responde 401, ApiClient
+        vuelve a iniciar sesión con las credenciales guardadas.
+        """
+        token_data = self.token_data or {}
+        token = token_data.get("access_token")
+        issued_at = token_data.get("issued_at")
+        expires_in = token_data.get("expires_in")
+        if not token or not issued_at or not expires_in or not token_data.get("user"):
+            return False
+        remaining = float(issued_at) + float(expires_in) - TOKEN_EXPIRY_MARGIN - time.time()
+        if remaining <= 0:
+            logger.info("El token guardado caducó; se inicia sesión de nuevo.")
+            return False
+        self.api_client.token = token
+        self.api_client.email = self.saved_email
+        self.api_client.password = self.saved_password
+        self.user_data = token_data.get("user")
+        logger.info("Sesión restaurada desde el token guardado", extra=fields(remaining_s=int(remaining)))
+        return True
+
+    def has_saved_credentials(self):
+        return bool(self.saved_email and self.saved_password)
+
+    def auto_login(self):
+        """
+        Inicia sesión con las credenciales guardadas (petición bloqueante).
+        Retorna True si lo logró.
+        """
+        if not self.has_saved_credentials():
+            return False
+        success = self._login_internal(self.saved_email, self.saved_password)
+        if success:
+            logger.info("Inicio de sesión automático exitoso.")
+        else:
+            logger.error("No se pudo iniciar sesión automáticamente con credenciales guardadas.")
+        return success
 
     def do_login(self, email, password, save_credentials=False):
         """
@@ -57,13 +108,16 @@ class LoginController:
         }
         """
         payload = {"email": email, "password": password}
-        print("DEBUG: Haciendo login con", payload)
+        # La contraseña nunca se registra
+        logger.debug("Haciendo login", extra=fields(email=email))
         data = self.api_client._make_post_request(API_ROUTES["LOGIN"], payload)
 
         if data is None:
             return False
 
-        # Guardamos toda la respuesta (token, token_type, expires_in y user) en token_data
+        # Guardamos toda la respuesta (token, token_type, expires_in y user) en token_data,
+        # con la hora de emisión para saber al arrancar si el token sigue vigente
+        data["issued_at"] = time.time()
         self.token_data = data
 
         token = data.get("access_token")
@@ -72,9 +126,9 @@ class LoginController:
             self.api_client.email = email
             self.api_client.password = password
             self.user_data = data.get("user")
-            print("DEBUG: user_data =", self.user_data)
-            print("DEBUG: token_type =", data.get("token_type"))
-            print("DEBUG: expires_in =", data.get("expires_in"))
+            logger.debug("Login correcto", extra=fields(
+                user=self.user_data, token_type=data.get("token_type"), expires_in=data.get("expires_in")
+            ))
             return True
         else:
             return False
@@ -89,7 +143,7 @@ class LoginController:
         self.token_data = None
 
         self._delete_credentials()
-        print("Logout completado. Token y credenciales borradas.")
+        logger.info("Logout completado. Token y credenciales borradas.")
 
         if self.on_logout_callback:
             self.on_logout_callback()
@@ -97,47 +151,70 @@ class LoginController:
     def get_logged_user(self):
         return self.user_data
 
+    def _on_token_refreshed(self, data):
+        """ApiClient renovó el token (relogin tras un 401): se guarda si hay credenciales guardadas."""
+        data["issued_at"] = time.time()
+        self.token_data = data
+        self.user_data = data.get("user") or self.user_data
+        if self.saved_email and self.saved_password:
+            self._save_credentials(self.saved_email, self.saved_password)
+
     # ============ Manejo de credenciales ============
     def _save_credentials(self, email, password):
         """
         Guarda en el archivo credentials.json el email, la contraseña y el token_data obtenido en el login.
+        La contraseña y el access_token se guardan protegidos (ver services.secret_store).
         """
+        token_data = dict(self.token_data) if self.token_data else None
+        if token_data and token_data.get("access_token"):
+            token_data["access_token"] = protect(token_data["access_token"])
         data = {
             "email": email,
-            "password": password,
-            "token_data": self.token_data  # Guarda toda la información del token
+            "password": protect(password),
+            "token_data": token_data  # Guarda toda la información del token
         }
-        os.makedirs(os.path.dirname(self.credentials_file), exist_ok=True)
-        with open(self.credentials_file, "w") as f:
-            json.dump(data, f)
-        print("Credenciales y token guardados en", self.credentials_file)
+        self.credentials_store.replace(data)
+        self.saved_email = email
+        self.saved_password = password
+        logger.info(f"Credenciales y token guardados en {self.credentials_file}")
 
     def _delete_credentials(self):
         """
         Elimina el archivo de credenciales si existe.
         """
-        if os.path.exists(self.credentials_file):
-            os.remove(self.credentials_file)
-            print("Archivo de credenciales eliminado.")
+        self.saved_email = None
+        self.saved_password = None
+        if self.credentials_store.exists():
+            self.credentials_store.clear()
+            logger.info("Archivo de credenciales eliminado.")
 
     def _load_credentials(self):
         """
-        Carga las credenciales y el token_data guardados.
+        Carga las credenciales y el token_data guardados (el archivo se lee una
+        sola vez y se comparte con el resto de la aplicación).
         Si el archivo no existe, lo crea con valores vacíos.
         """
-        if not os.path.exists(self.credentials_file):
-            print("El archivo de credenciales no existe. Creándolo...")
+        if not self.credentials_store.exists():
+            logger.info("El archivo de credenciales no existe. Creándolo...")
             self._save_credentials("", "")  # Crea un archivo vacío
 
+        data = self.credentials_store.all()
+        self.saved_email = data.get("email")
+        self.token_data = data.get("token_data")
         try:
-            with open(self.credentials_file, "r") as f:
-                data = json.load(f)
-                self.saved_email = data.get("email")
-                self.saved_password = data.get("password")
-                self.token_data = data.get("token_data")
-                # Si token_data está presente, actualizar el token en el ApiClient
-                if self.token_data and "access_token" in self.token_data:
-                    self.api_client.token = self.token_data["access_token"]
-        except json.JSONDecodeError:
-            print("El archivo credentials.json está corrupto. Se eliminará.")
+            self.saved_password = unprotect(data.get("password"))
+            if self.token_data and self.token_data.get("access_token"):
+                self.token_data["access_token"] = unprotect(self.token_data["access_token"])
+        except ValueError as e:
+            # Archivo de otro usuario/máquina: se descarta y habrá que iniciar sesión a mano
+            logger.warning(f"No se pudieron leer las credenciales guardadas: {e}")
+            self.saved_email = self.saved_password = self.token_data = None
             self._delete_credentials()
+            return
+        # Si token_data está presente, actualizar el token en el ApiClient
+        if self.token_data and "access_token" in self.token_data:
+            self.api_client.token = self.token_data["access_token"]
+        # Archivos antiguos con la contraseña en texto plano: se reescriben protegidos
+        if self.saved_password and not is_protected(data.get("password")):
+            logger.info("Migrando credenciales guardadas a formato protegido.")
+            self._save_credentials(self.saved_email, self.saved_password)
@@ -1,6 +1,7 @@
 from config.settings import API_BASE_URL, REQUEST_TIMEOUT
 from services.api_client import ApiClient
 from services.api_routes import API_ROUTES
+from models.packing import ProcessDetail
 
 class PackingController:
     def __init__(self, api_client):
@@ -69,7 +70,7 @@ class PackingController:
         Obtiene el detalle de un proceso de packing.
         
         :param process_id: ID del proceso.
-        :return: Detalle del proceso (diccionario) o None.
+        :return: Detalle del proceso (models.packing.ProcessDetail) o None.
         """
         endpoint = API_ROUTES["PACKING_VIEW"].format(id=process_id)
-        return self.api_client._make_get_request(endpoint)
+        return ProcessDetail.from_response(self.api_client._make_get_request(endpoint))
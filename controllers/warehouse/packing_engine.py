@@ -0,0 +1,156 @@
+from services.api_routes import API_ROUTES
+from services.logger import get_logger, fields
+from models.packing import ProcessDetail
+
+logger = get_logger(__name__)
+
+# Resultado de PackingEngine.scan()
+SCAN_OK = "ok"
+SCAN_NOT_IN_ORDER = "not_in_order"
+SCAN_ALREADY_COMPLETE = "already_complete"
+SCAN_NO_ORDER = "no_order"
+
+
+class PackingEngine:
+    """
+    Lógica de packing de un proceso, sin interfaz: pedido en curso, escaneos,
+    progreso y confirmación. La usan PackingShowView y packing_cli.py
+    (pruebas de carga y benchmarks sin pantalla).
+
+        engine = PackingEngine(api_client, process_id, journal=get_scan_journal())
+        engine.open()                       # o engine.load(detail) si ya se pidió
+        status, product_id = engine.scan("8412345678901")
+        if engine.all_products_complete():
+            engine.confirm()                # y después engine.open() para el siguiente
+
+    :param api_client: ApiClient autenticado.
+    :param process_id: ID del proceso de packing.
+    :param journal: ScanJournal donde anotar los escaneos (None = sin diario).
+    """
+    def __init__(self, api_client, process_id, journal=None):
+        self.api_client = api_client
+        self.process_id = process_id
+        self.journal = journal
+        self.detail = None
+        self.pending_order = None           # PackingProcessOrder en curso
+        self.scanned_quantities = {}        # { product_id: {"scanned", "required", "sku", ...} }
+        self.restored_units = 0             # Unidades recuperadas del diario al cargar el pedido
+        self._codes = {}                    # código de barras / SKU -> product_id
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+    def fetch_detail(self):
+        """Pide el detalle del proceso a la API. ProcessDetail o None si falla."""
+        endpoint = API_ROUTES["PACKING_VIEW"].format(id=self.process_id)
+        return ProcessDetail.from_response(self.api_client._make_get_request(endpoint))
+
+    def open(self):
+        """Pide el detalle y carga el pedido en curso. Retorna el ProcessDetail (None si falla)."""
+        detail = self.fetch_detail()
+        if detail is not None:
+            self.load(detail)
+        return detail
+
+    def load(self, detail):
+        """Carga el pedido pendiente de 'detail' y recupera del diario lo ya escaneado."""
+        self.detail = detail
+        self.scanned_quantities = {}
+        self._codes = {}
+        self.restored_units = 0
+        self.pending_order = None if self.finished else detail.current_order()
+        if self.pending_order is None:
+            return None
+
+        for line in self.pending_order.lines:
+            product = line.product
+            self.scanned_quantities[product.id] = {
+                "product_id": product.id,
+                "scanned": 0,
+                "required": line.quantity,
+                "sku": product.sku,
+                "bar_code": product.bar_code,
+                "image_url": product.image_url,
+                "name": product.name,
+                "referencia": product.reference,
+                "warehouse_code": product.warehouse_code,
+            }
+            # Si dos productos comparten código gana el primero, como en la búsqueda lineal
+            for code in (product.bar_code, product.sku):
+                if code:
+                    self._codes.setdefault(code, product.id)
+
+        if self.journal is not None:
+            for product_id, scanned in self.journal.restore(self.process_id, self.pending_order.id).items():
+                info = self.scanned_quantities.get(product_id)
+                if info is not None:
+                    info["scanned"] = min(scanned, info["required"])
+                    self.restored_units += info["scanned"]
+        return self.pending_order
+
+    @property
+    def finished(self):
+        """True si el proceso está finalizado (o todas sus órdenes lo están)."""
+        process = self.detail.process if self.detail is not None else None
+        return process is not None and bool(process.finished_at or process.all_finished)
+
+    # ------------------------------------------------------------------
+    # Escaneo
+    # ------------------------------------------------------------------
+    def find_product_id_by_scan(self, scanned_code):
+        return self._codes.get(scanned_code)
+
+    def scan(self, scanned_code):
+        """Aplica un escaneo al pedido en curso. Retorna (SCAN_*, product_id | None)."""
+        if self.pending_order is None:
+            return SCAN_NO_ORDER, None
+        product_id = self.find_product_id_by_scan(scanned_code)
+        if product_id is None:
+            return SCAN_NOT_IN_ORDER, None
+        info = self.scanned_quantities[product_id]
+        if info["scanned"] >= info["required"]:
+            return SCAN_ALREADY_COMPLETE, product_id
+        info["scanned"] += 1
+        if self.journal is not None:
+            self.journal.record(self.process_id, self.pending_order.id, product_id, info["scanned"])
+        return SCAN_OK, product_id
+
+    def all_products_complete(self):
+        return all(info["scanned"] >= info["required"] for info in self.scanned_quantities.values())
+
+    def product_progress(self):
+        """(unidades escaneadas, unidades requeridas) del pedido en curso."""
+        scanned = required = 0
+        for info in self.scanned_quantities.values():
+            scanned += info["scanned"]
+            required += info["required"]
+        return scanned, required
+
+    # ------------------------------------------------------------------
+    # Confirmación
+    # ------------------------------------------------------------------
+    def confirm(self):
+        """
+        Confirma el pedido en curso en la API con lo escaneado.
+        Retorna la respuesta de la API si la aceptó, None si no.
+        No recarga el detalle: llamar a open() para pasar al siguiente pedido.
+        """
+        if self.pending_order is None:
+            return None
+        order_id = self.pending_order.id
+        endpoint = API_ROUTES["PACKING_CONFIRM"].format(
+            packingProcessOrder_id=order_id,
+            packingProcess_id=self.process_id
+        )
+        payload = {"completedProducts": [
+            {"product_id": p_id, "quantity": info["scanned"]} for p_id, info in self.scanned_quantities.items()
+        ]}
+        result = self.api_client._make_post_request(endpoint, payload)
+        if not result or not result.get("success"):
+            logger.warning("La API rechazó la confirmación del pedido",
+                           extra=fields(process_id=self.process_id, packing_process_order_id=order_id))
+            return None
+        # La orden ya está confirmada en la API: su progreso ya no hace falta en el diario
+        if self.journal is not None:
+            self.journal.compact(self.process_id, order_id)
+        return result
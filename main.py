@@ -1,7 +1,14 @@
 import os
 import sys
+import time
 import tkinter as tk
-from views.auth.login_view import LoginView
+from services.logger import get_logger, fields
+from services.audio_cues import get_audio_cues
+
+logger = get_logger(__name__)
+
+# Referencia para medir el arranque (ventana visible, login listo)
+STARTED_AT = time.perf_counter()
 
 def obtener_ruta_relativa(ruta_archivo):
     """ Retorna la ruta correcta para PyInstaller """
@@ -12,9 +19,22 @@ def obtener_ruta_relativa(ruta_archivo):
 
     return os.path.join(base_path, ruta_archivo)
 
+def show_login(root, splash):
+    """
+    Construye la vista de login. Se llama cuando la ventana ya está visible:
+    aquí se importan los módulos de las vistas (requests, PIL...), no al arrancar.
+    """
+    from views.auth.login_view import LoginView
+    splash.destroy()
+    login_view = LoginView(master=root)
+    login_view.pack(fill="both", expand=True)
+    logger.info("Vista de login lista", extra=fields(startup_ms=round((time.perf_counter() - STARTED_AT) * 1000, 1)))
+
 def main():
     root = tk.Tk()
     root.title("Aplicación de Escaneo y Packing")
+    # Los sonidos se cargan en su propio hilo mientras se construye la interfaz
+    get_audio_cues().start()
 
     # Obtener rutas absolutas de los íconos
     icono_ico = obtener_ruta_relativa("assets/img/favicon.ico")
@@ -24,20 +44,24 @@ def main():
         # Intentar usar el ícono .ico en Windows
         root.iconbitmap(icono_ico)
     except Exception as e:
-        print(f"No se pudo cargar {icono_ico}, error: {e}")
+        logger.error(f"No se pudo cargar {icono_ico}, error: {e}")
         try:
             # Si falla, usar el PNG con iconphoto
             icono = tk.PhotoImage(file=icono_png)
             root.iconphoto(True, icono)
         except Exception as e:
-            print(f"No se pudo cargar {icono_png}, error: {e}")
+            logger.error(f"No se pudo cargar {icono_png}, error: {e}")
 
     # Iniciar en modo maximizado
     root.state("zoomed")
     root.resizable(True, True)
 
-    login_view = LoginView(master=root)
-    login_view.pack(fill="both", expand=True)
+    # Primero se muestra la ventana; la vista de login se construye a continuación
+    splash = tk.Label(root, text="Cargando...", font=("Arial", 14))
+    splash.pack(expand=True)
+    root.update()
+    logger.info("Ventana visible", extra=fields(startup_ms=round((time.perf_counter() - STARTED_AT) * 1000, 1)))
+    root.after(0, show_login, root, splash)
 
     root.mainloop()
 
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columnas de la tabla de órdenes confirmadas
+COL_ORDER = "Orden #"
+COL_PRODUCTS = "Productos"
+COL_DURATION = "Duración (seg)"
+COL_ACTIONS = "Acciones"
+COLUMNS = (COL_ORDER, COL_PRODUCTS, COL_DURATION, COL_ACTIONS)
+
+
+def order_duration(order_info):
+    """Segundos entre started_at y finished_at, o None si falta alguna fecha o no se entiende."""
+    started_at = order_info.get("started_at")
+    finished_at = order_info.get("finished_at")
+    if not started_at or not finished_at:
+        return None
+    try:
+        dt_start = datetime.strptime(started_at, DATE_FORMAT)
+        dt_finish = datetime.strptime(finished_at, DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+    return int((dt_finish - dt_start).total_seconds())
+
+def order_sort_key(order_id):
+    # Los ids numéricos primero y en orden numérico; el resto por texto
+    text = str(order_id)
+    return (0, int(text), "") if text.isdigit() else (1, 0, text)
+
+
+class ConfirmedOrders:
+    """
+    Órdenes confirmadas en columnas, con cada valor parseado una sola vez.
+
+    - load() recibe 'confirmedOrders' tal como llega de la API (dict por id,
+      lista o paginador de Laravel) y solo parsea las órdenes que no conocía;
+      las ya vistas se reutilizan (una orden confirmada no cambia).
+    - sort() ordena por una columna usando una permutación de índices que se
+      calcula una vez por columna y se guarda hasta el siguiente load().
+    - page() devuelve las filas (tuplas de la tabla) de una página recorriendo
+      esa permutación, sin copiar ni reordenar los datos.
+
+    Si la API pagina las órdenes, 'total' es el total del servidor y el orden
+    se aplica sobre las filas ya cargadas.
+    """
+    def __init__(self):
+        self._parsed = {}           # order_id -> (productos, duración) ya parseados
+        self.clear()
+
+    def clear(self):
+        self.order_ids = []
+        self.products = []          # texto "Nombre(cant); ..."
+        self.durations = []         # int o None ("N/A")
+        self.total = 0
+        self.sort_column = None
+        self.reverse = False
+        self._permutations = {}     # columna -> índices en orden ascendente
+
+    def __len__(self):
+        return len(self.order_ids)
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+    def load(self, confirmed, total=None):
+        """Reemplaza las filas por 'confirmed' (dict por id, lista de órdenes o paginador)."""
+        if isinstance(confirmed, dict) and isinstance(confirmed.get("data"), list):
+            total = confirmed.get("total", total)
+            confirmed = confirmed["data"]
+        orders = confirmed.values() if isinstance(confirmed, dict) else (confirmed or [])
+
+        order_ids, products, durations = [], [], []
+        parsed = {}
+        for order_info in orders:
+            order_id = order_info.get("order_id", "")
+            columns = self._parsed.get(order_id)
+            if columns is None:
+                columns = (
+                    "; ".join(f"{p.get('name', '')}({p.get('quantity', 0)})" for p in order_info.get("products", [])),
+                    order_duration(order_info),
+                )
+            parsed[order_id] = columns
+            order_ids.append(order_id)
+            products.append(columns[0])
+            durations.append(columns[1])
+
+        self._parsed = parsed
+        if order_ids != self.order_ids:
+            self._permutations = {}
+        self.order_ids, self.products, self.durations = order_ids, products, durations
+        self.total = int(total) if total else len(order_ids)
+
+    # ------------------------------------------------------------------
+    # Orden y páginas
+    # ------------------------------------------------------------------
+    def sort(self, column, reverse=False):
+        """Ordena por 'column' (None = orden de la API)."""
+        self.sort_column = column if column in COLUMNS else None
+        self.reverse = reverse
+
+    def _permutation(self, column):
+        permutation = self._permutations.get(column)
+        if permutation is None:
+            if column == COL_ORDER:
+                keys = [order_sort_key(order_id) for order_id in self.order_ids]
+            elif column == COL_PRODUCTS:
+                keys = self.products
+            elif column == COL_DURATION:
+                keys = [duration or 0 for duration in self.durations]
+            else:
+                keys = None
+            indices = range(len(self.order_ids))
+            permutation = sorted(indices, key=keys.__getitem__) if keys is not None else list(indices)
+            self._permutations[column] = permutation
+        return permutation
+
+    def row(self, index):
+        """Fila de la tabla para el índice 'index' (en el orden de la API)."""
+        duration = self.durations[index]
+        return (self.order_ids[index], self.products[index], "N/A" if duration is None else duration, "Imprimir")
+
+    def page_count(self, page_size):
+        return max(1, -(-max(self.total, len(self)) // page_size))
+
+    def page(self, page, page_size):
+        """Filas de la página 'page' (desde 1) en el orden actual."""
+        count = len(self.order_ids)
+        start = (page - 1) * page_size
+        stop = min(start + page_size, count)
+        if start >= stop:
+            return []
+        if self.sort_column is None:
+            indices = range(start, stop)
+        else:
+            permutation = self._permutation(self.sort_column)
+            if self.reverse:
+                indices = [permutation[count - 1 - i] for i in range(start, stop)]
+            else:
+                indices = permutation[start:stop]
+        return [self.row(i) for i in indices]
@@ -0,0 +1,210 @@
+"""
+Modelos del dominio de packing.
+
+Clases compactas (__slots__) que se construyen una sola vez a partir del JSON
+de la API, en el hilo que hace la petición. Las vistas leen atributos en lugar
+de recorrer diccionarios anidados con cadenas de .get(..., {}), y los datos
+ocupan bastante menos memoria que el árbol de dicts original (ver
+benchmarks/bench_models.py).
+
+Los campos que faltan en el JSON quedan con el mismo valor por defecto que
+usaban las vistas ("" para textos, 0 para cantidades, None para fechas).
+"""
+
+
+def _text(value, default=""):
+    return default if value is None else value
+
+
+class _Model:
+    __slots__ = ()
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:3])
+        return f"{type(self).__name__}({values})"
+
+
+class Product(_Model):
+    __slots__ = ("id", "name", "sku", "bar_code", "warehouse_code", "image_url")
+
+    def __init__(self, id=None, name="", sku="", bar_code="", warehouse_code="N/A", image_url=None):
+        self.id = id
+        self.name = name
+        self.sku = sku
+        self.bar_code = bar_code
+        self.warehouse_code = warehouse_code
+        self.image_url = image_url
+
+    @classmethod
+    def from_dict(cls, data):
+        get = (data or {}).get
+        return cls(
+            get("id"), _text(get("name")), _text(get("sku")), _text(get("bar_code")),
+            _text(get("warehouse_code"), "N/A"), get("image_url"),
+        )
+
+    @property
+    def reference(self):
+        """Texto de referencia de la tabla: 'almacén - nombre - sku'."""
+        return f"{self.warehouse_code} - {self.name} - {self.sku}"
+
+
+class Container(_Model):
+    __slots__ = ("id", "bar_code")
+
+    def __init__(self, id=None, bar_code=""):
+        self.id = id
+        self.bar_code = bar_code
+
+    @classmethod
+    def from_dict(cls, data):
+        # La API envía {"container": {"id": .., "bar_code": ..}} o el contenedor directamente
+        data = data or {}
+        container = data.get("container") or data
+        return cls(container.get("id"), _text(container.get("bar_code")))
+
+
+class OrderLine(_Model):
+    """Línea de una orden de packing (packing_process_order_product)."""
+    __slots__ = ("id", "product", "quantity")
+
+    def __init__(self, id=None, product=None, quantity=0):
+        self.id = id
+        self.product = product if product is not None else Product()
+        self.quantity = quantity
+
+    @classmethod
+    def from_dict(cls, data):
+        get = (data or {}).get
+        return cls(get("id"), Product.from_dict(get("product")), get("quantity") or 0)
+
+
+class Order(_Model):
+    """
+    Pedido del cliente. Los campos que la app no usa se guardan en 'extra'
+    para poder reconstruir el diccionario completo (plantillas de etiquetas).
+    """
+    __slots__ = (
+        "id", "name", "email", "phone", "address", "address_2", "city", "province",
+        "zip", "country_code", "shipping_method_name", "tracking_code", "extra",
+    )
+    _FIELDS = __slots__[:-1]
+
+    def __init__(self, **values):
+        self.id = values.pop("id", None)
+        for field in self._FIELDS[1:]:
+            setattr(self, field, _text(values.pop(field, None)))
+        self.extra = values
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**(data or {}))
+
+    @property
+    def address_line(self):
+        """Dirección y segunda línea de dirección en un solo texto."""
+        return f"{self.address} / {self.address_2}" if self.address_2 else self.address
+
+    def to_dict(self):
+        data = dict(self.extra)
+        for field in self._FIELDS:
+            data[field] = getattr(self, field)
+        return data
+
+
+class PackingProcessOrder(_Model):
+    """Orden dentro de un proceso de packing, con sus líneas de productos."""
+    __slots__ = ("id", "order", "lines", "started_at", "finished_at")
+
+    def __init__(self, id=None, order=None, lines=(), started_at=None, finished_at=None):
+        self.id = id
+        self.order = order if order is not None else Order()
+        self.lines = list(lines)
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    @classmethod
+    def from_dict(cls, data):
+        get = (data or {}).get
+        return cls(
+            get("id"),
+            Order.from_dict(get("order")),
+            [OrderLine.from_dict(line) for line in get("packing_process_order_product") or ()],
+            get("started_at"),
+            get("finished_at"),
+        )
+
+    @property
+    def finished(self):
+        return bool(self.finished_at)
+
+
+class PackingProcess(_Model):
+    __slots__ = ("id", "name", "started_at", "finished_at", "created_by_name", "containers", "orders")
+
+    def __init__(self, id=None, name="", started_at=None, finished_at=None, created_by_name="N/A",
+                 containers=(), orders=()):
+        self.id = id
+        self.name = name
+        self.started_at = started_at
+        self.finished_at = finished_at
+        self.created_by_name = created_by_name
+        self.containers = list(containers)
+        self.orders = list(orders)
+
+    @classmethod
+    def from_dict(cls, data):
+        get = (data or {}).get
+        created_by = get("created_by")
+        if isinstance(created_by, dict):
+            created_by = created_by.get("name")
+        return cls(
+            get("id"),
+            _text(get("name"), "N/A"),
+            get("started_at"),
+            get("finished_at"),
+            _text(created_by, "N/A"),
+            [Container.from_dict(c) for c in get("containers") or ()],
+            [PackingProcessOrder.from_dict(o) for o in get("packing_process_orders") or ()],
+        )
+
+    @property
+    def completed_count(self):
+        return sum(1 for o in self.orders if o.finished_at)
+
+    @property
+    def all_finished(self):
+        return bool(self.orders) and all(o.finished_at for o in self.orders)
+
+    def first_pending_order(self):
+        return next((o for o in self.orders if not o.finished_at), None)
+
+
+class ProcessDetail(_Model):
+    """
+    Respuesta del detalle de un proceso (PACKING_VIEW). 'confirmed_orders' se
+    deja tal como llega: lo consume models.confirmed_orders.ConfirmedOrders.
+    """
+    __slots__ = ("process", "pending_order", "confirmed_orders")
+
+    def __init__(self, process, pending_order=None, confirmed_orders=None):
+        self.process = process
+        self.pending_order = pending_order
+        self.confirmed_orders = confirmed_orders if confirmed_orders is not None else {}
+
+    @classmethod
+    def from_response(cls, response):
+        """ProcessDetail de la respuesta de la API, o None si la petición falló."""
+        if not response or not response.get("success"):
+            return None
+        data = response.get("data") or {}
+        pending = data.get("pendingProcessOrder")
+        return cls(
+            PackingProcess.from_dict(data.get("process")),
+            PackingProcessOrder.from_dict(pending) if pending else None,
+            data.get("confirmedOrders"),
+        )
+
+    def current_order(self):
+        """Orden a empaquetar: la que indica la API o, si no, la primera sin terminar."""
+        return self.pending_order or self.process.first_pending_order()
@@ -0,0 +1,211 @@
+"""
+Packing sin interfaz: abre un proceso, alimenta escaneos desde un archivo (o
+los genera a partir de los pedidos), confirma las órdenes completas y mide el
+rendimiento (escaneos/s, órdenes/min y latencias de escaneo, confirmación y
+carga del detalle). Usa el mismo motor que la vista (PackingEngine).
+
+Uso:
+    python packing_cli.py --serve --auto                      (API falsa en el mismo proceso)
+    python packing_cli.py --api-url http://127.0.0.1:8766/api/auth/scanner --process 1 --auto
+    python packing_cli.py --process 12 --scans escaneos.txt --email op@x.com --password ...
+
+Archivo de escaneos: un código (código de barras o SKU) por línea; las líneas
+vacías y las que empiezan por '#' se ignoran.
+
+Sale con código 1 si la API rechazó alguna confirmación o no se pudo abrir el proceso.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+
+def read_scans(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            code = line.strip()
+            if code and not code.startswith("#"):
+                yield code
+
+def order_scans(engine, error_rate=0.0, rng=None):
+    """Escaneos que completan el pedido en curso, con errores intercalados si error_rate > 0."""
+    rng = rng or random.Random(0)
+    codes = []
+    for info in engine.scanned_quantities.values():
+        codes += [info["bar_code"] or info["sku"]] * (info["required"] - info["scanned"])
+    rng.shuffle(codes)
+    for code in codes:
+        if error_rate and rng.random() < error_rate:
+            yield "NO-EXISTE-" + code
+        yield code
+
+def percentiles(values_ms):
+    if not values_ms:
+        return {"n": 0}
+    ordered = sorted(values_ms)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class Run:
+    """Métricas de una ejecución."""
+    def __init__(self):
+        self.scan_ms = []
+        self.confirm_ms = []
+        self.open_ms = []
+        self.statuses = {}
+        self.confirmed = 0
+        self.rejected = 0
+        self.open_failures = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def timed(self, samples, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        samples.append((time.perf_counter() - start) * 1000.0)
+        return result
+
+    def report(self):
+        scans = len(self.scan_ms)
+        return {
+            "elapsed_s": round(self.elapsed, 3),
+            "scans": scans,
+            "scan_results": self.statuses,
+            "orders_confirmed": self.confirmed,
+            "confirm_rejected": self.rejected,
+            "open_failures": self.open_failures,
+            "scans_per_s": round(scans / self.elapsed, 1) if self.elapsed else 0.0,
+            "orders_per_min": round(self.confirmed * 60.0 / self.elapsed, 1) if self.elapsed else 0.0,
+            "latency_ms": {
+                "scan": percentiles(self.scan_ms),
+                "confirm": percentiles(self.confirm_ms),
+                "open": percentiles(self.open_ms),
+            },
+        }
+
+
+def run(engine, scans=None, max_orders=None, error_rate=0.0, seed=0):
+    """
+    Procesa pedidos con el motor. Con 'scans' (iterable de códigos) se usan
+    esos escaneos en orden; sin él se generan los de cada pedido.
+    """
+    from controllers.warehouse.packing_engine import SCAN_OK
+
+    metrics = Run()
+    rng = random.Random(seed)
+    if metrics.timed(metrics.open_ms, engine.open) is None:
+        metrics.open_failures += 1
+    stream = iter(scans) if scans is not None else None
+
+    while engine.pending_order is not None and (max_orders is None or metrics.confirmed < max_orders):
+        codes = stream if stream is not None else order_scans(engine, error_rate, rng)
+        completed = False
+        for code in codes:
+            status, _ = metrics.timed(metrics.scan_ms, engine.scan, code)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if status == SCAN_OK and engine.all_products_complete():
+                completed = True
+                break
+        if not completed and not engine.all_products_complete():
+            break   # Se acabaron los escaneos del archivo
+        if metrics.timed(metrics.confirm_ms, engine.confirm):
+            metrics.confirmed += 1
+        else:
+            metrics.rejected += 1
+            break
+        if metrics.timed(metrics.open_ms, engine.open) is None:
+            metrics.open_failures += 1
+            break
+
+    metrics.elapsed = time.perf_counter() - metrics.started
+    return metrics.report()
+
+def print_report(report):
+    print(f"Duración: {report['elapsed_s']:.2f} s")
+    print(f"Escaneos: {report['scans']} ({report['scans_per_s']}/s)  "
+          f"resultados: {', '.join(f'{k}={v}' for k, v in sorted(report['scan_results'].items())) or '-'}")
+    print(f"Órdenes confirmadas: {report['orders_confirmed']} ({report['orders_per_min']}/min)  "
+          f"rechazadas: {report['confirm_rejected']}  fallos al abrir: {report['open_failures']}")
+    print(f"{'latencia ms':<12} {'n':>6} {'media':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name, stats in report["latency_ms"].items():
+        if stats["n"]:
+            print(f"{name:<12} {stats['n']:>6} {stats['mean']:>9.3f} {stats['p50']:>9.3f} "
+                  f"{stats['p95']:>9.3f} {stats['p99']:>9.3f} {stats['max']:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-url", help="URL base de la API (por defecto CEREBRO_API_URL o la de config/settings.py)")
+    parser.add_argument("--process", type=int, help="ID del proceso de packing")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scans", help="Archivo con los códigos a escanear")
+    source.add_argument("--auto", action="store_true", help="Generar los escaneos de cada pedido")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Con --auto: fracción de escaneos erróneos")
+    parser.add_argument("--max-orders", type=int, help="Órdenes a confirmar como máximo")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--journal", help="Carpeta del diario de escaneos (sin ella no se usa diario)")
+    parser.add_argument("--serve", action="store_true", help="Arrancar la API falsa (tools/fake_packing_api.py) en este proceso")
+    parser.add_argument("--fake-orders", type=int, default=50)
+    parser.add_argument("--fake-lines", type=int, default=5)
+    parser.add_argument("--fake-latency", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="Informe en JSON")
+    args = parser.parse_args()
+
+    server = None
+    if args.serve:
+        from tools.fake_packing_api import FakePackingApi
+        server = FakePackingApi(orders=args.fake_orders, lines=args.fake_lines, latency=args.fake_latency)
+        args.process = args.process or server.add_process()
+        server.start()
+        args.api_url = server.base_url
+    if args.process is None:
+        parser.error("falta --process (o --serve)")
+    if args.api_url:
+        # Antes de importar config.settings (ApiClient lee la URL al importarse)
+        os.environ["CEREBRO_API_URL"] = args.api_url
+
+    from services.api_client import ApiClient
+    from services.scan_journal import ScanJournal
+    from controllers.warehouse.packing_engine import PackingEngine
+
+    api_client = ApiClient()
+    if args.email and args.password and not api_client._login_internal(args.email, args.password):
+        print("No se pudo iniciar sesión.", file=sys.stderr)
+        sys.exit(1)
+    journal = ScanJournal(args.journal) if args.journal else None
+    engine = PackingEngine(api_client, args.process, journal=journal)
+
+    scans = read_scans(args.scans) if args.scans else None
+    if scans is None and not args.auto:
+        parser.error("indica --scans ARCHIVO o --auto")
+    try:
+        report = run(engine, scans, args.max_orders, args.error_rate)
+    finally:
+        if journal is not None:
+            journal.flush()
+        if server is not None:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["confirm_rejected"] or report["open_failures"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,20 @@
-import requests
+import threading
+
 from config.settings import API_BASE_URL, REQUEST_TIMEOUT
 from services.api_routes import API_ROUTES
+from services.logger import get_logger, fields
+from services.tracing import get_tracer
+from services import fast_json
+
+logger = get_logger(__name__)
 
 class ApiClient:
     """
     Cliente HTTP genérico que se encarga de:
     - Manejar el token en headers (self.token).
     - Hacer reintentos automáticos si se recibe un 401 (y se tienen credenciales).
+      Si varios hilos reciben 401 a la vez, solo uno vuelve a iniciar sesión y
+      el resto reutiliza el token nuevo.
     - Ofrecer métodos genéricos _make_get_request y _make_post_request
       para que los controladores hagan las peticiones que necesiten.
     """
@@ -14,44 +22,133 @@ class ApiClient:
         self.token = None
         self.email = None
         self.password = None
+        # Se llama desde el hilo que hizo la petición (a menudo un hilo de fondo):
+        # quien lo registre debe pasar al hilo de Tk antes de tocar widgets
         self.on_token_expired_callback = on_token_expired_callback
+        # Se llama con la respuesta de login cuando un relogin automático renueva el token
+        self.on_token_refreshed_callback = None
+        # RLock: la propia petición de login pasa por _make_post_request y puede recibir 401
+        self._relogin_lock = threading.RLock()
+        self._relogin_in_progress = False
+
+    def _make_get_request(self, endpoint, cancelled=None):
+        """
+        GET que retorna el JSON de la respuesta (None si falla).
+        cancelled: threading.Event opcional. La petición en curso no se
+        interrumpe, pero si se activa antes de que lleguen las cabeceras el
+        cuerpo no se descarga ni se decodifica y se retorna None.
+        """
+        import requests  # Se importa al primer uso: no retrasa el arranque de la ventana
+        url = f"{API_BASE_URL}{endpoint}"
+        # Con cancelación, el cuerpo se lee solo después de comprobarla
+        stream = cancelled is not None
+        with get_tracer().span("api.get", endpoint=endpoint) as span:
+            sent_token = self.token
+            headers = self._get_headers()
+            try:
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
+                if response.status_code == 401:
+                    response.close()
+                    if not self._try_auto_relogin(sent_token):
+                        if self.on_token_expired_callback:
+                            self.on_token_expired_callback()
+                        span.set_attribute("status_code", 401)
+                        return None
+                    headers = self._get_headers()
+                    response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
+                span.set_attribute("status_code", response.status_code)
+                with response:
+                    if cancelled is not None and cancelled.is_set():
+                        span.set_attribute("cancelled", True)
+                        return None
+                    response.raise_for_status()
+                    return fast_json.loads(response.content)
+            except (requests.RequestException, ValueError) as e:
+                span.set_error(e)
+                logger.error(f"Error GET {url}: {e}")
+                return None
+
+
+    def _make_conditional_get(self, endpoint, etag=None):
+        """
+        GET condicional: envía If-None-Match con el ETag anterior.
+        Retorna (status_code, json | None, etag). Con 304 el json es None y el
+        contenido no cambió; con error retorna (None, None, etag).
+        """
+        import requests
+        url = f"{API_BASE_URL}{endpoint}"
+        with get_tracer().span("api.get", endpoint=endpoint, conditional=True) as span:
+            sent_token = self.token
+            headers = self._get_headers()
+            if etag:
+                headers["If-None-Match"] = etag
+            try:
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                if response.status_code == 401:
+                    if not self._try_auto_relogin(sent_token):
+                        if self.on_token_expired_callback:
+                            self.on_token_expired_callback()
+                        span.set_attribute("status_code", 401)
+                        return None, None, etag
+                    headers["Authorization"] = self._get_headers().get("Authorization", "")
+                    response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                span.set_attribute("status_code", response.status_code)
+                if response.status_code == 304:
+                    return 304, None, etag
+                response.raise_for_status()
+                return response.status_code, fast_json.loads(response.content), response.headers.get("ETag")
+            except (requests.RequestException, ValueError) as e:
+                span.set_error(e)
+                logger.error(f"Error GET {url}: {e}")
+                return None, None, etag
 
-    def _make_get_request(self, endpoint):
+    def _open_event_stream(self, endpoint, read_timeout=60):
+        """
+        Abre un stream de eventos del servidor (text/event-stream).
+        Retorna la respuesta en modo stream, o None si el servidor no ofrece
+        el canal (404, 405, otro content-type) o no se pudo conectar.
+        El servidor debe enviar algo (p.ej. un comentario ': ping') antes de
+        read_timeout segundos; si no, la lectura falla y hay que reconectar.
+        """
+        import requests
         url = f"{API_BASE_URL}{endpoint}"
         headers = self._get_headers()
+        headers["Accept"] = "text/event-stream"
         try:
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            if response.status_code == 401:
-                if not self._try_auto_relogin():
-                    if self.on_token_expired_callback:
-                        self.on_token_expired_callback()
-                    return None
-                headers = self._get_headers()
-                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.json()
+            response = requests.get(url, headers=headers, stream=True, timeout=(REQUEST_TIMEOUT, read_timeout))
         except requests.RequestException as e:
-            print(f"Error GET {url}: {e}")
+            logger.debug(f"Canal de eventos no disponible en {url}: {e}")
             return None
-
+        content_type = response.headers.get("Content-Type", "")
+        if response.status_code != 200 or not content_type.startswith("text/event-stream"):
+            logger.debug(f"Canal de eventos no disponible en {url}", extra=fields(status_code=response.status_code))
+            response.close()
+            return None
+        return response
 
     def _make_post_request(self, endpoint, payload=None):
+        import requests
         url = f"{API_BASE_URL}{endpoint}"
-        headers = self._get_headers()
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
-            if response.status_code == 401:
-                if not self._try_auto_relogin():
-                    if self.on_token_expired_callback:
-                        self.on_token_expired_callback()
-                    return None
-                headers = self._get_headers()
+        with get_tracer().span("api.post", endpoint=endpoint) as span:
+            sent_token = self.token
+            headers = self._get_headers()
+            try:
                 response = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            print(f"Error POST {url}: {e}")
-            return None
+                if response.status_code == 401:
+                    if not self._try_auto_relogin(sent_token):
+                        if self.on_token_expired_callback:
+                            self.on_token_expired_callback()
+                        span.set_attribute("status_code", 401)
+                        return None
+                    headers = self._get_headers()
+                    response = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
+                span.set_attribute("status_code", response.status_code)
+                response.raise_for_status()
+                return fast_json.loads(response.content)
+            except (requests.RequestException, ValueError) as e:
+                span.set_error(e)
+                logger.error(f"Error POST {url}: {e}")
+                return None
 
     def _get_headers(self):
         headers = {
@@ -62,15 +159,30 @@ class ApiClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
 
-    def _try_auto_relogin(self):
+    def _try_auto_relogin(self, rejected_token=None):
         """
         Si tenemos email y password guardados, reintentamos login automático
         antes de repetir la petición. Devuelve True si logró relogearse.
+
+        rejected_token es el token con el que se hizo la petición que recibió
+        el 401: si mientras se esperaba el lock otro hilo ya lo renovó, se
+        reutiliza el nuevo sin pedir otro login.
         """
-        if self.email and self.password:
-            print("Intentando relogin automático con credenciales guardadas...")
-            return self._login_internal(self.email, self.password)
-        return False
+        if not (self.email and self.password):
+            return False
+        with self._relogin_lock:
+            if self._relogin_in_progress:
+                # La propia petición de login recibió 401: credenciales rechazadas
+                return False
+            if self.token and self.token != rejected_token:
+                logger.debug("Token renovado por otra petición; se reintenta con él.")
+                return True
+            logger.info("Intentando relogin automático con credenciales guardadas...")
+            self._relogin_in_progress = True
+            try:
+                return self._login_internal(self.email, self.password)
+            finally:
+                self._relogin_in_progress = False
 
     def _login_internal(self, email, password):
             payload = {"email": email, "password": password}
@@ -82,5 +194,7 @@ class ApiClient:
                 self.token = token
                 self.email = email
                 self.password = password
+                if self.on_token_refreshed_callback:
+                    self.on_token_refreshed_callback(data)
                 return True
             return False
\ No newline at end of file
@@ -0,0 +1,204 @@
+import os
+import sys
+import time
+import queue
+import threading
+from collections import deque
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sonidos de la aplicación (nombre -> archivo relativo a la carpeta de la app)
+CUE_ERROR = "error"
+CUE_FILES = {
+    CUE_ERROR: os.path.join("assets", "mp3", "error_alert.mp3"),
+}
+
+# Un mismo sonido no se repite antes de este intervalo (p.ej. ráfaga de escaneos erróneos)
+MIN_REPEAT_INTERVAL = 0.15
+# Reproducciones simultáneas del mismo sonido (se solapan en lugar de esperar)
+VOICES = 3
+# Peticiones pendientes como máximo; si la cola está llena se descartan
+MAX_PENDING = 8
+
+
+def resource_path(relative_path):
+    """Ruta de un recurso de la app, también dentro del ejecutable de PyInstaller."""
+    base_path = sys._MEIPASS if getattr(sys, "frozen", False) else os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+
+class NullAudioBackend:
+    """Sin sonido (máquinas sin audio, pruebas, otros sistemas). Registra lo que se habría reproducido."""
+    name = "null"
+
+    def __init__(self):
+        self.played = deque(maxlen=100)
+
+    def load(self, cue, path):
+        return True
+
+    def play(self, cue):
+        self.played.append(cue)
+
+    def close(self):
+        pass
+
+
+class MciAudioBackend:
+    """
+    Reproduce con MCI de Windows (winmm), que decodifica MP3 sin dependencias.
+    Cada sonido se abre una vez por voz al cargarlo; reproducir es solo un
+    'play ... from 0' asíncrono, así que no bloquea ni vuelve a leer el archivo.
+    Debe usarse siempre desde el mismo hilo (el de AudioCues).
+    """
+    name = "mci"
+
+    def __init__(self, voices=VOICES):
+        import ctypes
+        self._winmm = ctypes.windll.winmm
+        self._buffer = ctypes.create_unicode_buffer(256)
+        self.voices = voices
+        self._aliases = {}      # cue -> [alias por voz]
+        self._next_voice = {}
+
+    def _send(self, command):
+        error = self._winmm.mciSendStringW(command, None, 0, None)
+        if error:
+            self._winmm.mciGetErrorStringW(error, self._buffer, len(self._buffer))
+            raise OSError(f"MCI '{command}': {self._buffer.value}")
+
+    def load(self, cue, path):
+        aliases = []
+        for voice in range(self.voices):
+            alias = f"cue_{cue}_{voice}"
+            self._send(f'open "{path}" type mpegvideo alias {alias}')
+            aliases.append(alias)
+        self._aliases[cue] = aliases
+        self._next_voice[cue] = 0
+        return True
+
+    def play(self, cue):
+        aliases = self._aliases.get(cue)
+        if not aliases:
+            return
+        voice = self._next_voice[cue]
+        self._next_voice[cue] = (voice + 1) % len(aliases)
+        self._send(f"play {aliases[voice]} from 0")
+
+    def close(self):
+        for aliases in self._aliases.values():
+            for alias in aliases:
+                try:
+                    self._send(f"close {alias}")
+                except OSError:
+                    pass
+        self._aliases = {}
+
+
+def default_backend():
+    """MCI en Windows; sin sonido en cualquier otro caso o con CEREBRO_AUDIO=0."""
+    if os.environ.get("CEREBRO_AUDIO", "1") == "0" or sys.platform != "win32":
+        return NullAudioBackend()
+    try:
+        return MciAudioBackend()
+    except Exception as e:
+        logger.warning(f"Audio no disponible, se usa el backend sin sonido: {e}")
+        return NullAudioBackend()
+
+
+class AudioCues:
+    """
+    Sonidos de aviso sin bloquear la interfaz.
+
+    Un hilo dedicado carga (decodifica) los sonidos una sola vez al arrancar y
+    luego los reproduce a medida que se piden. play() solo encola y retorna:
+    - Si el mismo sonido se pidió hace menos de min_interval, se ignora.
+    - Si hay demasiadas peticiones pendientes, se descartan las nuevas.
+    - Las reproducciones se solapan (varias voces por sonido).
+
+    :param backend: Backend de audio (por defecto default_backend()).
+    :param cues: {nombre: ruta relativa} de los sonidos a cargar.
+    """
+    def __init__(self, backend=None, cues=None, min_interval=MIN_REPEAT_INTERVAL, max_pending=MAX_PENDING):
+        self._backend = backend
+        self.cues = dict(CUE_FILES if cues is None else cues)
+        self.min_interval = min_interval
+        self._requests = queue.Queue(max_pending)
+        self._last_played = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def start(self):
+        """Arranca el hilo de audio y la precarga de los sonidos (idempotente)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="AudioCues", daemon=True)
+                self._thread.start()
+        return self
+
+    def play(self, cue):
+        """Pide reproducir 'cue'. No bloquea. Retorna False si se descartó."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_played.get(cue)
+            if last is not None and now - last < self.min_interval:
+                return False
+            self._last_played[cue] = now
+        self.start()
+        try:
+            self._requests.put_nowait(cue)
+        except queue.Full:
+            logger.debug(f"Sonido '{cue}' descartado: demasiados pendientes")
+            return False
+        return True
+
+    def close(self):
+        if self._thread is not None:
+            try:
+                self._requests.put(None, timeout=1)
+            except queue.Full:
+                pass
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        if self._backend is None:
+            self._backend = default_backend()
+        for cue, relative_path in self.cues.items():
+            path = resource_path(relative_path)
+            try:
+                self._backend.load(cue, path)
+                self._loaded.add(cue)
+            except Exception as e:
+                logger.warning(f"No se pudo cargar el sonido '{cue}' ({path}): {e}")
+        logger.info(f"Sonidos cargados con el backend '{self._backend.name}'")
+        while True:
+            cue = self._requests.get()
+            if cue is None:
+                self._backend.close()
+                return
+            if cue not in self._loaded:
+                continue
+            try:
+                self._backend.play(cue)
+            except Exception as e:
+                logger.warning(f"No se pudo reproducir el sonido '{cue}': {e}")
+
+
+_audio_cues = None
+_audio_cues_lock = threading.Lock()
+
+def get_audio_cues():
+    """Servicio de sonidos compartido por toda la app."""
+    global _audio_cues
+    with _audio_cues_lock:
+        if _audio_cues is None:
+            _audio_cues = AudioCues()
+        return _audio_cues
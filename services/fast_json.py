@@ -0,0 +1,22 @@
+"""
+Decodificación JSON rápida para las respuestas de la API.
+
+Usa orjson si está instalado (varias veces más rápido que json en las
+respuestas grandes de los procesos de packing) y el módulo json estándar si
+no. Ambos lanzan una subclase de ValueError si el contenido no es JSON válido.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data):
+    """Decodifica bytes o str JSON."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import shutil
+import threading
+from collections import OrderedDict
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Carpeta donde se guardan las copias de las últimas etiquetas por pedido.
+LABEL_CACHE_DIR = "label_cache"
+LABEL_CACHE_INDEX_FILE = "index.json"
+
+
+class LabelCache:
+    """
+    Caché de etiquetas por id de pedido para reimpresiones instantáneas.
+    Guarda una copia del último archivo impreso de cada pedido y la URL
+    resuelta, de modo que "Imprimir" no necesita volver a pedir la URL
+    ni descargar la etiqueta.
+
+    Desalojo:
+    - Por antigüedad: las entradas con más de max_age segundos se eliminan.
+    - Por tamaño: si se supera max_bytes o max_entries se eliminan las
+      menos usadas recientemente.
+    """
+    def __init__(self, cache_dir=LABEL_CACHE_DIR, max_bytes=50 * 1024 * 1024,
+                 max_entries=500, max_age=24 * 3600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age = max_age
+
+        # order_id (str) -> {"url", "path", "shipping_method", "size", "stored_at"}; orden = LRU
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def put(self, order_id, url, file_path, shipping_method=None):
+        """
+        Guarda una copia de la etiqueta del pedido, reemplazando la anterior.
+        shipping_method se guarda para que la reimpresión siga las mismas reglas
+        de enrutado que la etiqueta original.
+        """
+        key = str(order_id)
+        ext = os.path.splitext(file_path)[1]
+        target = os.path.join(self.cache_dir, f"order_{key}{ext}")
+        tmp_target = target + ".tmp"
+        shutil.copyfile(file_path, tmp_target)
+        os.replace(tmp_target, target)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old and old["path"] != target:
+                self._remove_file(old["path"])
+            self._entries[key] = {
+                "url": url,
+                "path": target,
+                "shipping_method": shipping_method,
+                "size": os.path.getsize(target),
+                "stored_at": time.time(),
+            }
+            self._evict()
+            self._save_index()
+        logger.info(f"Etiqueta del pedido {key} guardada en caché: {target}")
+
+    def get(self, order_id):
+        """
+        Retorna la entrada del pedido ({"url", "path", "shipping_method", ...}) si existe y sigue
+        vigente, o None.
+        """
+        key = str(order_id)
+        with self._lock:
+            self._evict()
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if not os.path.exists(entry["path"]):
+                del self._entries[key]
+                self._save_index()
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry)
+
+    def invalidate(self, order_id):
+        with self._lock:
+            entry = self._entries.pop(str(order_id), None)
+            if entry:
+                self._remove_file(entry["path"])
+                self._save_index()
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(entry["size"] for entry in self._entries.values())
+
+    # ------------------------------------------------------------------
+    # Internos (requieren el lock)
+    # ------------------------------------------------------------------
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if now - e["stored_at"] > self.max_age]:
+            self._remove_file(self._entries.pop(key)["path"])
+
+        total = sum(entry["size"] for entry in self._entries.values())
+        while self._entries and (total > self.max_bytes or len(self._entries) > self.max_entries):
+            _, entry = self._entries.popitem(last=False)
+            total -= entry["size"]
+            self._remove_file(entry["path"])
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.error(f"No se pudo eliminar la etiqueta en caché {path}: {e}")
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, LABEL_CACHE_INDEX_FILE)
+
+    def _load_index(self):
+        path = self._index_path()
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = OrderedDict(json.load(f))
+        except Exception as e:
+            logger.error(f"Índice de caché de etiquetas corrupto, se reinicia: {e}")
+            self._entries = OrderedDict()
+
+    def _save_index(self):
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(list(self._entries.items()), f, ensure_ascii=False)
+            os.replace(tmp_path, self._index_path())
+        except Exception as e:
+            logger.error(f"No se pudo guardar el índice de caché de etiquetas: {e}")
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import requests
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Carpeta gestionada donde se guardan las etiquetas descargadas.
+SPOOL_DIR = "spool"
+SPOOL_INDEX_FILE = "index.json"
+
+
+class LabelDownloader:
+    """
+    Descarga etiquetas a una carpeta de spool gestionada:
+    - Usa una única requests.Session (conexiones reutilizadas) con timeout.
+    - Descarga en streaming por bloques, sin cargar el archivo entero en memoria.
+    - Calcula el SHA-256 del contenido y valida el Content-Length.
+    - Deduplica por URL: reimpresiones y reintentos reutilizan el archivo ya descargado.
+    - Purga los archivos liberados una vez superada su antigüedad máxima.
+
+    :param spool_dir: Carpeta de spool.
+    :param timeout: (conexión, lectura) en segundos.
+    :param max_age: Segundos que se conserva un archivo liberado para reutilizarlo.
+    """
+    def __init__(self, spool_dir=SPOOL_DIR, session=None, timeout=(5, 30),
+                 chunk_size=64 * 1024, max_age=6 * 3600):
+        self.spool_dir = spool_dir
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.max_age = max_age
+
+        self._index = {}            # url -> {"path", "sha256", "size", "fetched_at", "released"}
+        self._url_locks = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def fetch(self, url):
+        """
+        Retorna la ruta local de la etiqueta de 'url', descargándola solo
+        si no hay una copia válida en el spool.
+        """
+        with self._url_lock(url):
+            entry = self._get_valid_entry(url)
+            if entry:
+                logger.info(f"Etiqueta reutilizada desde spool: {entry['path']}")
+                with self._lock:
+                    entry["released"] = False
+                    self._save_index()
+                return entry["path"]
+            return self._download(url)
+
+    def release(self, path):
+        """
+        Indica que el spooler ya no necesita el archivo. Se conserva para
+        reimpresiones hasta que venza max_age y entonces se purga.
+        Los archivos del spool que no vienen de una descarga (p.ej. etiquetas
+        generadas localmente) se eliminan directamente.
+        """
+        known = False
+        with self._lock:
+            for entry in self._index.values():
+                if entry["path"] == path:
+                    entry["released"] = True
+                    entry["released_at"] = time.time()
+                    known = True
+            self._save_index()
+        if not known and self._in_spool(path) and os.path.exists(path):
+            os.remove(path)
+        self.purge()
+
+    def purge(self, max_age=None):
+        """Elimina los archivos liberados más antiguos que max_age."""
+        max_age = self.max_age if max_age is None else max_age
+        now = time.time()
+        with self._lock:
+            for url, entry in list(self._index.items()):
+                if not entry.get("released"):
+                    continue
+                if now - entry.get("released_at", entry["fetched_at"]) < max_age:
+                    continue
+                try:
+                    if os.path.exists(entry["path"]):
+                        os.remove(entry["path"])
+                except OSError:
+                    continue  # En uso: se intentará en la siguiente purga
+                del self._index[url]
+            self._save_index()
+
+    def lookup(self, url):
+        """Retorna la entrada del spool para 'url' si el archivo sigue siendo válido."""
+        return self._get_valid_entry(url)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _in_spool(self, path):
+        spool = os.path.abspath(self.spool_dir)
+        return os.path.commonpath([spool, os.path.abspath(path)]) == spool
+
+    def _url_lock(self, url):
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _get_valid_entry(self, url):
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry or not os.path.exists(entry["path"]):
+            return None
+        if os.path.getsize(entry["path"]) != entry["size"]:
+            return None
+        if self._sha256(entry["path"]) != entry["sha256"]:
+            logger.error(f"Checksum inválido en spool para {url}. Se descargará de nuevo.")
+            return None
+        return entry
+
+    def _download(self, url):
+        logger.info(f"Descargando archivo desde: {url}")
+        digest = hashlib.sha256()
+        size = 0
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Falló la descarga. Código de estado: {response.status_code}")
+            suffix = self._suffix(url, response)
+            expected = response.headers.get("Content-Length")
+            url_key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+            part_path = os.path.join(self.spool_dir, f"{url_key}.part")
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+        if expected is not None and expected.isdigit() and int(expected) != size:
+            os.remove(part_path)
+            raise RuntimeError(f"Descarga incompleta: {size} de {expected} bytes.")
+
+        sha256 = digest.hexdigest()
+        final_path = os.path.join(self.spool_dir, f"{url_key}_{sha256[:16]}{suffix}")
+        os.replace(part_path, final_path)
+        with self._lock:
+            self._index[url] = {
+                "path": final_path,
+                "sha256": sha256,
+                "size": size,
+                "fetched_at": time.time(),
+                "released": False,
+            }
+            self._save_index()
+        logger.info(f"Etiqueta guardada en spool: {final_path} ({size} bytes)")
+        return final_path
+
+    @staticmethod
+    def _suffix(url, response):
+        """Extensión del archivo descargado: PDF salvo que el servidor entregue ZPL/EPL."""
+        content_type = response.headers.get("Content-Type", "")
+        if "pdf" in content_type:
+            return ".pdf"
+        ext = os.path.splitext(url.split("?", 1)[0])[1].lower()
+        return ext if ext in (".zpl", ".epl", ".txt") else ".pdf"
+
+    @staticmethod
+    def _sha256(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _index_path(self):
+        return os.path.join(self.spool_dir, SPOOL_INDEX_FILE)
+
+    def _load_index(self):
+        path = self._index_path()
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except Exception as e:
+            logger.error(f"Índice de spool corrupto, se reinicia: {e}")
+            self._index = {}
+
+    def _save_index(self):
+        """Guarda el índice de forma atómica. Requiere el lock."""
+        tmp_path = self._index_path() + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False)
+            os.replace(tmp_path, self._index_path())
+        except Exception as e:
+            logger.error(f"No se pudo guardar el índice de spool: {e}")
@@ -0,0 +1,228 @@
+import os
+import time
+import uuid
+
+# Tamaño de la etiqueta (4x6 pulgadas) en puntos PDF y en dots ZPL (203 dpi)
+PDF_WIDTH = 288
+PDF_HEIGHT = 432
+ZPL_WIDTH = 812
+
+FORMAT_PDF = "pdf"
+FORMAT_ZPL = "zpl"
+
+# Plantillas por defecto. Cada plantilla admite:
+#   "format":  "pdf" | "zpl" (si no se indica, se elige según el backend)
+#   "title":   texto de cabecera
+#   "lines":   líneas de texto
+#   "barcode": valor del código de barras (Code 128)
+#   "zpl":     plantilla ZPL completa (opcional, reemplaza el diseño por defecto)
+# Todos los textos aceptan campos {nombre} de los datos de la etiqueta.
+DEFAULT_SHIPPING_TEMPLATE = {
+    "title": "{shipping_method_name}",
+    "lines": [
+        "Pedido: {id}",
+        "{name}",
+        "{address}",
+        "{address_2}",
+        "{zip} {city}",
+        "{province} - {country_code}",
+    ],
+    "barcode": "{tracking_code}",
+}
+
+DEFAULT_PROCESS_TEMPLATE = {
+    "title": "Proceso de Packing",
+    "lines": [
+        "Proceso: {name}",
+        "ID: {id}",
+        "Cestas: {containers}",
+    ],
+    "barcode": "{id}",
+}
+
+
+class _SafeDict(dict):
+    """Los campos que faltan en los datos se rellenan con cadena vacía."""
+    def __missing__(self, key):
+        return ""
+
+
+class LabelRenderer:
+    """
+    Genera localmente las etiquetas de envío y de proceso a partir de los
+    datos que el cliente ya tiene, sin pedir ni descargar el PDF al servidor.
+
+    Configuración (clave "label_templates" de printer_config.json):
+    {
+        "process": { ...plantilla... },
+        "shipping": {
+            "default": { ...plantilla... },
+            "<shipping_method_name>": { ...plantilla... }
+        }
+    }
+
+    :param output_dir: Carpeta donde se escriben las etiquetas generadas.
+    :param default_format: Formato usado si la plantilla no indica uno.
+    """
+    def __init__(self, templates=None, output_dir="spool", default_format=FORMAT_PDF):
+        self.templates = templates or {}
+        self.output_dir = output_dir
+        self.default_format = default_format
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def render_shipping_label(self, order_data):
+        """Genera la etiqueta de envío de un pedido y retorna la ruta del archivo."""
+        shipping = self.templates.get("shipping", {})
+        method = order_data.get("shipping_method_name") or ""
+        template = dict(DEFAULT_SHIPPING_TEMPLATE)
+        template.update(shipping.get("default", {}))
+        template.update(shipping.get(method, {}))
+        return self.render(template, order_data, prefix=f"order_{order_data.get('id', '')}")
+
+    def render_process_label(self, process):
+        """Genera la etiqueta del proceso de packing y retorna la ruta del archivo."""
+        containers = ", ".join(
+            c.get("container", {}).get("bar_code", "") for c in process.get("containers", [])
+        )
+        data = dict(process)
+        data["containers"] = containers
+        template = dict(DEFAULT_PROCESS_TEMPLATE)
+        template.update(self.templates.get("process", {}))
+        return self.render(template, data, prefix=f"process_{process.get('id', '')}")
+
+    def render(self, template, data, prefix="label"):
+        fields = _SafeDict({k: "" if v is None else v for k, v in data.items()})
+        title = template.get("title", "").format_map(fields)
+        lines = [line.format_map(fields) for line in template.get("lines", [])]
+        lines = [line for line in lines if line.strip(" -")]
+        barcode_value = template.get("barcode", "").format_map(fields)
+
+        fmt = template.get("format") or self.default_format
+        if fmt == FORMAT_ZPL:
+            if template.get("zpl"):
+                content = template["zpl"].format_map(fields).encode("utf-8")
+            else:
+                content = build_zpl(title, lines, barcode_value)
+        elif fmt == FORMAT_PDF:
+            content = build_pdf(title, lines, barcode_value)
+        else:
+            raise ValueError(f"Formato de etiqueta desconocido: {fmt}")
+
+        path = os.path.join(self.output_dir, f"{prefix}_{int(time.time())}_{uuid.uuid4().hex[:6]}.{fmt}")
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+
+# ----------------------------------------------------------------------
+# ZPL
+# ----------------------------------------------------------------------
+def _zpl_text(value):
+    # ^ y ~ son caracteres de control en ZPL
+    return str(value).replace("^", " ").replace("~", " ")
+
+def build_zpl(title, lines, barcode_value):
+    out = ["^XA", "^CI28", f"^PW{ZPL_WIDTH}"]
+    y = 40
+    if title:
+        out.append(f"^FO40,{y}^A0N,50,50^FD{_zpl_text(title)}^FS")
+        y += 80
+    for line in lines:
+        out.append(f"^FO40,{y}^A0N,34,34^FD{_zpl_text(line)}^FS")
+        y += 48
+    if barcode_value:
+        y += 20
+        out.append(f"^FO40,{y}^BY3^BCN,160,Y,N,N^FD{_zpl_text(barcode_value)}^FS")
+    out.append("^XZ")
+    return "\n".join(out).encode("utf-8")
+
+
+# ----------------------------------------------------------------------
+# PDF (escritor mínimo: texto Helvetica y barras Code 128 como rectángulos)
+# ----------------------------------------------------------------------
+def _pdf_text(value):
+    text = str(value).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return text.encode("cp1252", errors="replace").decode("latin-1")
+
+def _code128_modules(value):
+    """Retorna la secuencia de módulos '1'/'0' del Code 128 o None si no se puede generar."""
+    try:
+        import barcode
+    except ImportError:
+        return None
+    try:
+        return "".join(barcode.get_barcode_class("code128")(value).build())
+    except Exception:
+        return None
+
+def _page_content(title, lines, barcode_value):
+    ops = []
+    y = PDF_HEIGHT - 40
+    if title:
+        ops.append(f"BT /F2 18 Tf 20 {y} Td ({_pdf_text(title)}) Tj ET")
+        y -= 34
+    for line in lines:
+        ops.append(f"BT /F1 12 Tf 20 {y} Td ({_pdf_text(line)}) Tj ET")
+        y -= 18
+    if barcode_value:
+        modules = _code128_modules(barcode_value)
+        bar_height = 70
+        y -= bar_height + 10
+        if modules:
+            module_width = min(1.5, (PDF_WIDTH - 40) / len(modules))
+            x = 20
+            run_start = None
+            for i, bit in enumerate(modules + "0"):
+                if bit == "1" and run_start is None:
+                    run_start = i
+                elif bit != "1" and run_start is not None:
+                    ops.append(
+                        f"{x + run_start * module_width:.2f} {y} "
+                        f"{(i - run_start) * module_width:.2f} {bar_height} re f"
+                    )
+                    run_start = None
+        ops.append(f"BT /F1 11 Tf 20 {y - 14} Td ({_pdf_text(barcode_value)}) Tj ET")
+    return "\n".join(ops).encode("latin-1")
+
+def build_pdf(title, lines, barcode_value):
+    """Construye un PDF de una página con el diseño de etiqueta."""
+    return build_pdf_pages([_page_content(title, lines, barcode_value)])
+
+def build_pdf_pages(page_contents):
+    """Construye un PDF con una página por cada flujo de contenido recibido."""
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    add(b"")  # 1: catálogo (se completa al final)
+    add(b"")  # 2: árbol de páginas
+    font_regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    font_bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for content in page_contents:
+        stream_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PDF_WIDTH} {PDF_HEIGHT}] "
+             f"/Resources << /Font << /F1 {font_regular} 0 R /F2 {font_bold} 0 R >> >> "
+             f"/Contents {stream_id} 0 R >>").encode("latin-1")
+        ))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
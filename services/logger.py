@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Archivo de log y rotación por tamaño (5 MB x 5 archivos)
+LOG_FILE = "print_debug.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Nivel por defecto; se puede cambiar con la variable de entorno CEREBRO_LOG_LEVEL=DEBUG
+LOG_LEVEL = os.environ.get("CEREBRO_LOG_LEVEL", "INFO").upper()
+
+# Límite de caracteres del mensaje y de cada campo (los payloads de la API se recortan)
+MAX_MESSAGE_CHARS = 2000
+MAX_FIELD_CHARS = 500
+
+ROOT_LOGGER = "cerebro"
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def fields(**values):
+    """
+    Campos estructurados de un registro:
+        logger.info("Pedidos en espera", extra=fields(count=len(data), payload=data))
+    Los valores no se convierten a texto hasta que el registro pasa el filtro de
+    nivel, así que un payload en logger.debug() no cuesta nada si DEBUG está apagado.
+    """
+    return {"fields": values}
+
+def truncate(value, limit=MAX_FIELD_CHARS):
+    """Retorna el valor como texto recortado a 'limit' caracteres."""
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... (+{len(text) - limit} caracteres)"
+
+def _field_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return truncate(value)
+
+
+class _TruncatingQueueHandler(QueueHandler):
+    """
+    Prepara el registro en el hilo que registra (mensaje formateado, campos
+    recortados y traza de la excepción) y lo deja en la cola. La escritura
+    a disco y consola la hace el hilo del QueueListener.
+    """
+    def prepare(self, record):
+        message = truncate(record.getMessage(), MAX_MESSAGE_CHARS)
+        exc_text = None
+        if record.exc_info:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        record.fields = {k: _field_value(v) for k, v in (getattr(record, "fields", None) or {}).items()}
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro."""
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.msg,
+        }
+        data.update(getattr(record, "fields", None) or {})
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Formato de consola: [NIVEL] mensaje clave=valor."""
+    def format(self, record):
+        text = f"[{record.levelname}] {record.msg}"
+        extra = getattr(record, "fields", None)
+        if extra:
+            text += " " + " ".join(f"{k}={v}" for k, v in extra.items())
+        if record.exc_text:
+            text += "\n" + record.exc_text
+        return text
+
+
+def setup_logging(log_file=LOG_FILE, level=LOG_LEVEL, max_bytes=LOG_MAX_BYTES,
+                  backup_count=LOG_BACKUP_COUNT, console=True):
+    """
+    Configura el logger de la aplicación (idempotente):
+    - Los registros se encolan sin bloquear y un hilo (QueueListener) los
+      escribe en 'log_file' como JSON con rotación por tamaño y en consola.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        handlers = []
+        try:
+            directory = os.path.dirname(log_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"[ERROR] No se pudo abrir el archivo de log '{log_file}': {e}", file=sys.stderr)
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(ConsoleFormatter())
+            handlers.append(console_handler)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(level)
+        root.propagate = False
+        root.handlers[:] = [_TruncatingQueueHandler(log_queue)]
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Vacía la cola y detiene el hilo de escritura."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+def get_logger(name):
+    """Retorna un logger hijo de 'cerebro' (configura el logging al primer uso)."""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
@@ -0,0 +1,206 @@
+import queue
+import threading
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PaginatedSource:
+    """
+    Fuente de datos paginada en el servidor (paginador de Laravel:
+    {"data": [...], "current_page": 1, "last_page": 7, "total": 340, ...}).
+
+    Las páginas se piden en un hilo en segundo plano; las filas solo se
+    modifican en el hilo que llama a drain() (el de la interfaz), así la vista
+    puede leer 'rows' sin locks:
+
+        source = PaginatedSource(fetch_page)
+        source.reset()                    # pide la primera página
+        ...
+        if source.drain():                # desde un after() de Tk
+            refrescar la tabla con source.rows / source.total
+
+    Para refrescar sin perder lo cargado (p.ej. al volver a la vista) está
+    refresh(): pide de nuevo las páginas 1..N y sustituye las filas de una vez.
+
+    :param fetch_page: Función fetch_page(page) que retorna el paginador de esa
+                       página (o una lista si el endpoint no pagina). Puede lanzar
+                       excepción si la petición falla.
+    :param key: Función key(fila) opcional; en refresh() descarta filas repetidas
+                (una fila que se desplaza de página entre dos peticiones).
+    """
+    def __init__(self, fetch_page, key=None):
+        self.fetch_page = fetch_page
+        self.key = key
+        self.rows = []
+        self.total = 0
+        self.last_page = None
+        self.next_page = 1
+        self.error = None
+        self._loading = False
+        self._generation = 0
+        self._results = queue.Queue()
+        # Se activa con cancel(); fetch_page puede consultarlo para no descargar lo que ya no interesa
+        self.cancelled = threading.Event()
+
+    @property
+    def has_more(self):
+        return self.last_page is None or self.next_page <= self.last_page
+
+    @property
+    def loading(self):
+        return self._loading
+
+    def reset(self, fetch_page=None):
+        """
+        Descarta las filas cargadas y pide de nuevo la primera página
+        (p.ej. al cambiar el filtro de búsqueda). Las respuestas que lleguen
+        de la consulta anterior se ignoran.
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        self._generation += 1
+        self.rows = []
+        self.total = 0
+        self.last_page = None
+        self.next_page = 1
+        self.error = None
+        self._loading = False
+        self.load_more()
+
+    def refresh(self, fetch_page=None):
+        """
+        Refresco suave: pide de nuevo en segundo plano las páginas ya cargadas
+        (1..N) y, cuando han llegado todas, sustituye las filas de una vez.
+        Mientras tanto se siguen viendo las anteriores, así la tabla conserva
+        el desplazamiento aunque esté más allá de la primera página. Si falla
+        alguna página se conservan las filas anteriores (queda en self.error).
+        Sin nada cargado equivale a reset().
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        pages = self.next_page - 1 if self.rows else 0
+        if pages < 1:
+            self.reset()
+            return
+        # Las páginas de load_more() aún en curso se descartan: se vuelven a pedir todas
+        self._generation += 1
+        self._loading = True
+        generation, fetch_page = self._generation, self.fetch_page
+        threading.Thread(
+            target=self._fetch_pages, args=(fetch_page, pages, generation),
+            name=f"PaginatedSource-refresh-p1-{pages}", daemon=True
+        ).start()
+
+    def prime(self, result, page=1):
+        """
+        Como reset(), pero usa una página que ya llegó por otra vía (p.ej.
+        incluida en otra respuesta) en lugar de pedirla.
+        """
+        self._generation += 1
+        self.rows = []
+        self.total = 0
+        self.last_page = None
+        self.next_page = page
+        self.error = None
+        self._loading = False
+        self._apply(page, result)
+
+    def cancel(self):
+        """
+        Abandona la fuente (p.ej. una búsqueda sustituida por otra): lo que
+        llegue después se ignora y self.cancelled queda activado para que la
+        petición en curso no descargue ni decodifique la respuesta.
+        """
+        self.cancelled.set()
+        self._generation += 1
+        self._loading = False
+
+    def load_more(self):
+        """Pide la siguiente página en segundo plano (si no hay otra en curso)."""
+        if self._loading or not self.has_more:
+            return False
+        self._loading = True
+        page, generation, fetch_page = self.next_page, self._generation, self.fetch_page
+        threading.Thread(
+            target=self._fetch, args=(fetch_page, page, generation),
+            name=f"PaginatedSource-p{page}", daemon=True
+        ).start()
+        return True
+
+    def drain(self):
+        """
+        Aplica las páginas recibidas. Se llama desde el hilo de la interfaz.
+        Retorna True si las filas, el total o el error cambiaron.
+        """
+        changed = False
+        while True:
+            try:
+                generation, page, result, error = self._results.get_nowait()
+            except queue.Empty:
+                return changed
+            if generation != self._generation:
+                continue
+            self._loading = False
+            changed = True
+            if error is not None:
+                self.error = error
+                continue
+            self.error = None
+            if page is None:
+                self._replace(result)
+            else:
+                self._apply(page, result)
+
+    def _replace(self, results):
+        """Sustituye las filas por las páginas de refresh() (lista de paginadores desde la 1)."""
+        self.rows = []
+        self.total = 0
+        self.last_page = None
+        self.next_page = 1
+        for page, result in enumerate(results, start=1):
+            self._apply(page, result)
+        if self.key is not None:
+            seen = set()
+            unique = []
+            for row in self.rows:
+                row_key = self.key(row)
+                if row_key not in seen:
+                    seen.add(row_key)
+                    unique.append(row)
+            self.rows = unique
+
+    def _apply(self, page, result):
+        if isinstance(result, dict):
+            data = result.get("data", [])
+            self.last_page = int(result.get("last_page") or page)
+            self.next_page = int(result.get("current_page") or page) + 1
+            self.rows.extend(data)
+            self.total = int(result.get("total") or len(self.rows))
+        else:
+            # Respuesta sin paginar: una sola página con todo
+            self.rows.extend(result or [])
+            self.last_page = page
+            self.next_page = page + 1
+            self.total = len(self.rows)
+
+    def _fetch(self, fetch_page, page, generation):
+        try:
+            result, error = fetch_page(page), None
+        except Exception as e:
+            logger.error(f"Error cargando la página {page}: {e}")
+            result, error = None, e
+        self._results.put((generation, page, result, error))
+
+    def _fetch_pages(self, fetch_page, pages, generation):
+        results, error = [], None
+        for page in range(1, pages + 1):
+            try:
+                results.append(fetch_page(page))
+            except Exception as e:
+                logger.error(f"Error refrescando la página {page}: {e}")
+                error = e
+                break
+        # page=None: el resultado son todas las páginas (ver drain)
+        self._results.put((generation, None, results, error))
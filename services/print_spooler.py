@@ -0,0 +1,466 @@
+import os
+import json
+import time
+import uuid
+import threading
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Estados posibles de un trabajo de impresión
+JOB_QUEUED = "queued"
+JOB_DOWNLOADING = "downloading"
+JOB_SENT = "sent"
+JOB_FAILED = "failed"
+
+# Archivo donde se persiste la cola para sobrevivir a reinicios de la aplicación.
+PRINT_QUEUE_FILE = "print_queue.json"
+
+
+class PermanentPrintError(Exception):
+    """
+    Error que no se arregla reintentando ni cambiando de impresora (p.ej. un
+    formato que el backend no sabe imprimir): el trabajo falla sin reintentos.
+    """
+
+
+class PrintJob:
+    """
+    Trabajo de impresión encolado en el spooler.
+    Se serializa a JSON para poder persistir la cola en disco.
+    """
+    def __init__(self, url, printer=None, description="", job_id=None, order_id=None,
+                 label_type=None, shipping_method=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.url = url
+        self.printer = printer
+        self.description = description
+        self.order_id = order_id
+        # Datos de enrutado: permiten elegir otra impresora del pool si esta falla
+        self.label_type = label_type
+        self.shipping_method = shipping_method
+        self.status = JOB_QUEUED
+        self.attempts = 0
+        self.next_attempt_at = 0.0
+        self.error = None
+        self.file_path = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data.get("url"), data.get("printer"), data.get("description", ""), data.get("id"))
+        for key, value in data.items():
+            if hasattr(job, key):
+                setattr(job, key, value)
+        return job
+
+
+class PrintSpooler:
+    """
+    Spooler de impresión en segundo plano:
+    - Cola FIFO persistente (los trabajos de cada impresora se imprimen en el
+      orden en que se encolan).
+    - Hilos de trabajo que descargan y envían cada etiqueta fuera del hilo de la UI;
+      cada impresora atiende un trabajo a la vez, pero varias impresoras trabajan
+      en paralelo.
+    - Reintentos con backoff exponencial, pudiendo cambiar de impresora (failover).
+      Un PermanentPrintError hace fallar el trabajo sin reintentar.
+    - Modo lote opcional: los trabajos que llegan a la misma impresora dentro de
+      una ventana corta se unen en un solo documento o flujo raw.
+    - Estado por trabajo (queued/downloading/sent/failed) notificado a los suscriptores.
+    - Los archivos temporales se eliminan solo cuando ha pasado un margen
+      tras entregarlos a la impresora, nunca inmediatamente.
+
+    :param download: Función download(url) -> ruta del archivo descargado.
+    :param send: Función send(file_path, printer) que entrega el archivo a la impresora.
+    :param release: Función release(file_path) que se llama al vencer el margen de entrega.
+                    Por defecto borra el archivo.
+    :param reroute: Función reroute(job) -> impresora, llamada cuando un envío falla,
+                    para reintentar en otra impresora del mismo pool.
+    :param workers: Número de hilos de trabajo (impresoras atendidas en paralelo).
+    :param merge: Función merge(rutas) -> ruta del documento unido, o None si esos
+                  archivos no se pueden unir. Necesaria para el modo lote.
+    :param batch_window: Segundos que se espera a más etiquetas para formar un lote
+                         (0 = modo lote desactivado).
+    :param max_batch_latency: Máximo que una etiqueta puede esperar en cola por el lote.
+    :param max_batch_size: Máximo de etiquetas por lote.
+    """
+    def __init__(self, download, send, release=None, reroute=None, queue_file=PRINT_QUEUE_FILE,
+                 max_retries=3, backoff_base=2.0, cleanup_delay=60.0, history_size=50, workers=1,
+                 merge=None, batch_window=0.0, max_batch_latency=1.0, max_batch_size=20):
+        self.download = download
+        self.send = send
+        self.release = release or self._remove_file
+        self.reroute = reroute
+        self.workers = max(1, workers)
+        self.merge = merge
+        self.batch_window = batch_window if merge else 0.0
+        self.max_batch_latency = max_batch_latency
+        self.max_batch_size = max(1, max_batch_size)
+        self.queue_file = queue_file
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.cleanup_delay = cleanup_delay
+        self.history_size = history_size
+
+        self._jobs = []             # Cola FIFO de trabajos pendientes
+        self._history = []          # Últimos trabajos terminados (sent/failed)
+        self._pending_cleanup = []  # [(ruta, instante a partir del cual se puede borrar)]
+        self._subscribers = []
+        self._busy = set()          # Impresoras con un trabajo en curso
+        self._lock = threading.Condition()
+        self._threads = []
+        self._stopped = False
+
+        self._load_queue()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def start(self):
+        """Arranca los hilos de trabajo (idempotente)."""
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stopped = False
+            self._threads = [
+                threading.Thread(target=self._run, name=f"PrintSpooler-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout=None):
+        """Detiene los hilos de trabajo. Los trabajos pendientes quedan persistidos."""
+        with self._lock:
+            self._stopped = True
+            self._lock.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def submit(self, url, printer=None, description="", order_id=None, file_path=None,
+               label_type=None, shipping_method=None):
+        """
+        Encola un trabajo de impresión y retorna su id sin bloquear.
+        Si se indica file_path (p.ej. una etiqueta en caché) no se descarga nada.
+        """
+        job = PrintJob(url, printer, description, order_id=order_id,
+                       label_type=label_type, shipping_method=shipping_method)
+        job.file_path = file_path
+        with self._lock:
+            self._jobs.append(job)
+            self._save_queue()
+            self._lock.notify_all()
+        logger.info(f"Trabajo de impresión encolado ({job.id}): {url}")
+        self._notify(job)
+        return job.id
+
+    def get_job(self, job_id):
+        with self._lock:
+            for job in self._jobs + self._history:
+                if job.id == job_id:
+                    return job
+        return None
+
+    def get_jobs(self):
+        """Retorna una copia de los trabajos pendientes y del historial reciente."""
+        with self._lock:
+            return list(self._jobs) + list(self._history)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def pending_by_printer(self):
+        """Retorna {impresora: trabajos pendientes}, usado para balancear la carga."""
+        with self._lock:
+            depths = {}
+            for job in self._jobs:
+                depths[job.printer] = depths.get(job.printer, 0) + 1
+            return depths
+
+    def subscribe(self, callback):
+        """
+        Registra un callback(job) que se invoca en cada cambio de estado.
+        Se llama desde el hilo del spooler: la UI debe re-despachar al hilo de Tk.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # ------------------------------------------------------------------
+    # Hilo de trabajo
+    # ------------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._lock:
+                job = None
+                while not self._stopped:
+                    self._cleanup_files()
+                    job, wait = self._next_ready()
+                    if job:
+                        break
+                    # Se despierta al menos periódicamente para limpiar archivos
+                    self._lock.wait(self._cleanup_wait(wait))
+                if self._stopped:
+                    return
+                printer = job.printer
+                self._busy.add(printer)
+                batch = [job]
+                self._start_job(job)
+                if self.batch_window > 0:
+                    self._collect_batch(batch)
+            for item in batch:
+                self._notify(item)
+            try:
+                self._process_batch(batch)
+            finally:
+                with self._lock:
+                    self._busy.discard(printer)
+                    self._lock.notify_all()
+
+    def _start_job(self, job):
+        """Marca el trabajo como en curso. Requiere el lock."""
+        # No se persiste este cambio: al recargar, un trabajo a medias vuelve a "queued"
+        job.status = JOB_DOWNLOADING
+        job.attempts += 1
+        job.updated_at = time.time()
+
+    def _collect_batch(self, batch):
+        """
+        Modo lote: espera hasta batch_window segundos a que lleguen más trabajos
+        para la misma impresora, sin retener nunca el primero más de
+        max_batch_latency desde que se encoló. Requiere el lock.
+        """
+        first = batch[0]
+        deadline = min(time.time() + self.batch_window, first.created_at + self.max_batch_latency)
+        while len(batch) < self.max_batch_size and not self._stopped:
+            now = time.time()
+            for job in self._jobs:
+                if len(batch) >= self.max_batch_size:
+                    break
+                if job.printer != first.printer or job in batch:
+                    continue
+                if job.status != JOB_QUEUED or job.next_attempt_at > now:
+                    break  # Respeta el orden FIFO de la impresora
+                self._start_job(job)
+                batch.append(job)
+            remaining = deadline - time.time()
+            if remaining <= 0 or len(batch) >= self.max_batch_size:
+                break
+            self._lock.wait(remaining)
+
+    def _next_ready(self):
+        """
+        Retorna (trabajo listo, None) o (None, segundos hasta el próximo reintento).
+        Un trabajo solo está listo si su impresora está libre y no tiene trabajos
+        anteriores pendientes, para respetar el orden FIFO por impresora. Requiere el lock.
+        """
+        now = time.time()
+        blocked = set(self._busy)
+        wait = None
+        for job in self._jobs:
+            if job.status != JOB_QUEUED or job.printer in blocked:
+                blocked.add(job.printer)
+                continue
+            delay = job.next_attempt_at - now
+            if delay <= 0:
+                return job, None
+            wait = delay if wait is None else min(wait, delay)
+            blocked.add(job.printer)
+        return None, wait
+
+    def _process_batch(self, batch):
+        """
+        Descarga los archivos del lote y, si hay más de uno y se pueden unir,
+        los envía como un único documento/flujo. Si no, se envían uno a uno.
+        """
+        ready = []
+        for job in batch:
+            try:
+                if not job.file_path or not os.path.exists(job.file_path):
+                    job.file_path = self.download(job.url)
+                ready.append(job)
+            except Exception as e:
+                self._fail(job, e)
+
+        merged_path = None
+        if len(ready) > 1 and self.merge:
+            try:
+                merged_path = self.merge([job.file_path for job in ready])
+            except Exception as e:
+                logger.error(f"No se pudieron unir {len(ready)} etiquetas, se envían por separado: {e}")
+
+        if not merged_path:
+            for job in ready:
+                try:
+                    self.send(job.file_path, job.printer)
+                except Exception as e:
+                    self._fail(job, e)
+                    continue
+                self._complete(job)
+            return
+
+        logger.info(f"Enviando lote de {len(ready)} etiquetas a: {ready[0].printer}")
+        try:
+            self.send(merged_path, ready[0].printer)
+        except Exception as e:
+            for job in ready:
+                self._fail(job, e)
+            self._schedule_cleanup(merged_path)
+            return
+        for job in ready:
+            self._complete(job)
+        self._schedule_cleanup(merged_path)
+
+    def _complete(self, job):
+        with self._lock:
+            job.status = JOB_SENT
+            job.error = None
+            job.updated_at = time.time()
+            self._finish(job)
+            self._save_queue()
+        logger.info(f"Trabajo de impresión enviado ({job.id}) a: {job.printer}")
+        self._notify(job)
+
+    def _fail(self, job, error):
+        logger.exception(f"Falló el trabajo de impresión {job.id} (intento {job.attempts}): {error}")
+        with self._lock:
+            job.error = str(error)
+            job.updated_at = time.time()
+            retry = job.attempts < self.max_retries and not isinstance(error, PermanentPrintError)
+            if not retry:
+                job.status = JOB_FAILED
+                self._finish(job)
+                self._save_queue()
+        if retry:
+            # reroute() se llama sin el lock: el enrutador consulta pending_by_printer()
+            # con su propio lock tomado y el orden inverso bloquearía ambos hilos.
+            # Mientras tanto el trabajo sigue en curso y ningún hilo lo toma
+            printer = self._reroute_target(job)
+            with self._lock:
+                job.status = JOB_QUEUED
+                job.next_attempt_at = time.time() + self.backoff_base * (2 ** (job.attempts - 1))
+                self._apply_reroute(job, printer)
+                self._save_queue()
+                self._lock.notify_all()
+        self._notify(job)
+
+    def _schedule_cleanup(self, path):
+        with self._lock:
+            self._pending_cleanup.append((path, time.time() + self.cleanup_delay))
+
+    def _finish(self, job):
+        """Mueve el trabajo al historial y programa la limpieza de su archivo. Requiere el lock."""
+        if job in self._jobs:
+            self._jobs.remove(job)
+        self._history.append(job)
+        del self._history[:-self.history_size]
+        if job.file_path:
+            self._pending_cleanup.append((job.file_path, time.time() + self.cleanup_delay))
+
+    def _reroute_target(self, job):
+        """Failover: impresora a la que mover el trabajo fallido (o None). Se llama sin el lock."""
+        if not self.reroute:
+            return None
+        try:
+            return self.reroute(job)
+        except Exception as e:
+            logger.error(f"No se pudo reenrutar el trabajo {job.id}: {e}")
+            return None
+
+    def _apply_reroute(self, job, printer):
+        """Si hay otra impresora disponible se reintenta allí sin esperar. Requiere el lock."""
+        if printer and printer != job.printer:
+            logger.info(f"Trabajo {job.id} reenrutado de {job.printer} a {printer}")
+            # Se mueve detrás de los trabajos ya encolados para la nueva impresora
+            self._jobs.remove(job)
+            self._jobs.append(job)
+            job.printer = printer
+            job.next_attempt_at = 0.0
+
+    def _cleanup_wait(self, wait):
+        if not self._pending_cleanup:
+            return wait
+        cleanup_wait = min(when for _, when in self._pending_cleanup) - time.time()
+        if wait is None:
+            return max(cleanup_wait, 0.1)
+        return max(min(wait, cleanup_wait), 0.1)
+
+    def _cleanup_files(self):
+        """Libera los archivos cuyo margen de entrega ya venció. Requiere el lock."""
+        now = time.time()
+        remaining = []
+        for path, when in self._pending_cleanup:
+            if when > now:
+                remaining.append((path, when))
+                continue
+            try:
+                self.release(path)
+            except OSError:
+                # Todavía en uso por el visor/spooler del sistema: se reintenta más tarde
+                remaining.append((path, now + self.cleanup_delay))
+        self._pending_cleanup = remaining
+
+    @staticmethod
+    def _remove_file(path):
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Archivo temporal eliminado: {path}")
+
+    def _notify(self, job):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(job)
+            except Exception as e:
+                logger.error(f"Error notificando estado de impresión: {e}")
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+    def _load_queue(self):
+        if not os.path.exists(self.queue_file):
+            return
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"No se pudo leer la cola de impresión '{self.queue_file}': {e}")
+            return
+
+        for item in data.get("jobs", []):
+            job = PrintJob.from_dict(item)
+            # Un trabajo interrumpido a medias vuelve a la cola
+            job.status = JOB_QUEUED
+            job.next_attempt_at = 0.0
+            self._jobs.append(job)
+        # Archivos de trabajos terminados que quedaron sin borrar en la sesión anterior
+        for path in data.get("pending_cleanup", []):
+            self._pending_cleanup.append((path, 0.0))
+        if self._jobs:
+            logger.info(f"Se recuperaron {len(self._jobs)} trabajos de impresión pendientes.")
+
+    def _save_queue(self):
+        """Escribe la cola de forma atómica. Requiere el lock."""
+        data = {
+            "jobs": [job.to_dict() for job in self._jobs],
+            "pending_cleanup": [path for path, _ in self._pending_cleanup],
+        }
+        tmp_path = f"{self.queue_file}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.queue_file)
+        except Exception as e:
+            logger.error(f"No se pudo guardar la cola de impresión: {e}")
@@ -0,0 +1,176 @@
+import os
+import socket
+import subprocess
+
+from services.print_spooler import PermanentPrintError
+
+# Tipos de backend que se pueden elegir en printer_config.json ("backend": ...)
+BACKEND_WIN32 = "win32"
+BACKEND_RAW = "raw"
+BACKEND_CUPS = "cups"
+
+DEFAULT_RAW_PORT = 9100
+
+
+class UnsupportedFormatError(PermanentPrintError, ValueError):
+    """El backend no sabe imprimir ese archivo; reintentarlo no sirve de nada."""
+
+
+class PrinterBackend:
+    """
+    Interfaz común de los backends de impresión.
+    - send(file_path, printer): entrega el archivo a la impresora (lanza excepción si falla).
+    - list_printers(): nombres de impresoras disponibles.
+    - default_printer(): impresora por defecto o None.
+    - supports(file_path): si el backend sabe imprimir ese archivo (según 'formats').
+    """
+    name = None
+    # Formatos que el backend sabe imprimir (extensiones sin punto)
+    formats = ()
+
+    def send(self, file_path, printer):
+        raise NotImplementedError
+
+    def list_printers(self):
+        return []
+
+    def default_printer(self):
+        printers = self.list_printers()
+        return printers[0] if printers else None
+
+    def supports(self, file_path):
+        return os.path.splitext(file_path)[1].lower().lstrip(".") in self.formats
+
+    def check_supported(self, file_path):
+        """Lanza UnsupportedFormatError si el backend no sabe imprimir el archivo."""
+        if not self.supports(file_path):
+            ext = os.path.splitext(file_path)[1].lstrip(".") or "sin extensión"
+            raise UnsupportedFormatError(
+                f"El backend {self.name} no imprime archivos {ext} (admite: {', '.join(self.formats)})."
+            )
+
+
+class Win32ShellBackend(PrinterBackend):
+    """
+    Backend original: imprime con el verbo "print" de ShellExecute, que abre
+    el visor de PDF asociado. Los módulos win32 se importan solo al usarlo.
+    """
+    name = BACKEND_WIN32
+    formats = ("pdf", "txt")
+
+    def send(self, file_path, printer):
+        self.check_supported(file_path)
+        import win32api
+        win32api.ShellExecute(0, "print", file_path, f'/d:"{printer}"', ".", 0)
+
+    def list_printers(self):
+        import win32print
+        flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
+        return [printer[2] for printer in win32print.EnumPrinters(flags)]
+
+    def default_printer(self):
+        import win32print
+        return win32print.GetDefaultPrinter()
+
+
+class RawTcpBackend(PrinterBackend):
+    """
+    Envía el archivo tal cual (ZPL/EPL) por TCP al puerto 9100 de una impresora
+    térmica de red, sin pasar por ningún visor ni driver.
+    El nombre de la impresora es "host" o "host:puerto".
+
+    :param printers: Lista de impresoras de red configuradas.
+    """
+    name = BACKEND_RAW
+    formats = ("zpl", "epl", "raw", "txt")
+
+    def __init__(self, printers=None, timeout=10):
+        self.printers = list(printers or [])
+        self.timeout = timeout
+
+    def send(self, file_path, printer):
+        self.check_supported(file_path)
+        with open(file_path, "rb") as f:
+            payload = f.read()
+        if payload.startswith(b"%PDF"):
+            raise UnsupportedFormatError("El backend raw solo acepta etiquetas ZPL/EPL, no PDF.")
+        self.send_bytes(payload, printer)
+
+    def send_bytes(self, payload, printer):
+        host, port = self.parse_address(printer)
+        with socket.create_connection((host, port), timeout=self.timeout) as sock:
+            sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+
+    @staticmethod
+    def parse_address(printer):
+        host, _, port = str(printer).partition(":")
+        return host, int(port) if port else DEFAULT_RAW_PORT
+
+    def list_printers(self):
+        return list(self.printers)
+
+
+class CupsBackend(PrinterBackend):
+    """
+    Backend para Linux: imprime con el comando `lp` de CUPS y enumera
+    las colas con `lpstat`.
+    """
+    name = BACKEND_CUPS
+    formats = ("pdf", "txt", "zpl", "epl", "raw")
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+
+    def send(self, file_path, printer):
+        self.check_supported(file_path)
+        cmd = ["lp"]
+        if printer:
+            cmd += ["-d", printer]
+        if not file_path.lower().endswith((".pdf", ".txt")):
+            # ZPL/EPL: se envía sin filtros de CUPS
+            cmd += ["-o", "raw"]
+        cmd.append(file_path)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=self.timeout)
+        if result.returncode != 0:
+            raise RuntimeError(f"lp falló ({result.returncode}): {result.stderr.strip()}")
+
+    def list_printers(self):
+        try:
+            result = subprocess.run(["lpstat", "-a"], capture_output=True, text=True, timeout=self.timeout)
+        except (OSError, subprocess.SubprocessError):
+            return []
+        return [line.split()[0] for line in result.stdout.splitlines() if line.strip()]
+
+    def default_printer(self):
+        try:
+            result = subprocess.run(["lpstat", "-d"], capture_output=True, text=True, timeout=self.timeout)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        # Formato: "system default destination: NOMBRE"
+        _, _, name = result.stdout.partition(":")
+        return name.strip() or None
+
+
+def default_backend_name():
+    return BACKEND_WIN32 if os.name == "nt" else BACKEND_CUPS
+
+
+def create_backend(config):
+    """
+    Crea el backend indicado en la configuración de impresoras.
+    Estructura esperada (todas las claves son opcionales):
+    {
+        "backend": "win32" | "raw" | "cups",
+        "raw_printers": ["192.168.1.50", "192.168.1.51:9100"]
+    }
+    """
+    config = config or {}
+    name = config.get("backend") or default_backend_name()
+    if name == BACKEND_RAW:
+        return RawTcpBackend(printers=config.get("raw_printers", []))
+    if name == BACKEND_CUPS:
+        return CupsBackend()
+    if name == BACKEND_WIN32:
+        return Win32ShellBackend()
+    raise ValueError(f"Backend de impresión desconocido: {name}")
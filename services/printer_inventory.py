@@ -0,0 +1,97 @@
+import time
+import threading
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PrinterInventory:
+    """
+    Inventario de impresoras en caché.
+    Enumerar impresoras (sobre todo las de red) puede tardar segundos, así que
+    la enumeración se hace en un hilo en segundo plano: al arrancar, cada
+    'refresh_interval' segundos y cuando se pide con refresh_async().
+    La UI lee siempre la última lista conocida con get() sin bloquear.
+
+    :param list_printers: Función que retorna (lista de impresoras, impresora por defecto).
+    """
+    def __init__(self, list_printers, refresh_interval=300.0):
+        self.list_printers = list_printers
+        self.refresh_interval = refresh_interval
+
+        self._printers = []
+        self._default = None
+        self._updated_at = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._refreshing = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Arranca el hilo de refresco periódico (idempotente) y lanza la primera enumeración."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="PrinterInventory", daemon=True)
+            self._thread.start()
+
+    def get(self):
+        """Retorna (impresoras, impresora por defecto) de la última enumeración."""
+        with self._lock:
+            return list(self._printers), self._default
+
+    def is_loaded(self):
+        with self._lock:
+            return self._updated_at is not None
+
+    def refresh_async(self):
+        """Pide una nueva enumeración en segundo plano."""
+        self.start()
+        self._wakeup.set()
+
+    def refresh(self):
+        """Enumera las impresoras en el hilo actual y notifica a los suscriptores."""
+        # Si ya hay una enumeración en curso no se lanza otra en paralelo
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            printers, default = self.list_printers()
+        except Exception as e:
+            logger.exception(f"Error enumerando impresoras: {e}")
+            return
+        finally:
+            self._refreshing.release()
+
+        with self._lock:
+            changed = (printers, default) != (self._printers, self._default) or self._updated_at is None
+            self._printers = list(printers)
+            self._default = default
+            self._updated_at = time.time()
+            subscribers = list(self._subscribers)
+        if changed:
+            for callback in subscribers:
+                try:
+                    callback(list(printers), default)
+                except Exception as e:
+                    logger.error(f"Error notificando inventario de impresoras: {e}")
+
+    def subscribe(self, callback):
+        """
+        Registra un callback(impresoras, por_defecto) que se invoca cuando el
+        inventario cambia. Se llama desde el hilo del inventario.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _run(self):
+        while True:
+            self.refresh()
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
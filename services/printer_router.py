@@ -0,0 +1,108 @@
+import time
+import threading
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tipos de etiqueta que se pueden enrutar
+LABEL_PROCESS = "process"   # Etiqueta del proceso (start_packing)
+LABEL_ORDER = "order"       # Etiqueta de envío del pedido (confirm_current_order / reimpresión)
+
+
+class PrinterRouter:
+    """
+    Elige la impresora de cada etiqueta a partir de pools y reglas:
+
+    {
+        "selected_printer": "POS-80C",
+        "printer_pools": {
+            "envios": ["ZD420-1", "ZD420-2"],
+            "procesos": ["POS-80C"]
+        },
+        "routing_rules": [
+            {"shipping_method": "SEUR 24", "pool": "envios"},
+            {"label_type": "process", "pool": "procesos"},
+            {"label_type": "order", "pool": "envios"}
+        ]
+    }
+
+    - Se aplica la primera regla que coincide (todas sus condiciones).
+    - Dentro del pool se elige la impresora con menos trabajos en cola;
+      en empate, por turnos (round robin).
+    - Las impresoras que fallan quedan marcadas como caídas durante
+      'down_cooldown' segundos y se saltan mientras haya alternativas.
+    - Sin regla aplicable se usa 'selected_printer'.
+
+    :param queue_depth: Función que retorna {impresora: trabajos pendientes}.
+    """
+    def __init__(self, settings=None, queue_depth=None, down_cooldown=60.0):
+        self.queue_depth = queue_depth or (lambda: {})
+        self.down_cooldown = down_cooldown
+        self._down_until = {}
+        self._turn = 0
+        self._lock = threading.Lock()
+        self.configure(settings or {})
+
+    def configure(self, settings):
+        """Actualiza pools y reglas (p.ej. al guardar la configuración)."""
+        with self._lock:
+            self.default_printer = settings.get("selected_printer")
+            self.pools = {name: list(printers) for name, printers in settings.get("printer_pools", {}).items()}
+            self.rules = list(settings.get("routing_rules", []))
+
+    def route(self, label_type=None, shipping_method=None, exclude=None):
+        """Retorna la impresora para la etiqueta, o None si no hay ninguna configurada."""
+        candidates = self.candidates(label_type, shipping_method)
+        if exclude:
+            candidates = [p for p in candidates if p not in exclude] or candidates
+        if not candidates:
+            return self.default_printer
+
+        # Fuera del lock: queue_depth() toma el lock del spooler, y el spooler
+        # llama a failover() (que toma este) al fallar un envío
+        depths = self.queue_depth()
+        with self._lock:
+            now = time.time()
+            available = [p for p in candidates if self._down_until.get(p, 0) <= now]
+            # Si todas están caídas se sigue intentando con el pool completo
+            pool = available or candidates
+            lowest = min(depths.get(p, 0) for p in pool)
+            tied = [p for p in pool if depths.get(p, 0) == lowest]
+            printer = tied[self._turn % len(tied)]
+            self._turn += 1
+        return printer
+
+    def candidates(self, label_type=None, shipping_method=None):
+        """Impresoras del pool de la primera regla que coincide."""
+        with self._lock:
+            for rule in self.rules:
+                if "label_type" in rule and rule["label_type"] != label_type:
+                    continue
+                if "shipping_method" in rule and rule["shipping_method"] != shipping_method:
+                    continue
+                printers = self.pools.get(rule.get("pool"), [])
+                if printers:
+                    return list(printers)
+        return [self.default_printer] if self.default_printer else []
+
+    def mark_down(self, printer):
+        with self._lock:
+            self._down_until[printer] = time.time() + self.down_cooldown
+        logger.info(f"Impresora marcada como no disponible: {printer}")
+
+    def mark_up(self, printer):
+        with self._lock:
+            self._down_until.pop(printer, None)
+
+    def is_available(self, printer):
+        with self._lock:
+            return self._down_until.get(printer, 0) <= time.time()
+
+    def failover(self, job):
+        """
+        Para el spooler: marca como caída la impresora del trabajo fallido y
+        retorna otra del mismo pool (o la misma si no hay alternativa).
+        """
+        self.mark_down(job.printer)
+        return self.route(job.label_type, job.shipping_method, exclude={job.printer})
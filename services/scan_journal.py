@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import queue
+import threading
+
+from services.logger import get_logger, fields
+
+logger = get_logger(__name__)
+
+# Un archivo JSONL por proceso de packing: scan_journal/process_<id>.jsonl
+SCAN_JOURNAL_DIR = "scan_journal"
+# Tras el primer escaneo pendiente se espera este tiempo a más escaneos
+# antes de escribir, para hacer un solo fsync por lote
+BATCH_WINDOW = 0.05
+
+
+class ScanJournal:
+    """
+    Diario local de escaneos para no perder el progreso de un pedido si la
+    aplicación se cierra o el PC se reinicia a mitad de pedido.
+
+    Cada escaneo aceptado añade una línea {"o": orden, "p": producto, "n": escaneados}
+    con la cantidad ya escaneada de ese producto (no el incremento), así que al
+    reproducir el diario basta con quedarse con la última línea de cada producto.
+
+    - record() no bloquea: un hilo propio agrupa las líneas pendientes y hace
+      una escritura y un fsync por lote.
+    - restore() devuelve lo escaneado de una orden ({product_id: escaneados}).
+    - compact() quita del diario una orden ya confirmada (reescritura atómica);
+      si no queda nada se borra el archivo.
+
+    Una línea a medio escribir (corte de luz) se ignora al leer.
+    """
+    def __init__(self, directory=SCAN_JOURNAL_DIR, batch_window=BATCH_WINDOW):
+        self.directory = directory
+        self.batch_window = batch_window
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="ScanJournal", daemon=True)
+        self._thread.start()
+
+    def path_for(self, process_id):
+        return os.path.join(self.directory, f"process_{process_id}.jsonl")
+
+    def record(self, process_id, order_id, product_id, scanned):
+        """Anota que de 'product_id' ya hay 'scanned' unidades escaneadas en la orden."""
+        self._queue.put(("record", process_id, {"o": order_id, "p": product_id, "n": scanned, "t": round(time.time(), 3)}))
+
+    def compact(self, process_id, confirmed_order_id):
+        """Elimina del diario la orden confirmada (se hace en el hilo del diario, tras lo pendiente)."""
+        self._queue.put(("compact", process_id, confirmed_order_id))
+
+    def flush(self, timeout=2.0):
+        """Espera a que lo pendiente esté escrito y sincronizado en disco."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def restore(self, process_id, order_id):
+        """{product_id: escaneados} de la orden según el diario (vacío si no hay nada)."""
+        self.flush()
+        scanned = {}
+        for entry in self._read(process_id):
+            if entry.get("o") == order_id and "p" in entry:
+                scanned[entry["p"]] = entry.get("n", 0)
+        return scanned
+
+    # ------------------------------------------------------------------
+    # Hilo del diario
+    # ------------------------------------------------------------------
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Se esperan más escaneos durante la ventana, salvo que alguien
+            # espere (flush) o llegue un compact: entonces se escribe ya
+            deadline = time.monotonic() + self.batch_window
+            while self._is_record(items[-1]):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Se respeta el orden: las líneas de antes de un compact se escriben antes
+            pending = {}
+            for item in items:
+                if isinstance(item, threading.Event):
+                    self._write_pending(pending)
+                    item.set()
+                elif self._is_record(item):
+                    pending.setdefault(item[1], []).append(item[2])
+                else:
+                    self._write_pending(pending)
+                    self._compact(item[1], item[2])
+            self._write_pending(pending)
+
+    @staticmethod
+    def _is_record(item):
+        return isinstance(item, tuple) and item[0] == "record"
+
+    def _write_pending(self, pending):
+        for process_id, entries in pending.items():
+            self._append(process_id, entries)
+        pending.clear()
+
+    def _append(self, process_id, entries):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+            with open(self.path_for(process_id), "ab+") as f:
+                # Si un corte dejó una línea a medias, se cierra para no perder la primera nueva
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"No se pudo escribir el diario de escaneos: {e}", extra=fields(process_id=process_id))
+
+    def _read(self, process_id):
+        path = self.path_for(process_id)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError as e:
+            logger.error(f"No se pudo leer el diario de escaneos '{path}': {e}")
+        return entries
+
+    def _compact(self, process_id, confirmed_order_id):
+        path = self.path_for(process_id)
+        remaining = [entry for entry in self._read(process_id) if entry.get("o") != confirmed_order_id]
+        try:
+            if not remaining:
+                if os.path.exists(path):
+                    os.remove(path)
+                return
+            # Solo la última línea de cada producto
+            latest = {}
+            for entry in remaining:
+                latest[(entry.get("o"), entry.get("p"))] = entry
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in latest.values()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"No se pudo compactar el diario de escaneos '{path}': {e}")
+
+
+_scan_journal = None
+_scan_journal_lock = threading.Lock()
+
+def get_scan_journal():
+    """Diario de escaneos compartido por toda la app."""
+    global _scan_journal
+    with _scan_journal_lock:
+        if _scan_journal is None:
+            _scan_journal = ScanJournal()
+        return _scan_journal
@@ -0,0 +1,90 @@
+import re
+import bisect
+import unicodedata
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def normalize(text):
+    """Minúsculas y sin tildes: 'Proceso Nº 12 Peña' -> 'proceso no 12 pena'."""
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """
+    Índice invertido en memoria con búsqueda por tokens y prefijos.
+
+    Cada documento se indexa por los textos que retorna fields(doc). Una
+    consulta coincide con un documento si cada palabra de la consulta es
+    prefijo de alguna palabra del documento ("pro 12" encuentra "Proceso 123").
+    Los resultados se devuelven en el orden en que se añadieron.
+
+    :param fields: Función fields(doc) -> iterable de textos a indexar.
+    :param key: Función key(doc) -> clave única; un documento con la misma
+                clave reemplaza al anterior.
+    """
+    def __init__(self, fields, key=None):
+        self.fields = fields
+        self.key = key
+        self.clear()
+
+    def clear(self):
+        self._docs = []          # posición -> documento (None si se reemplazó)
+        self._positions = {}     # clave -> posición
+        self._postings = {}      # token -> set(posiciones)
+        self._tokens = []        # tokens ordenados (para prefijos)
+
+    def __len__(self):
+        return len(self._positions) if self.key else len(self._docs)
+
+    def add(self, doc):
+        if self.key:
+            key = self.key(doc)
+            old = self._positions.get(key)
+            if old is not None:
+                self._docs[old] = None
+            self._positions[key] = len(self._docs)
+        position = len(self._docs)
+        self._docs.append(doc)
+        for text in self.fields(doc):
+            if text is None or text == "":
+                continue
+            for token in tokenize(text):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    bisect.insort(self._tokens, token)
+                postings.add(position)
+
+    def add_many(self, docs):
+        for doc in docs:
+            self.add(doc)
+
+    def search(self, query, limit=None):
+        """Documentos que contienen todas las palabras de la consulta (como prefijo)."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = None
+        # Primero el término más largo: suele ser el más selectivo
+        for term in sorted(set(terms), key=len, reverse=True):
+            positions = self._prefix_positions(term)
+            matches = positions if matches is None else matches & positions
+            if not matches:
+                return []
+        result = [self._docs[p] for p in sorted(matches) if self._docs[p] is not None]
+        return result[:limit] if limit else result
+
+    def _prefix_positions(self, prefix):
+        positions = set()
+        start = bisect.bisect_left(self._tokens, prefix)
+        for i in range(start, len(self._tokens)):
+            token = self._tokens[i]
+            if not token.startswith(prefix):
+                break
+            positions |= self._postings[token]
+        return positions
@@ -0,0 +1,82 @@
+import sys
+import base64
+import getpass
+import hashlib
+import platform
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Prefijos del valor guardado según cómo se protegió
+PREFIX_DPAPI = "dpapi:"
+PREFIX_OBFUSCATED = "obf:"
+
+
+def _dpapi(data, protect):
+    """CryptProtectData / CryptUnprotectData (DPAPI de Windows, ligado al usuario actual)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class DATA_BLOB(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = DATA_BLOB(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+    blob_out = DATA_BLOB()
+    CRYPTPROTECT_UI_FORBIDDEN = 0x01
+    crypt = ctypes.windll.crypt32.CryptProtectData if protect else ctypes.windll.crypt32.CryptUnprotectData
+    if not crypt(ctypes.byref(blob_in), None, None, None, None, CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+def _obfuscation_key():
+    seed = f"cerebro_packing|{getpass.getuser()}|{platform.node()}"
+    return hashlib.sha256(seed.encode("utf-8")).digest()
+
+def _xor(data, key):
+    return bytes(b ^ key[i % len(key)] for i, b in enumerate(data))
+
+def dpapi_available():
+    return sys.platform == "win32"
+
+
+def protect(text):
+    """
+    Protege un secreto (contraseña, token) para guardarlo en disco.
+    En Windows usa DPAPI (solo el mismo usuario en la misma máquina puede
+    recuperarlo). En otros sistemas solo lo ofusca: evita el texto plano en el
+    JSON, pero no es cifrado frente a alguien con acceso a la cuenta.
+    """
+    if not text:
+        return text
+    data = text.encode("utf-8")
+    if dpapi_available():
+        try:
+            return PREFIX_DPAPI + base64.b64encode(_dpapi(data, protect=True)).decode("ascii")
+        except OSError as e:
+            logger.warning(f"DPAPI no disponible, se guarda ofuscado: {e}")
+    return PREFIX_OBFUSCATED + base64.b64encode(_xor(data, _obfuscation_key())).decode("ascii")
+
+def unprotect(value):
+    """
+    Recupera un secreto guardado con protect(). Un valor sin prefijo se
+    considera texto plano (archivos de versiones anteriores) y se retorna tal cual.
+    Lanza ValueError si no se puede recuperar (p.ej. archivo de otro usuario o máquina).
+    """
+    if not value:
+        return value
+    try:
+        if value.startswith(PREFIX_DPAPI):
+            return _dpapi(base64.b64decode(value[len(PREFIX_DPAPI):]), protect=False).decode("utf-8")
+        if value.startswith(PREFIX_OBFUSCATED):
+            return _xor(base64.b64decode(value[len(PREFIX_OBFUSCATED):]), _obfuscation_key()).decode("utf-8")
+    except (OSError, ValueError) as e:
+        raise ValueError(f"No se pudo recuperar el secreto guardado: {e}") from e
+    return value
+
+def is_protected(value):
+    return isinstance(value, str) and value.startswith((PREFIX_DPAPI, PREFIX_OBFUSCATED))
@@ -0,0 +1,186 @@
+import os
+import copy
+import json
+import threading
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Archivos de configuración de la aplicación
+PRINTER_CONFIG_FILE = "printer_config.json"
+CREDENTIALS_FILE = "config/credentials.json"
+
+# Una instancia por archivo, compartida por toda la aplicación
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class SettingsStore:
+    """
+    Configuración JSON cargada una sola vez y mantenida en memoria.
+    - get()/all() leen de memoria, sin tocar el disco.
+    - update()/replace()/clear() escriben de forma atómica (archivo temporal + os.replace).
+    - Los suscriptores reciben los datos nuevos en cada cambio.
+    - Un hilo vigila el archivo y recarga si se edita desde fuera de la aplicación.
+
+    :param path: Ruta del archivo JSON.
+    :param watch_interval: Segundos entre comprobaciones del archivo (0 = sin vigilancia).
+    """
+    def __init__(self, path, watch_interval=2.0):
+        self.path = path
+        self.watch_interval = watch_interval
+        self._data = {}
+        self._signature = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._watcher = None
+        self.reload()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    def get(self, key, default=None):
+        with self._lock:
+            return copy.deepcopy(self._data.get(key, default))
+
+    def all(self):
+        """Retorna una copia de todos los datos."""
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+    def update(self, changes):
+        """Actualiza las claves indicadas conservando el resto."""
+        with self._lock:
+            data = copy.deepcopy(self._data)
+            data.update(changes)
+            self._write(data)
+        self._notify()
+
+    def replace(self, data):
+        """Reemplaza todo el contenido del archivo."""
+        with self._lock:
+            self._write(copy.deepcopy(data))
+        self._notify()
+
+    def clear(self):
+        """Elimina el archivo y vacía los datos en memoria."""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._data = {}
+            self._signature = None
+        self._notify()
+
+    def reload(self):
+        """Vuelve a leer el archivo. Retorna True si el contenido cambió."""
+        with self._lock:
+            signature = self._file_signature()
+            if signature is None:
+                changed = bool(self._data)
+                self._data = {}
+                self._signature = None
+                return changed
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"No se pudo leer la configuración '{self.path}': {e}")
+                return False
+            changed = data != self._data
+            self._data = data if isinstance(data, dict) else {}
+            self._signature = signature
+            return changed
+
+    # ------------------------------------------------------------------
+    # Suscripción y vigilancia del archivo
+    # ------------------------------------------------------------------
+    def subscribe(self, callback):
+        """
+        Registra un callback(datos) que se invoca tras cada cambio. Si el cambio
+        viene de una edición externa se llama desde el hilo vigilante.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+        self.watch()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def watch(self):
+        """Arranca el hilo que detecta ediciones externas del archivo (idempotente)."""
+        if self.watch_interval <= 0:
+            return
+        with self._lock:
+            if self._watcher and self._watcher.is_alive():
+                return
+            self._watcher = threading.Thread(target=self._watch_loop, name=f"SettingsWatch-{self.path}", daemon=True)
+            self._watcher.start()
+
+    def _watch_loop(self):
+        stop = threading.Event()
+        while not stop.wait(self.watch_interval):
+            with self._lock:
+                external_change = self._file_signature() != self._signature
+            if external_change and self.reload():
+                logger.info(f"Configuración '{self.path}' modificada externamente. Recargada.")
+                self._notify()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _write(self, data):
+        """Escritura atómica. Requiere el lock."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._data = data
+        self._signature = self._file_signature()
+
+    def _notify(self):
+        with self._lock:
+            data = copy.deepcopy(self._data)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"Error notificando cambio de configuración: {e}")
+
+
+def get_settings_store(path):
+    """Retorna la instancia compartida del archivo de configuración 'path'."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SettingsStore(path)
+        return _stores[key]
+
+def get_printer_settings():
+    """Configuración de impresión (printer_config.json)."""
+    return get_settings_store(PRINTER_CONFIG_FILE)
+
+def get_credentials_store(path=CREDENTIALS_FILE):
+    """Credenciales y token guardados (config/credentials.json)."""
+    return get_settings_store(path)
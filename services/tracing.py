@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import uuid
+import queue
+import threading
+import functools
+
+from services.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Almacén de trazas: una línea JSON por span terminado
+TRACE_FILE = "traces/spans.jsonl"
+TRACE_MAX_BYTES = 20 * 1024 * 1024
+# Se puede desactivar con la variable de entorno CEREBRO_TRACE=0
+TRACE_ENABLED = os.environ.get("CEREBRO_TRACE", "1") != "0"
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+def _new_id():
+    return uuid.uuid4().hex[:16]
+
+
+class Span:
+    """
+    Tramo de tiempo con nombre y atributos dentro de una traza.
+    Se puede usar como context manager o cerrarse a mano con end().
+    """
+    def __init__(self, tracer, name, trace_id=None, parent_id=None, attributes=None, start=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id or _new_id()
+        self.span_id = _new_id()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start = time.time() if start is None else start
+        self.end_time = None
+        self.status = STATUS_OK
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+        return self
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+    def set_error(self, error):
+        self.status = STATUS_ERROR
+        self.error = str(error)
+        return self
+
+    def end(self, end_time=None):
+        """Cierra el span (idempotente) y lo envía al exportador."""
+        if self.end_time is not None:
+            return
+        self.end_time = time.time() if end_time is None else end_time
+        self.tracer._export(self)
+
+    @property
+    def duration_ms(self):
+        end = self.end_time if self.end_time is not None else time.time()
+        return (end - self.start) * 1000.0
+
+    def context(self):
+        """(trace_id, span_id) para colgar spans de este desde otro hilo."""
+        return (self.trace_id, self.span_id)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def __enter__(self):
+        self.tracer._push(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer._pop(self)
+        if exc is not None:
+            self.set_error(exc)
+        self.end()
+        return False
+
+
+class _NoopSpan(Span):
+    """Span que no mide ni exporta nada (trazado desactivado)."""
+    def end(self, end_time=None):
+        self.end_time = self.start
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class JsonlSpanExporter:
+    """
+    Escribe los spans terminados en un archivo JSONL desde un hilo propio,
+    así cerrar un span no hace I/O en el hilo de la interfaz.
+    Al superar 'max_bytes' el archivo se rota a '<archivo>.1'.
+    """
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="TraceExporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span_dict):
+        self._queue.put(span_dict)
+
+    def flush(self, timeout=2.0):
+        """Espera a que se escriban los spans pendientes."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Se agrupan los spans que ya estén en cola en una sola escritura
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            spans = [item for item in items if isinstance(item, dict)]
+            if spans:
+                self._write(spans)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write(self, spans):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                os.replace(self.path, f"{self.path}.1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            logger.error(f"No se pudieron guardar las trazas: {e}")
+
+
+class Tracer:
+    """
+    API mínima de trazado:
+
+        with tracer.span("confirm", order_id=123) as span:
+            ...                       # los spans abiertos dentro son hijos de este
+            span.set_attribute("label_url", url)
+
+        order = tracer.start_span("order", order_id=123)   # span largo, cerrado a mano
+        with tracer.span("scan", parent=order):
+            ...
+        order.end()
+
+    Cada hilo tiene su propia pila de spans activos.
+    """
+    def __init__(self, exporter=None, enabled=TRACE_ENABLED):
+        self.enabled = enabled
+        self.exporter = exporter
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_span(self):
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start_span(self, name, parent=None, start=None, root=False, **attributes):
+        """
+        Crea un span sin activarlo. 'parent' puede ser un Span o una tupla
+        (trace_id, span_id); si no se indica, cuelga del span activo del hilo
+        salvo que se pida una traza nueva con root=True.
+        """
+        if not self.enabled:
+            return _NoopSpan(self, name)
+        if parent is None and not root:
+            parent = self.current_span()
+        if isinstance(parent, Span):
+            parent = parent.context()
+        trace_id, parent_id = parent if parent else (None, None)
+        return Span(self, name, trace_id=trace_id, parent_id=parent_id, attributes=attributes, start=start)
+
+    def span(self, name, parent=None, **attributes):
+        """Span activo durante un bloque with."""
+        return self.start_span(name, parent=parent, **attributes)
+
+    def record(self, name, start, end, parent=None, **attributes):
+        """Registra un span ya medido (p.ej. a partir de marcas de tiempo de otro hilo)."""
+        span = self.start_span(name, parent=parent, start=start, **attributes)
+        span.end(end)
+        return span
+
+    def _push(self, span):
+        self._stack().append(span)
+
+    def _pop(self, span):
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+
+    def _export(self, span):
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span.to_dict())
+        except Exception as e:
+            logger.error(f"Error exportando span {span.name}: {e}")
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def traced(name):
+    """Decorador: ejecuta la función dentro de un span con el nombre dado."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_tracer():
+    """Retorna el tracer compartido (exporta a traces/spans.jsonl)."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(JsonlSpanExporter() if TRACE_ENABLED else None)
+        return _tracer
@@ -0,0 +1,316 @@
+import json
+import time
+import queue
+import socket
+import hashlib
+import threading
+
+from services.api_routes import API_ROUTES
+from services.logger import get_logger, fields
+
+logger = get_logger(__name__)
+
+# Modos de la suscripción
+MODE_PUSH = "push"
+MODE_POLL = "poll"
+
+# Sondeo adaptativo: empieza en POLL_MIN_INTERVAL y se alarga x POLL_BACKOFF
+# cada vez que no hay cambios, hasta POLL_MAX_INTERVAL
+POLL_MIN_INTERVAL = 3.0
+POLL_MAX_INTERVAL = 30.0
+POLL_BACKOFF = 1.5
+# Mientras se sondea, cada cuánto se vuelve a intentar el canal push
+PUSH_RETRY_INTERVAL = 300.0
+PUSH_RECONNECT_DELAY = 1.0
+# Un stream que se cierra antes de PUSH_MIN_LIFETIME segundos cuenta como fallido;
+# tras PUSH_MAX_SHORT_STREAMS seguidos se pasa a sondeo hasta PUSH_RETRY_INTERVAL
+# (p.ej. un proxy que corta las respuestas largas)
+PUSH_MIN_LIFETIME = 5.0
+PUSH_MAX_SHORT_STREAMS = 3
+# El servidor envía ': ping' antes de este tiempo; si no, se reconecta
+STREAM_READ_TIMEOUT = 60
+
+
+def fingerprint(processes):
+    """Huella del contenido, para detectar cambios si el servidor no envía ETag."""
+    raw = json.dumps(processes, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def iter_stream_lines(response, chunk_size=65536):
+    """
+    Líneas de una respuesta en modo stream a medida que llegan. Usa read1 (una
+    sola lectura del socket) para no esperar a llenar el bloque como
+    iter_lines(), que retrasaría cada evento hasta el siguiente.
+    """
+    raw = response.raw
+    buffer = b""
+    while True:
+        chunk = raw.read1(chunk_size) if hasattr(raw, "read1") else raw.read(1)
+        if not chunk:
+            if buffer:
+                yield buffer
+            return
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        yield from lines
+
+def iter_sse(lines):
+    """
+    Convierte las líneas de un text/event-stream en eventos (nombre, datos).
+    Los comentarios (': ping') se ignoran; 'data' multilínea se une con '\\n'.
+    """
+    event, data = "message", []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", "replace")
+        line = line.rstrip("\r")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = "message", []
+            continue
+        if line.startswith(":"):
+            continue
+        name, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if name == "event":
+            event = value
+        elif name == "data":
+            data.append(value)
+
+
+class WaitingProcessesFeed:
+    """
+    Suscripción a los procesos de picking en espera ('picking_processes' de
+    PACKING_LIST) para que el panel de la vista se actualice solo.
+
+    Un hilo en segundo plano intenta primero el canal push (PACKING_EVENTS,
+    Server-Sent Events). Si el servidor no lo ofrece o se cae, pasa a sondeo
+    condicional de PACKING_LIST (If-None-Match / huella del contenido) con
+    intervalo adaptativo, y cada PUSH_RETRY_INTERVAL vuelve a probar el push.
+    Si el stream se conecta pero se cierra enseguida varias veces seguidas,
+    también pasa a sondeo en vez de reconectar en bucle.
+
+    pause() cierra el stream y detiene el sondeo mientras el panel no se ve
+    (p.ej. con el detalle de un proceso abierto encima); resume() lo reanuda
+    con una consulta inmediata.
+
+    Los cambios se encolan como eventos y la vista los aplica en el hilo de Tk
+    con drain():
+        ("snapshot", [procesos])  lista completa
+        ("upsert", proceso)       proceso nuevo o modificado
+        ("remove", id)            proceso que ya no está en espera
+    El modo actual ("push" o "poll") queda en self.mode.
+
+    Eventos SSE esperados del servidor: 'snapshot' ({"picking_processes": [...]}),
+    'upsert' ({proceso}) y 'remove' ({"id": ...}).
+
+    :param api_client: ApiClient con la sesión del usuario.
+    :param use_push: False para usar solo el sondeo.
+    """
+    def __init__(self, api_client, use_push=True):
+        self.api_client = api_client
+        self.use_push = use_push
+        self.mode = None
+        self.interval = POLL_MIN_INTERVAL
+        self._events = queue.Queue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._active = threading.Event()
+        self._active.set()
+        self._short_streams = 0
+        self._stream = None
+        self._etag = None
+        self._fingerprint = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="WaitingProcessesFeed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()
+        self._wake.set()
+        self._close_stream()
+
+    def pause(self):
+        """Deja de escuchar y de sondear hasta resume() (el panel no está visible)."""
+        if self._active.is_set():
+            logger.debug("Panel de procesos en espera en pausa")
+            self._active.clear()
+            self._wake.set()
+            self._close_stream()
+
+    def resume(self):
+        """Reanuda tras pause() con una consulta inmediata (o un snapshot nuevo del push)."""
+        if not self._active.is_set():
+            logger.debug("Panel de procesos en espera reanudado")
+            self.refresh()
+            self._active.set()
+
+    @property
+    def paused(self):
+        return not self._active.is_set()
+
+    def refresh(self):
+        """Pide una consulta inmediata (p.ej. tras iniciar un packing o pulsar Refrescar)."""
+        self._fingerprint = None
+        self._etag = None
+        self.interval = POLL_MIN_INTERVAL
+        self._wake.set()
+
+    def drain(self):
+        """Eventos pendientes, en orden. Se llama desde el hilo de la interfaz."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    # ------------------------------------------------------------------
+    # Hilo del feed
+    # ------------------------------------------------------------------
+    def _emit(self, kind, payload):
+        self._events.put((kind, payload))
+
+    def _set_mode(self, mode):
+        if mode != self.mode:
+            self.mode = mode
+            logger.info(f"Panel de procesos en espera en modo {mode}")
+
+    def _close_stream(self):
+        """
+        Corta el stream desde otro hilo sin bloquearlo. stream.close() esperaría
+        al hilo lector (que tiene tomado el buffer) hasta el siguiente dato del
+        servidor, y pause() se llama desde el hilo de Tk: se hace shutdown del
+        socket, la lectura termina enseguida y el propio hilo del feed cierra la
+        respuesta.
+        """
+        stream = self._stream
+        if stream is None:
+            return
+        try:
+            # socket(fileno=...) detecta familia (IPv4/IPv6) y tipo del socket vivo y en
+            # Windows acepta el handle tal cual; detach() evita cerrarlo desde aquí
+            sock = socket.socket(fileno=stream.raw.fileno())
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            finally:
+                sock.detach()
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"No se pudo cortar el canal de eventos, se cierra en segundo plano: {e}")
+            threading.Thread(target=self._close_quietly, args=(stream,), name="WaitingProcessesFeed-close", daemon=True).start()
+
+    @staticmethod
+    def _close_quietly(stream):
+        try:
+            stream.close()
+        except Exception:
+            pass
+
+    def _run(self):
+        next_push_try = 0.0
+        while not self._stop.is_set():
+            if not self._active.is_set():
+                self._active.wait()
+                continue
+            if self.use_push and time.monotonic() >= next_push_try:
+                # Bloquea mientras el stream siga abierto
+                connected_at = time.monotonic()
+                if self._listen_push():
+                    if self._stop.is_set() or not self._active.is_set():
+                        continue   # Lo cerró stop() o pause()
+                    if time.monotonic() - connected_at >= PUSH_MIN_LIFETIME:
+                        self._short_streams = 0
+                    else:
+                        self._short_streams += 1
+                    if self._short_streams < PUSH_MAX_SHORT_STREAMS:
+                        # Se cayó el stream: breve pausa y se reconecta
+                        self._wake.wait(PUSH_RECONNECT_DELAY)
+                        self._wake.clear()
+                        continue
+                    logger.warning(
+                        "El canal de eventos se cierra nada más conectar; se pasa a sondeo",
+                        extra=fields(streams=self._short_streams, retry_in=PUSH_RETRY_INTERVAL),
+                    )
+                    self._short_streams = 0
+                next_push_try = time.monotonic() + PUSH_RETRY_INTERVAL
+            self._set_mode(MODE_POLL)
+            changed = self._poll_once()
+            if changed:
+                self.interval = POLL_MIN_INTERVAL
+            elif changed is False:
+                self.interval = min(self.interval * POLL_BACKOFF, POLL_MAX_INTERVAL)
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+
+    def _poll_once(self):
+        """Retorna True si hubo cambios, False si no y None si la petición falló."""
+        status, data, etag = self.api_client._make_conditional_get(API_ROUTES["PACKING_LIST"], self._etag)
+        if status is None:
+            return None
+        if status == 304:
+            return False
+        self._etag = etag
+        processes = (data or {}).get("data", {}).get("picking_processes", []) if isinstance(data, dict) else []
+        digest = fingerprint(processes)
+        if digest == self._fingerprint:
+            return False
+        self._fingerprint = digest
+        logger.debug("Procesos en espera actualizados (sondeo)", extra=fields(count=len(processes)))
+        self._emit("snapshot", processes)
+        return True
+
+    def _listen_push(self):
+        """
+        Escucha el canal push hasta que se cierre. Retorna True si llegó a
+        conectarse (para reconectar enseguida) y False si no está disponible.
+        """
+        stream = self.api_client._open_event_stream(API_ROUTES["PACKING_EVENTS"], read_timeout=STREAM_READ_TIMEOUT)
+        if stream is None:
+            return False
+        self._stream = stream
+        if self._stop.is_set() or not self._active.is_set():
+            # stop()/pause() llegaron mientras se conectaba y no vieron este stream
+            self._stream = None
+            stream.close()
+            return True
+        self._set_mode(MODE_PUSH)
+        try:
+            for event, data in iter_sse(iter_stream_lines(stream)):
+                if self._stop.is_set() or not self._active.is_set():
+                    break
+                self._handle_push(event, data)
+        except Exception as e:
+            if not self._stop.is_set() and self._active.is_set():
+                logger.warning(f"Canal de eventos interrumpido: {e}")
+        finally:
+            self._stream = None
+            stream.close()
+        # Al reconectar el servidor envía un snapshot nuevo
+        self._fingerprint = None
+        return True
+
+    def _handle_push(self, event, data):
+        try:
+            payload = json.loads(data) if data else {}
+        except ValueError:
+            logger.warning("Evento push con JSON inválido", extra=fields(event=event, data=data))
+            return
+        if event == "snapshot":
+            processes = payload.get("picking_processes", [])
+            self._fingerprint = fingerprint(processes)
+            self._emit("snapshot", processes)
+        elif event == "upsert":
+            self._emit("upsert", payload)
+        elif event == "remove":
+            self._emit("remove", payload.get("id"))
+        else:
+            logger.debug(f"Evento push ignorado: {event}")
@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Los módulos de la app se importan desde la raíz del repositorio (como main.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def wait_for():
+    """wait_for(predicate, timeout): espera a que predicate() sea verdadero y retorna su último valor."""
+    def wait(predicate, timeout=5.0, interval=0.01):
+        deadline = time.monotonic() + timeout
+        while True:
+            result = predicate()
+            if result or time.monotonic() >= deadline:
+                return result
+            time.sleep(interval)
+    return wait
+
+
+@pytest.fixture
+def api_url(monkeypatch):
+    """Apunta ApiClient a la URL base que se le pase: api_url(server.base_url)."""
+    import services.api_client as api_client
+
+    def point(url):
+        monkeypatch.setattr(api_client, "API_BASE_URL", url)
+        return url
+    return point
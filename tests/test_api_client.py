@@ -0,0 +1,77 @@
+import threading
+
+from services.api_client import ApiClient
+from services.api_routes import API_ROUTES
+from tools.fake_event_server import FakePackingServer
+
+
+def test_get_request_returns_json(api_url):
+    server = FakePackingServer(push=False).start()
+    try:
+        api_url(server.base_url)
+        server.add_process()
+        response = ApiClient()._make_get_request(API_ROUTES["PACKING_LIST"], cancelled=threading.Event())
+    finally:
+        server.stop()
+
+    assert response["success"]
+    assert len(response["data"]["picking_processes"]) == 1
+
+
+def test_cancelled_get_request_skips_the_body(api_url, monkeypatch):
+    server = FakePackingServer(push=False).start()
+    decoded = []
+    import services.api_client as api_client
+    monkeypatch.setattr(api_client.fast_json, "loads", lambda data: decoded.append(data))
+    cancelled = threading.Event()
+    cancelled.set()
+    try:
+        api_url(server.base_url)
+        response = ApiClient()._make_get_request(API_ROUTES["PACKING_LIST"], cancelled=cancelled)
+    finally:
+        server.stop()
+
+    assert response is None
+    assert decoded == []
+
+
+def test_concurrent_401s_share_one_relogin():
+    client = ApiClient()
+    client.email, client.password, client.token = "op@example.com", "secreto", "caducado"
+    logins = []
+    started = threading.Barrier(5)
+
+    def login(email, password):
+        logins.append(email)
+        client.token = "renovado"
+        return True
+    client._login_internal = login
+
+    results = []
+
+    def worker():
+        started.wait()
+        results.append(client._try_auto_relogin("caducado"))
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [True] * 5
+    assert logins == ["op@example.com"]
+
+
+def test_relogin_rejected_by_the_login_request_does_not_recurse():
+    client = ApiClient()
+    client.email, client.password, client.token = "op@example.com", "cambiada", "caducado"
+    calls = []
+
+    def login(email, password):
+        # Como _make_post_request(LOGIN) al recibir 401: vuelve a pedir relogin
+        calls.append(email)
+        return client._try_auto_relogin(client.token)
+    client._login_internal = login
+
+    assert client._try_auto_relogin("caducado") is False
+    assert calls == ["op@example.com"]
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from services.audio_cues import AudioCues, NullAudioBackend, CUE_ERROR
+
+
+class GatedBackend(NullAudioBackend):
+    """Backend sin sonido cuya reproducción espera a 'gate', para llenar la cola a voluntad."""
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.playing = threading.Event()
+
+    def play(self, cue):
+        self.playing.set()
+        self.gate.wait(5)
+        super().play(cue)
+
+
+@pytest.fixture
+def make_cues():
+    created = []
+
+    def make(backend, **kwargs):
+        cues = AudioCues(backend=backend, cues={CUE_ERROR: "error.mp3", "ok": "ok.mp3"}, **kwargs)
+        created.append(cues)
+        return cues
+    yield make
+    for cues in created:
+        if isinstance(cues.backend, GatedBackend):
+            cues.backend.gate.set()
+        cues.close()
+
+
+def test_repeats_within_the_interval_are_throttled(make_cues, wait_for):
+    backend = NullAudioBackend()
+    cues = make_cues(backend, min_interval=0.2)
+
+    assert cues.play(CUE_ERROR)
+    assert not cues.play(CUE_ERROR)
+    # Otro sonido no comparte el intervalo
+    assert cues.play("ok")
+    assert wait_for(lambda: list(backend.played) == [CUE_ERROR, "ok"])
+
+    assert wait_for(lambda: cues.play(CUE_ERROR), timeout=1.0)
+    assert wait_for(lambda: list(backend.played) == [CUE_ERROR, "ok", CUE_ERROR])
+
+
+def test_requests_beyond_the_queue_are_dropped(make_cues, wait_for):
+    backend = GatedBackend()
+    cues = make_cues(backend, min_interval=0, max_pending=2)
+
+    assert cues.play(CUE_ERROR)
+    assert backend.playing.wait(5)
+    # El hilo de audio está ocupado: caben dos peticiones y el resto se descarta sin bloquear
+    assert cues.play(CUE_ERROR)
+    assert cues.play("ok")
+    assert not cues.play(CUE_ERROR)
+
+    backend.gate.set()
+    assert wait_for(lambda: list(backend.played) == [CUE_ERROR, CUE_ERROR, "ok"])
+
+
+def test_unknown_cues_are_ignored(make_cues, wait_for):
+    backend = NullAudioBackend()
+    cues = make_cues(backend)
+
+    assert cues.play("no-existe")
+    assert cues.play("ok")
+    assert wait_for(lambda: list(backend.played) == ["ok"])
@@ -0,0 +1,91 @@
+import models.confirmed_orders as confirmed_orders
+from models.confirmed_orders import ConfirmedOrders, COL_ORDER, COL_PRODUCTS, COL_DURATION
+
+
+def confirmed(order_id, seconds=None, products=(("Camiseta", 1),)):
+    finished_at = None if seconds is None else f"2026-01-01 10:{seconds // 60:02d}:{seconds % 60:02d}"
+    return {
+        "order_id": order_id,
+        "started_at": "2026-01-01 10:00:00",
+        "finished_at": finished_at,
+        "products": [{"name": name, "quantity": quantity} for name, quantity in products],
+    }
+
+
+ORDERS = {
+    "1": confirmed(10, 30, (("Zapatos", 1),)),
+    "2": confirmed(9, 90, (("Abrigo", 2), ("Gorro", 1))),
+    "3": confirmed("B-1", None),
+}
+
+
+def column(rows, index):
+    return [row[index] for row in rows]
+
+
+def test_sorts_each_column_and_pages_through_the_permutation():
+    orders = ConfirmedOrders()
+    orders.load(ORDERS)
+
+    assert orders.page(1, 10) == [
+        (10, "Zapatos(1)", 30, "Imprimir"),
+        (9, "Abrigo(2); Gorro(1)", 90, "Imprimir"),
+        ("B-1", "Camiseta(1)", "N/A", "Imprimir"),
+    ]
+    # Ids numéricos en orden numérico y después los de texto
+    orders.sort(COL_ORDER)
+    assert column(orders.page(1, 10), 0) == [9, 10, "B-1"]
+    orders.sort(COL_ORDER, reverse=True)
+    assert column(orders.page(1, 2), 0) == ["B-1", 10]
+    assert column(orders.page(2, 2), 0) == [9]
+    assert orders.page(3, 2) == []
+
+    orders.sort(COL_DURATION)
+    assert column(orders.page(1, 10), 2) == ["N/A", 30, 90]
+    orders.sort(COL_PRODUCTS)
+    assert column(orders.page(1, 10), 1)[0] == "Abrigo(2); Gorro(1)"
+    orders.sort(None)
+    assert column(orders.page(1, 10), 0) == [10, 9, "B-1"]
+
+
+def test_permutations_are_cached_until_the_data_changes():
+    orders = ConfirmedOrders()
+    orders.load(ORDERS)
+    orders.sort(COL_ORDER)
+    orders.page(1, 10)
+    permutation = orders._permutations[COL_ORDER]
+
+    # Cambiar de dirección o recargar lo mismo no recalcula la permutación
+    orders.sort(COL_ORDER, reverse=True)
+    orders.page(1, 10)
+    orders.load(dict(ORDERS))
+    orders.page(1, 10)
+    assert orders._permutations[COL_ORDER] is permutation
+
+    orders.load({**ORDERS, "4": confirmed(1, 5)})
+    assert orders._permutations == {}
+    assert column(orders.page(1, 10), 0) == ["B-1", 10, 9, 1]
+
+
+def test_reload_parses_only_new_orders(monkeypatch):
+    parsed = []
+    original = confirmed_orders.order_duration
+
+    def counting_duration(order_info):
+        parsed.append(order_info["order_id"])
+        return original(order_info)
+    monkeypatch.setattr(confirmed_orders, "order_duration", counting_duration)
+    orders = ConfirmedOrders()
+    orders.load(ORDERS)
+    orders.load({**ORDERS, "4": confirmed(1, 5)})
+
+    assert parsed == [10, 9, "B-1", 1]
+
+
+def test_paginator_total_drives_the_page_count():
+    orders = ConfirmedOrders()
+    orders.load({"data": list(ORDERS.values()), "total": 45, "current_page": 1})
+
+    assert len(orders) == 3
+    assert orders.total == 45
+    assert orders.page_count(20) == 3
@@ -0,0 +1,74 @@
+import os
+
+import components.print_component as print_component
+from services.label_cache import LabelCache
+
+
+def label(tmp_path, name, size=100):
+    path = tmp_path / name
+    path.write_bytes(b"^XA" + b"x" * (size - 6) + b"^XZ")
+    return str(path)
+
+
+def make_cache(tmp_path, **kwargs):
+    return LabelCache(cache_dir=str(tmp_path / "label_cache"), **kwargs)
+
+
+def test_put_and_get_keep_a_copy_of_the_label(tmp_path):
+    cache = make_cache(tmp_path)
+    source = label(tmp_path, "a.zpl")
+
+    cache.put(42, "http://labels/42", source, shipping_method="SEUR 24")
+    os.remove(source)
+    entry = cache.get(42)
+
+    assert entry["url"] == "http://labels/42"
+    assert entry["shipping_method"] == "SEUR 24"
+    assert os.path.exists(entry["path"]) and entry["path"].endswith(".zpl")
+    # El índice sobrevive a un reinicio
+    assert make_cache(tmp_path).get("42")["shipping_method"] == "SEUR 24"
+
+
+def test_evicts_the_least_recently_used_entry(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    for order_id in (1, 2):
+        cache.put(order_id, f"http://labels/{order_id}", label(tmp_path, f"{order_id}.zpl"))
+    cache.get(1)   # El 2 pasa a ser el menos usado
+
+    cache.put(3, "http://labels/3", label(tmp_path, "3.zpl"))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
+    assert sorted(os.listdir(tmp_path / "label_cache")) == ["index.json", "order_1.zpl", "order_3.zpl"]
+
+
+def test_evicts_by_size_and_age(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=250)
+    for order_id in (1, 2, 3):
+        cache.put(order_id, None, label(tmp_path, f"{order_id}.zpl", size=100))
+    assert cache.get(1) is None
+    assert cache.total_bytes() == 200
+
+    cache.max_age = -1
+    assert cache.get(3) is None
+    assert cache.total_bytes() == 0
+
+
+def test_reprint_routes_with_the_original_shipping_method(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    cache.put(42, "http://labels/42", label(tmp_path, "a.zpl"), shipping_method="SEUR 24")
+    routed, submitted = [], []
+
+    class Spooler:
+        def submit(self, url, **kwargs):
+            submitted.append(kwargs)
+            return "job-1"
+    monkeypatch.setattr(print_component, "get_label_cache", lambda: cache)
+    monkeypatch.setattr(print_component, "get_print_spooler", lambda: Spooler())
+    monkeypatch.setattr(print_component, "resolve_printer",
+                        lambda label_type, shipping_method=None: routed.append(shipping_method) or "ZD420-SEUR")
+
+    assert print_component.reprint_cached_label(42) == "job-1"
+    assert routed == ["SEUR 24"]
+    assert submitted[0]["printer"] == "ZD420-SEUR"
+    assert submitted[0]["shipping_method"] == "SEUR 24"
@@ -0,0 +1,86 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.label_downloader import LabelDownloader
+
+LABEL = b"^XA^FO50,50^FDPedido 1^FS^XZ"
+
+
+@pytest.fixture
+def label_server():
+    """Servidor HTTP mínimo que sirve LABEL en cualquier ruta y cuenta las descargas."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(LABEL)))
+            self.end_headers()
+            self.wfile.write(LABEL)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.requests_seen = requests_seen
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_same_url_is_downloaded_once(label_server, tmp_path):
+    downloader = LabelDownloader(spool_dir=str(tmp_path / "spool"))
+    url = f"{label_server.url}/labels/1.zpl"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(downloader.fetch(url))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    # Un reintento o una reimpresión reutilizan el archivo del spool
+    results.append(downloader.fetch(url))
+
+    assert len(set(results)) == 1 and results[0].endswith(".zpl")
+    assert label_server.requests_seen == ["/labels/1.zpl"]
+    with open(results[0], "rb") as f:
+        assert f.read() == LABEL
+
+    # El índice sobrevive a un reinicio
+    assert LabelDownloader(spool_dir=str(tmp_path / "spool")).fetch(url) == results[0]
+    assert len(label_server.requests_seen) == 1
+
+
+def test_checksum_mismatch_downloads_again(label_server, tmp_path):
+    downloader = LabelDownloader(spool_dir=str(tmp_path / "spool"))
+    url = f"{label_server.url}/labels/2.zpl"
+    path = downloader.fetch(url)
+
+    # Mismo tamaño, contenido distinto: solo lo detecta el SHA-256
+    with open(path, "wb") as f:
+        f.write(b"X" * len(LABEL))
+    assert downloader.lookup(url) is None
+
+    assert downloader.fetch(url) == path
+    assert len(label_server.requests_seen) == 2
+    with open(path, "rb") as f:
+        assert f.read() == LABEL
+
+
+def test_released_files_are_purged_after_max_age(label_server, tmp_path):
+    downloader = LabelDownloader(spool_dir=str(tmp_path / "spool"))
+    url = f"{label_server.url}/labels/3.zpl"
+    path = downloader.fetch(url)
+
+    downloader.release(path)
+    assert downloader.lookup(url)
+    downloader.purge(max_age=0)
+    assert downloader.lookup(url) is None
+    assert not os.path.exists(path)
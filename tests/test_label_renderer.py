@@ -0,0 +1,74 @@
+import re
+
+import pytest
+
+from services.label_renderer import LabelRenderer, FORMAT_ZPL, build_pdf_pages
+
+ORDER = {
+    "id": 1234,
+    "name": "Ana García",
+    "address": "Calle Mayor 1",
+    "address_2": None,
+    "zip": "28001",
+    "city": "Madrid",
+    "province": "Madrid",
+    "country_code": "ES",
+    "shipping_method_name": "SEUR 24",
+    "tracking_code": "TRK^123",
+}
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_shipping_label_uses_the_template_of_its_shipping_method(tmp_path):
+    renderer = LabelRenderer(templates={"shipping": {
+        "default": {"format": FORMAT_ZPL},
+        "SEUR 24": {"title": "SEUR {zip}"},
+    }}, output_dir=str(tmp_path))
+
+    zpl = read(renderer.render_shipping_label(ORDER)).decode("utf-8")
+
+    assert zpl.startswith("^XA") and zpl.endswith("^XZ")
+    assert "^FDSEUR 28001^FS" in zpl
+    assert "^FDAna García^FS" in zpl
+    # Los campos vacíos no dejan líneas en blanco y ^ no rompe el ZPL
+    assert "^FD^FS" not in zpl
+    assert "^FDTRK 123^FS" in zpl
+
+
+def test_custom_zpl_template_is_filled_with_the_order_data(tmp_path):
+    renderer = LabelRenderer(templates={"shipping": {"default": {
+        "format": FORMAT_ZPL, "zpl": "^XA^FD{id}-{missing}^FS^XZ",
+    }}}, output_dir=str(tmp_path))
+
+    assert read(renderer.render_shipping_label(ORDER)) == b"^XA^FD1234-^FS^XZ"
+
+
+def test_process_label_is_a_well_formed_pdf(tmp_path):
+    renderer = LabelRenderer(output_dir=str(tmp_path))
+    path = renderer.render_process_label({
+        "id": 7, "name": "Mañana", "containers": [{"container": {"bar_code": "C-1"}}, {"container": {"bar_code": "C-2"}}],
+    })
+
+    pdf = read(path)
+    assert path.endswith(".pdf")
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert b"(Cestas: C-1, C-2)" in pdf
+    # La tabla xref apunta al inicio de cada objeto
+    xref = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+    offsets = [int(line[:10]) for line in pdf[xref:].split(b"\n")[3:] if line.endswith(b" n ")]
+    assert offsets and all(pdf[offset:].startswith(b"%d 0 obj" % number) for number, offset in enumerate(offsets, start=1))
+
+
+def test_multi_page_pdf_counts_every_page():
+    pdf = build_pdf_pages([b"BT ET", b"BT ET", b"BT ET"])
+    assert b"/Count 3" in pdf
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    renderer = LabelRenderer(output_dir=str(tmp_path), default_format="png")
+    with pytest.raises(ValueError):
+        renderer.render_shipping_label(ORDER)
@@ -0,0 +1,69 @@
+import json
+import queue
+import logging
+
+import pytest
+
+from services.logger import (
+    _TruncatingQueueHandler, JsonFormatter, ConsoleFormatter, fields, truncate, MAX_FIELD_CHARS
+)
+
+
+@pytest.fixture
+def queued_logger():
+    """Logger aislado con el handler de la app escribiendo en una cola propia."""
+    records = queue.SimpleQueue()
+    logger = logging.getLogger("cerebro_test.queued")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = _TruncatingQueueHandler(records)
+    logger.addHandler(handler)
+    yield logger, records
+    logger.removeHandler(handler)
+
+
+class CountingRepr:
+    calls = 0
+
+    def __repr__(self):
+        CountingRepr.calls += 1
+        return "payload"
+
+
+def test_records_are_prepared_with_truncated_fields(queued_logger):
+    logger, records = queued_logger
+    payload = {"orders": ["x" * 100] * 20}
+    logger.info("Pedidos %s", "en espera", extra=fields(count=3, payload=payload, ok=True))
+
+    record = records.get_nowait()
+    assert record.msg == "Pedidos en espera" and record.args is None
+    assert record.fields["count"] == 3 and record.fields["ok"] is True
+    assert record.fields["payload"] == truncate(payload)
+    assert len(record.fields["payload"]) < MAX_FIELD_CHARS + 40
+
+    line = json.loads(JsonFormatter().format(record))
+    assert (line["level"], line["logger"], line["msg"], line["count"]) == ("INFO", "cerebro_test.queued", "Pedidos en espera", 3)
+
+
+def test_fields_are_not_formatted_below_the_level(queued_logger):
+    logger, records = queued_logger
+    CountingRepr.calls = 0
+    logger.debug("Respuesta", extra=fields(payload=CountingRepr()))
+
+    assert records.empty()
+    assert CountingRepr.calls == 0
+
+
+def test_exceptions_travel_as_text(queued_logger):
+    logger, records = queued_logger
+    try:
+        raise ValueError("respuesta inválida")
+    except ValueError:
+        logger.exception("Error leyendo la API", extra=fields(endpoint="/packing"))
+
+    record = records.get_nowait()
+    assert record.exc_info is None
+    assert "ValueError: respuesta inválida" in record.exc_text
+    assert json.loads(JsonFormatter().format(record))["exc"] == record.exc_text
+    console = ConsoleFormatter().format(record)
+    assert console.startswith("[ERROR] Error leyendo la API endpoint=/packing\n")
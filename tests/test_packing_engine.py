@@ -0,0 +1,85 @@
+import pytest
+
+from controllers.warehouse.packing_engine import (
+    PackingEngine, SCAN_OK, SCAN_NOT_IN_ORDER, SCAN_ALREADY_COMPLETE, SCAN_NO_ORDER
+)
+from services.api_client import ApiClient
+from services.scan_journal import ScanJournal
+from tools.fake_packing_api import FakePackingApi
+
+
+@pytest.fixture
+def packing_api(api_url):
+    server = FakePackingApi(orders=2, lines=3).start()
+    api_url(server.base_url)
+    yield server
+    server.stop()
+
+
+def codes_to_complete(engine):
+    codes = []
+    for info in engine.scanned_quantities.values():
+        codes += [info["bar_code"] or info["sku"]] * (info["required"] - info["scanned"])
+    return codes
+
+
+def test_scans_and_confirms_every_order_of_the_process(packing_api):
+    process_id = packing_api.add_process()
+    engine = PackingEngine(ApiClient(), process_id)
+
+    for _ in range(2):
+        assert engine.open() is not None
+        assert engine.pending_order is not None
+        assert engine.scan("NO-EXISTE") == (SCAN_NOT_IN_ORDER, None)
+        for code in codes_to_complete(engine):
+            assert engine.scan(code)[0] == SCAN_OK
+        assert engine.all_products_complete()
+        scanned, required = engine.product_progress()
+        assert scanned == required
+        # Un escaneo de más no suma por encima de lo requerido
+        status, product_id = engine.scan(code)
+        assert status == SCAN_ALREADY_COMPLETE and product_id is not None
+        assert engine.confirm()["success"]
+
+    engine.open()
+    assert engine.finished
+    assert engine.pending_order is None
+    assert engine.scan(code) == (SCAN_NO_ORDER, None)
+    assert engine.confirm() is None
+    assert (packing_api.confirms, packing_api.rejected) == (2, 0)
+
+
+def test_incomplete_order_is_rejected_by_the_api(packing_api):
+    engine = PackingEngine(ApiClient(), packing_api.add_process())
+    engine.open()
+    engine.scan(codes_to_complete(engine)[0])
+
+    assert engine.confirm() is None
+    assert packing_api.rejected == 1
+    # La orden sigue pendiente
+    first_order = engine.pending_order.id
+    engine.open()
+    assert engine.pending_order.id == first_order
+
+
+def test_scans_are_restored_from_the_journal_until_confirmed(packing_api, tmp_path):
+    process_id = packing_api.add_process()
+    journal = ScanJournal(directory=str(tmp_path))
+    engine = PackingEngine(ApiClient(), process_id, journal=journal)
+    engine.open()
+    codes = codes_to_complete(engine)
+    for code in codes[:2]:
+        engine.scan(code)
+    journal.flush()
+
+    # La app se cierra a mitad de pedido: otro motor recupera lo escaneado
+    restarted = PackingEngine(ApiClient(), process_id, journal=ScanJournal(directory=str(tmp_path)))
+    restarted.open()
+    assert restarted.restored_units == 2
+    assert restarted.product_progress()[0] == 2
+
+    for code in codes[2:]:
+        assert restarted.scan(code)[0] == SCAN_OK
+    order_id = restarted.pending_order.id
+    assert restarted.confirm()
+    assert restarted.journal.restore(process_id, order_id) == {}
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from services import fast_json
+from models.packing import ProcessDetail, PackingProcess, Order, Container
+from tools.fake_packing_api import sample_process_detail
+
+
+def test_process_detail_decodes_the_api_response():
+    response = fast_json.loads(json.dumps(sample_process_detail(orders=4, lines=2)).encode("utf-8"))
+    detail = ProcessDetail.from_response(response)
+
+    process = detail.process
+    assert (process.id, process.created_by_name) == (1, "Operario")
+    assert len(process.containers) == 20 and process.containers[0].bar_code == "C00000"
+    assert process.completed_count == 2 and not process.all_finished
+    order = detail.current_order()
+    assert order.id == 500000 and not order.finished
+    line = order.lines[1]
+    assert (line.quantity, line.product.sku, line.product.bar_code) == (2, "SKU-0000001", "8400000000001")
+    assert line.product.reference == "A-01 - Producto 1 - SKU-0000001"
+
+
+def test_missing_fields_get_the_view_defaults():
+    process = PackingProcess.from_dict({"id": 3, "created_by": None, "packing_process_orders": [{"id": 9}]})
+
+    assert (process.name, process.created_by_name) == ("N/A", "N/A")
+    order = process.first_pending_order()
+    assert order.order.name == "" and order.lines == []
+    assert Container.from_dict({"id": 1, "bar_code": None}).bar_code == ""
+    assert ProcessDetail.from_response({"success": False}) is None
+    assert ProcessDetail.from_response(None) is None
+
+
+def test_order_round_trips_unknown_fields_for_label_templates():
+    data = {"id": 7, "name": "Ana", "address": "Calle 1", "address_2": "2º", "created_at": "2024-02-28"}
+    order = Order.from_dict(data)
+
+    assert order.address_line == "Calle 1 / 2º"
+    assert order.to_dict()["created_at"] == "2024-02-28"
+    assert {k: v for k, v in order.to_dict().items() if k in data} == data
+    with pytest.raises(AttributeError):
+        order.unknown = 1
+
+
+def test_fast_json_rejects_invalid_content_as_value_error():
+    with pytest.raises(ValueError):
+        fast_json.loads(b'{"success": tru')
@@ -0,0 +1,134 @@
+import threading
+
+from services.paginated_source import PaginatedSource
+
+
+class FakeList:
+    """Paginador de Laravel sobre una lista en memoria, con registro de las páginas pedidas."""
+    def __init__(self, count, per_page=10):
+        self.items = [{"id": i} for i in range(count)]
+        self.per_page = per_page
+        self.requests = []
+        self.fail_pages = set()
+
+    def __call__(self, page):
+        self.requests.append(page)
+        if page in self.fail_pages:
+            raise RuntimeError("sin conexión")
+        start = (page - 1) * self.per_page
+        last_page = max(1, -(-len(self.items) // self.per_page))
+        return {
+            "data": [dict(item) for item in self.items[start:start + self.per_page]],
+            "current_page": page,
+            "last_page": last_page,
+            "total": len(self.items),
+        }
+
+
+def drain_until_idle(source, wait_for):
+    """Aplica las páginas a medida que llegan (como el after() de la vista) hasta que no quede ninguna en curso."""
+    def idle():
+        source.drain()
+        return not source.loading
+    assert wait_for(idle)
+
+
+def load_pages(source, pages, wait_for):
+    source.reset()
+    drain_until_idle(source, wait_for)
+    while len(source.rows) < pages * 10 and source.load_more():
+        drain_until_idle(source, wait_for)
+
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_refresh_reloads_every_loaded_page(wait_for):
+    server = FakeList(45)
+    source = PaginatedSource(server, key=lambda row: row["id"])
+    load_pages(source, 3, wait_for)
+    assert ids(source.rows) == list(range(30))
+    old_rows = source.rows
+    server.requests.clear()
+
+    server.items[25]["name"] = "modificado"
+    source.refresh()
+    # Hasta que llegan todas las páginas se siguen viendo las filas anteriores
+    assert source.rows is old_rows
+    drain_until_idle(source, wait_for)
+
+    assert server.requests == [1, 2, 3]
+    assert ids(source.rows) == list(range(30))
+    assert source.rows[25]["name"] == "modificado"
+    assert source.total == 45
+    assert source.has_more
+    source.load_more()
+    drain_until_idle(source, wait_for)
+    assert server.requests[-1] == 4
+
+
+def test_refresh_drops_rows_shifted_between_pages(wait_for):
+    server = FakeList(30)
+    source = PaginatedSource(server, key=lambda row: row["id"])
+    load_pages(source, 2, wait_for)
+
+    # Llega un proceso nuevo al principio: el 9 pasa a la página 2 pero ya estaba en la 1
+    original = server.__call__
+
+    def shifting(page):
+        if page == 2:
+            server.items.insert(0, {"id": 100})
+        return original(page)
+    source.fetch_page = shifting
+    source.refresh()
+    drain_until_idle(source, wait_for)
+
+    assert len(ids(source.rows)) == len(set(ids(source.rows)))
+
+
+def test_failed_refresh_keeps_the_loaded_rows(wait_for):
+    server = FakeList(30)
+    source = PaginatedSource(server)
+    load_pages(source, 2, wait_for)
+    old_rows = source.rows
+
+    server.fail_pages = {2}
+    source.refresh()
+    drain_until_idle(source, wait_for)
+
+    assert source.rows is old_rows
+    assert source.error is not None
+
+
+def test_refresh_without_rows_loads_the_first_page(wait_for):
+    server = FakeList(30)
+    source = PaginatedSource(server)
+
+    source.refresh()
+    drain_until_idle(source, wait_for)
+
+    assert server.requests == [1]
+    assert ids(source.rows) == list(range(10))
+
+
+def test_cancel_ignores_the_page_in_flight(wait_for):
+    release = threading.Event()
+    seen_cancelled = []
+
+    def slow_page(page):
+        release.wait(5)
+        seen_cancelled.append(source.cancelled.is_set())
+        return FakeList(30)(page)
+    source = PaginatedSource(slow_page)
+    source.reset()
+    assert source.loading
+
+    source.cancel()
+    assert not source.loading
+    release.set()
+    assert wait_for(lambda: seen_cancelled)
+
+    assert seen_cancelled == [True]
+    assert not source.drain()
+    assert source.rows == []
@@ -0,0 +1,155 @@
+import json
+import time
+
+import pytest
+
+from services.print_spooler import PrintSpooler, JOB_QUEUED, JOB_SENT, JOB_FAILED
+
+
+@pytest.fixture
+def label(tmp_path):
+    path = tmp_path / "label.zpl"
+    path.write_bytes(b"^XA^XZ")
+    return path
+
+
+@pytest.fixture
+def make_spooler(tmp_path):
+    spoolers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("queue_file", str(tmp_path / "print_queue.json"))
+        kwargs.setdefault("download", lambda url: pytest.fail(f"descarga inesperada: {url}"))
+        kwargs.setdefault("cleanup_delay", 3600)
+        spooler = PrintSpooler(**kwargs)
+        spoolers.append(spooler)
+        return spooler
+    yield make
+    for spooler in spoolers:
+        spooler.stop(timeout=2)
+
+
+def test_pending_jobs_survive_a_restart(make_spooler, label, tmp_path, wait_for):
+    queue_file = tmp_path / "print_queue.json"
+    # Sin start(): los trabajos solo quedan encolados y persistidos
+    first = make_spooler(send=lambda path, printer: None)
+    ids = [first.submit("http://labels/1", printer="A", file_path=str(label), order_id=7,
+                        label_type="order", shipping_method="SEUR 24"),
+           first.submit("http://labels/2", printer="B", description="Proceso 3")]
+    saved = json.loads(queue_file.read_text(encoding="utf-8"))
+    assert [job["id"] for job in saved["jobs"]] == ids
+
+    sent = []
+    second = make_spooler(send=lambda path, printer: sent.append((path, printer)),
+                          download=lambda url: str(label))
+    restored = second.get_job(ids[0])
+    assert restored.status == JOB_QUEUED
+    assert (restored.order_id, restored.label_type, restored.shipping_method) == (7, "order", "SEUR 24")
+    assert second.pending_by_printer() == {"A": 1, "B": 1}
+
+    second.start()
+    assert wait_for(lambda: all(second.get_job(job_id).status == JOB_SENT for job_id in ids))
+    assert sorted(printer for _, printer in sent) == ["A", "B"]
+    # Los trabajos terminados salen del archivo de cola
+    assert json.loads(queue_file.read_text(encoding="utf-8"))["jobs"] == []
+
+
+def test_failed_sends_are_retried_with_exponential_backoff(make_spooler, label, wait_for):
+    attempts = []
+
+    def flaky_send(path, printer):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise OSError("impresora ocupada")
+    spooler = make_spooler(send=flaky_send, max_retries=3, backoff_base=0.1)
+    spooler.start()
+    job_id = spooler.submit("http://labels/1", printer="A", file_path=str(label))
+
+    assert wait_for(lambda: spooler.get_job(job_id).status == JOB_SENT)
+    job = spooler.get_job(job_id)
+    assert job.attempts == 3 and job.error is None
+    # Cada reintento espera el doble que el anterior: 0.1 s y luego 0.2 s
+    first_wait, second_wait = attempts[1] - attempts[0], attempts[2] - attempts[1]
+    assert first_wait >= 0.09
+    assert second_wait >= 0.19
+
+
+def test_gives_up_after_max_retries(make_spooler, label, wait_for):
+    def failing_send(path, printer):
+        raise OSError("impresora apagada")
+    spooler = make_spooler(send=failing_send, max_retries=2, backoff_base=0.0)
+    spooler.start()
+    job_id = spooler.submit("http://labels/1", printer="A", file_path=str(label))
+
+    assert wait_for(lambda: spooler.get_job(job_id).status == JOB_FAILED)
+    job = spooler.get_job(job_id)
+    assert job.attempts == 2
+    assert "impresora apagada" in job.error
+    assert spooler.pending_count() == 0
+
+
+def test_sent_files_are_released_only_after_the_cleanup_delay(make_spooler, label, wait_for):
+    released = []
+    spooler = make_spooler(send=lambda path, printer: None, release=released.append, cleanup_delay=0.3)
+    spooler.start()
+    job_id = spooler.submit("http://labels/1", printer="A", file_path=str(label))
+
+    assert wait_for(lambda: spooler.get_job(job_id).status == JOB_SENT)
+    assert not wait_for(lambda: released, timeout=0.1)
+    assert wait_for(lambda: released == [str(label)])
+
+
+def merging_spooler(make_spooler, sent, merged, **kwargs):
+    def merge(paths):
+        merged.append(list(paths))
+        return f"lote-{len(merged)}"
+    return make_spooler(send=lambda path, printer: sent.append((path, printer)), merge=merge,
+                        release=lambda path: None, **kwargs)
+
+
+def test_jobs_for_the_same_printer_are_sent_as_one_batch(make_spooler, label, wait_for):
+    sent, merged = [], []
+    spooler = merging_spooler(make_spooler, sent, merged, workers=2, batch_window=0.2, max_batch_latency=5.0)
+    ids = [spooler.submit(f"http://labels/{i}", printer=printer, file_path=str(label))
+           for i, printer in enumerate(["A", "A", "B", "A"])]
+    spooler.start()
+
+    assert wait_for(lambda: all(spooler.get_job(job_id).status == JOB_SENT for job_id in ids))
+    # Las tres etiquetas de A van en un solo documento; la única de B se envía tal cual
+    assert merged == [[str(label)] * 3]
+    assert sorted(sent) == sorted([("lote-1", "A"), (str(label), "B")])
+
+
+def test_batches_respect_max_batch_size(make_spooler, label, wait_for):
+    sent, merged = [], []
+    spooler = merging_spooler(make_spooler, sent, merged, batch_window=0.2, max_batch_latency=5.0,
+                              max_batch_size=2)
+    ids = [spooler.submit(f"http://labels/{i}", printer="A", file_path=str(label)) for i in range(5)]
+    spooler.start()
+
+    assert wait_for(lambda: all(spooler.get_job(job_id).status == JOB_SENT for job_id in ids))
+    assert [len(paths) for paths in merged] == [2, 2]
+    assert len(sent) == 3
+
+
+def test_unmergeable_batches_are_sent_one_by_one(make_spooler, label, wait_for):
+    sent = []
+    spooler = make_spooler(send=lambda path, printer: sent.append((path, printer)), merge=lambda paths: None,
+                           batch_window=0.2, max_batch_latency=5.0)
+    ids = [spooler.submit(f"http://labels/{i}", printer="A", file_path=str(label)) for i in range(3)]
+    spooler.start()
+
+    assert wait_for(lambda: all(spooler.get_job(job_id).status == JOB_SENT for job_id in ids))
+    assert sent == [(str(label), "A")] * 3
+
+
+def test_batch_window_never_holds_a_label_past_max_latency(make_spooler, label, wait_for):
+    sent, merged = [], []
+    spooler = merging_spooler(make_spooler, sent, merged, batch_window=10.0, max_batch_latency=0.2)
+    spooler.start()
+    started = time.monotonic()
+    job_id = spooler.submit("http://labels/1", printer="A", file_path=str(label))
+
+    assert wait_for(lambda: spooler.get_job(job_id).status == JOB_SENT, timeout=2.0)
+    assert time.monotonic() - started < 1.0
+    assert sent == [(str(label), "A")]
@@ -0,0 +1,147 @@
+import pytest
+
+from services.label_renderer import LabelRenderer, FORMAT_ZPL, FORMAT_PDF
+from services.printer_backends import RawTcpBackend, UnsupportedFormatError, create_backend, BACKEND_RAW
+from services.printer_router import PrinterRouter, LABEL_ORDER
+from services.print_spooler import PrintSpooler, JOB_SENT, JOB_FAILED
+from tools.fake_printer import FakePrinterServer
+
+
+@pytest.fixture
+def make_printer():
+    """Impresoras falsas en puertos libres. start=False deja el puerto sin escuchar (caída)."""
+    printers = []
+
+    def make(start=True):
+        printer = FakePrinterServer()
+        if start:
+            printer.start()
+        printers.append(printer)
+        return printer
+    yield make
+    for printer in printers:
+        printer.stop()
+
+
+@pytest.fixture
+def make_spooler(tmp_path):
+    spoolers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("download", lambda url: pytest.fail(f"No debería descargar {url}"))
+        kwargs.setdefault("send", RawTcpBackend(timeout=2).send)
+        kwargs.setdefault("backoff_base", 0.05)
+        spooler = PrintSpooler(queue_file=str(tmp_path / "print_queue.json"), **kwargs)
+        spooler.start()
+        spoolers.append(spooler)
+        return spooler
+    yield make
+    for spooler in spoolers:
+        spooler.stop(timeout=2)
+
+
+@pytest.fixture
+def zpl_label(tmp_path):
+    renderer = LabelRenderer(output_dir=str(tmp_path / "spool"), default_format=FORMAT_ZPL)
+    return renderer.render_shipping_label({"id": 42, "name": "Cliente 42", "tracking_code": "TRK000000042"})
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_raw_backend_sends_zpl_to_the_printer(make_printer, zpl_label):
+    printer = make_printer()
+
+    RawTcpBackend(timeout=2).send(zpl_label, printer.address)
+
+    assert printer.wait_for_jobs(1)
+    assert printer.jobs == [read(zpl_label)]
+    assert printer.jobs[0].startswith(b"^XA") and printer.jobs[0].rstrip().endswith(b"^XZ")
+
+
+def test_raw_backend_rejects_pdf(make_printer, tmp_path):
+    printer = make_printer()
+    backend = create_backend({"backend": BACKEND_RAW, "raw_printers": [printer.address]})
+    pdf_label = LabelRenderer(output_dir=str(tmp_path), default_format=FORMAT_PDF).render_process_label({"id": 1})
+    disguised = tmp_path / "label.zpl"
+    disguised.write_bytes(read(pdf_label))
+
+    assert not backend.supports(pdf_label)
+    with pytest.raises(UnsupportedFormatError):
+        backend.send(pdf_label, printer.address)
+    # Un PDF con extensión de ZPL también se rechaza por el contenido
+    with pytest.raises(UnsupportedFormatError):
+        backend.send(str(disguised), printer.address)
+    assert not printer.wait_for_jobs(1, timeout=0.2)
+
+
+def test_raw_backend_parses_printer_address():
+    assert RawTcpBackend.parse_address("192.168.1.50") == ("192.168.1.50", 9100)
+    assert RawTcpBackend.parse_address("192.168.1.51:9101") == ("192.168.1.51", 9101)
+
+
+def test_spooler_retries_until_the_printer_comes_back(make_printer, make_spooler, wait_for, zpl_label):
+    printer = make_printer(start=False)
+    spooler = make_spooler()
+
+    job_id = spooler.submit("http://labels/42", printer=printer.address, file_path=zpl_label)
+    job = spooler.get_job(job_id)
+    assert wait_for(lambda: job.attempts >= 1 and job.error)
+    assert job.status != JOB_SENT
+
+    printer.start()
+    assert wait_for(lambda: job.status == JOB_SENT)
+    assert job.attempts >= 2
+    assert printer.wait_for_jobs(1)
+    assert printer.jobs == [read(zpl_label)]
+
+
+def test_spooler_gives_up_after_max_retries(make_printer, make_spooler, wait_for, zpl_label):
+    printer = make_printer(start=False)
+    spooler = make_spooler(max_retries=2)
+
+    job = spooler.get_job(spooler.submit("http://labels/42", printer=printer.address, file_path=zpl_label))
+
+    assert wait_for(lambda: job.status == JOB_FAILED)
+    assert job.attempts == 2
+    assert spooler.pending_count() == 0
+
+
+def test_spooler_fails_over_to_another_printer_of_the_pool(make_printer, make_spooler, wait_for, zpl_label):
+    down = make_printer(start=False)
+    up = make_printer()
+    router = PrinterRouter({
+        "printer_pools": {"envios": [down.address, up.address]},
+        "routing_rules": [{"label_type": LABEL_ORDER, "pool": "envios"}],
+    })
+    # Sin esperar el backoff: el failover reintenta enseguida en la otra impresora
+    spooler = make_spooler(reroute=router.failover, backoff_base=60.0)
+
+    job = spooler.get_job(spooler.submit(
+        "http://labels/42", printer=down.address, file_path=zpl_label, label_type=LABEL_ORDER
+    ))
+
+    assert wait_for(lambda: job.status == JOB_SENT)
+    assert job.printer == up.address
+    assert job.attempts == 2
+    assert up.wait_for_jobs(1)
+    assert up.jobs == [read(zpl_label)]
+    assert not router.is_available(down.address)
+    assert router.route(LABEL_ORDER) == up.address
+
+
+def test_spooler_does_not_retry_unsupported_formats(make_printer, make_spooler, wait_for, tmp_path):
+    printer = make_printer()
+    pdf_label = LabelRenderer(output_dir=str(tmp_path), default_format=FORMAT_PDF).render_process_label({"id": 1})
+    rerouted = []
+    spooler = make_spooler(reroute=lambda job: rerouted.append(job) or printer.address)
+
+    job = spooler.get_job(spooler.submit("http://labels/1.pdf", printer=printer.address, file_path=pdf_label))
+
+    assert wait_for(lambda: job.status == JOB_FAILED)
+    assert job.attempts == 1
+    assert "no imprime archivos pdf" in job.error
+    assert rerouted == []
+    assert printer.jobs == []
@@ -0,0 +1,69 @@
+import threading
+
+from services.printer_inventory import PrinterInventory
+
+
+def test_enumerates_in_the_background_and_notifies_only_changes(wait_for):
+    printers = [(["Zebra", "HP"], "Zebra")]
+    calls = []
+
+    def list_printers():
+        calls.append(threading.current_thread().name)
+        return printers[-1]
+    inventory = PrinterInventory(list_printers, refresh_interval=3600)
+    received = []
+    inventory.subscribe(lambda names, default: received.append((names, default)))
+    assert inventory.get() == ([], None) and not inventory.is_loaded()
+
+    inventory.start()
+    assert wait_for(inventory.is_loaded)
+    assert inventory.get() == (["Zebra", "HP"], "Zebra")
+    assert calls == ["PrinterInventory"]
+
+    # Sin cambios no se notifica; con cambios sí
+    inventory.refresh_async()
+    assert wait_for(lambda: len(calls) == 2)
+    printers.append((["HP"], "HP"))
+    inventory.refresh_async()
+    assert wait_for(lambda: len(received) == 2)
+    assert received == [(["Zebra", "HP"], "Zebra"), (["HP"], "HP")]
+
+
+def test_slow_enumerations_do_not_overlap():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_list():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["Zebra"], "Zebra"
+    inventory = PrinterInventory(slow_list)
+    first = threading.Thread(target=inventory.refresh)
+    first.start()
+    assert started.wait(5)
+
+    # get() no espera a la enumeración en curso y un segundo refresh() no lanza otra
+    assert inventory.get() == ([], None)
+    inventory.refresh()
+    release.set()
+    first.join(5)
+    assert len(calls) == 1
+    assert inventory.get() == (["Zebra"], "Zebra")
+
+
+def test_failed_enumeration_keeps_the_last_known_list():
+    results = [(["Zebra"], "Zebra")]
+
+    def list_printers():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    inventory = PrinterInventory(list_printers)
+    inventory.refresh()
+    results.append(OSError("spooler de Windows no disponible"))
+    inventory.refresh()
+
+    assert inventory.get() == (["Zebra"], "Zebra")
@@ -0,0 +1,82 @@
+import threading
+
+from services.printer_router import PrinterRouter, LABEL_ORDER, LABEL_PROCESS
+from services.print_spooler import PrintSpooler, JOB_FAILED
+
+POOLS = {
+    "printer_pools": {"envios": ["A", "B"], "procesos": ["P"]},
+    "routing_rules": [
+        {"shipping_method": "SEUR 24", "pool": "procesos"},
+        {"label_type": LABEL_ORDER, "pool": "envios"},
+    ],
+    "selected_printer": "DEFAULT",
+}
+
+
+def test_routes_by_rule_and_falls_back_to_the_selected_printer():
+    router = PrinterRouter(POOLS)
+
+    assert router.route(LABEL_ORDER, "SEUR 24") == "P"
+    assert router.route(LABEL_ORDER) in ("A", "B")
+    assert router.route(LABEL_PROCESS) == "DEFAULT"
+
+
+def test_balances_by_queue_depth_and_skips_printers_marked_down():
+    depths = {"A": 3, "B": 0}
+    router = PrinterRouter(POOLS, queue_depth=lambda: depths)
+
+    assert router.route(LABEL_ORDER) == "B"
+    assert router.failover(type("Job", (), {"printer": "B", "label_type": LABEL_ORDER, "shipping_method": None})) == "A"
+    assert router.route(LABEL_ORDER) == "A"
+    router.mark_up("B")
+    assert router.route(LABEL_ORDER) == "B"
+
+
+def test_route_does_not_deadlock_with_failing_sends(tmp_path):
+    # route() (hilo de Tk) consulta la cola del spooler mientras un hilo del
+    # spooler que acaba de fallar un envío pide failover() al enrutador
+    label = tmp_path / "label.zpl"
+    label.write_bytes(b"^XA^XZ")
+    spooler = None
+    router = PrinterRouter(POOLS, queue_depth=lambda: spooler.pending_by_printer())
+
+    def failing_send(file_path, printer):
+        raise OSError("impresora apagada")
+    spooler = PrintSpooler(
+        download=lambda url: str(label), send=failing_send, reroute=router.failover,
+        queue_file=str(tmp_path / "print_queue.json"), workers=4, max_retries=10,
+        backoff_base=0.0, cleanup_delay=3600
+    )
+    spooler.start()
+    routed = []
+    stop = threading.Event()
+    finished = threading.Event()
+
+    def route_loop():
+        while not stop.is_set():
+            routed.append(router.route(LABEL_ORDER))
+
+    try:
+        jobs = [spooler.get_job(spooler.submit("http://labels/x", printer=p, file_path=str(label), label_type=LABEL_ORDER))
+                for p in ("A", "B") * 4]
+        # Desde aquí el hilo de la prueba no toma ningún lock: si se bloquean, falla en vez de colgarse
+        router_thread = threading.Thread(target=route_loop, daemon=True)
+        router_thread.start()
+
+        def wait_jobs():
+            while not all(job.status == JOB_FAILED for job in jobs):
+                threading.Event().wait(0.01)
+            finished.set()
+        threading.Thread(target=wait_jobs, daemon=True).start()
+
+        assert finished.wait(10), "el spooler y el enrutador se bloquearon"
+        stop.set()
+        router_thread.join(5)
+        assert not router_thread.is_alive(), "route() se quedó bloqueado"
+        assert routed
+        assert all(job.attempts == 10 for job in jobs)
+    finally:
+        stop.set()
+        if finished.is_set():
+            # Con los hilos bloqueados stop() esperaría al lock para siempre
+            spooler.stop(timeout=2)
@@ -0,0 +1,71 @@
+import json
+
+from services.scan_journal import ScanJournal
+
+
+def journal_lines(journal, process_id):
+    with open(journal.path_for(process_id), "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_restore_returns_the_last_count_of_each_product(tmp_path):
+    journal = ScanJournal(directory=str(tmp_path))
+    journal.record(1, 10, "SKU-A", 1)
+    journal.record(1, 10, "SKU-A", 2)
+    journal.record(1, 10, "SKU-B", 1)
+    journal.record(1, 11, "SKU-A", 5)
+
+    assert journal.restore(1, 10) == {"SKU-A": 2, "SKU-B": 1}
+    assert journal.restore(1, 11) == {"SKU-A": 5}
+    assert journal.restore(1, 12) == {}
+    assert journal.restore(2, 10) == {}
+    # Otra instancia (la app tras un reinicio) lee lo mismo del disco
+    assert ScanJournal(directory=str(tmp_path)).restore(1, 10) == {"SKU-A": 2, "SKU-B": 1}
+
+
+def test_compact_rewrites_the_other_orders_keeping_the_last_line(tmp_path):
+    journal = ScanJournal(directory=str(tmp_path))
+    journal.record(1, 10, "SKU-A", 1)
+    journal.record(1, 11, "SKU-A", 1)
+    journal.record(1, 11, "SKU-A", 2)
+    journal.compact(1, 10)
+    journal.flush()
+
+    lines = journal_lines(journal, 1)
+    assert [(line["o"], line["p"], line["n"]) for line in lines] == [(11, "SKU-A", 2)]
+    assert journal.restore(1, 10) == {}
+    assert journal.restore(1, 11) == {"SKU-A": 2}
+
+
+def test_compact_of_the_last_order_deletes_the_file(tmp_path):
+    journal = ScanJournal(directory=str(tmp_path))
+    journal.record(1, 10, "SKU-A", 1)
+    journal.flush()
+    path = tmp_path / "process_1.jsonl"
+    assert path.exists()
+
+    journal.compact(1, 10)
+    journal.flush()
+
+    assert not path.exists()
+    assert not (tmp_path / "process_1.jsonl.tmp").exists()
+
+
+def test_truncated_trailing_line_is_ignored(tmp_path):
+    journal = ScanJournal(directory=str(tmp_path))
+    journal.record(1, 10, "SKU-A", 3)
+    journal.flush()
+    # Corte de luz a mitad de una escritura
+    with open(journal.path_for(1), "a", encoding="utf-8") as f:
+        f.write('{"o": 10, "p": "SKU-A", "n"')
+
+    restarted = ScanJournal(directory=str(tmp_path))
+    assert restarted.restore(1, 10) == {"SKU-A": 3}
+    # El siguiente escaneo no se pega a la línea rota
+    restarted.record(1, 10, "SKU-B", 1)
+    assert restarted.restore(1, 10) == {"SKU-A": 3, "SKU-B": 1}
+    # Al compactar la línea rota desaparece del diario
+    restarted.record(1, 11, "SKU-C", 1)
+    restarted.compact(1, 11)
+    restarted.flush()
+    assert [(line["o"], line["p"], line["n"]) for line in journal_lines(restarted, 1)] == [(10, "SKU-A", 3), (10, "SKU-B", 1)]
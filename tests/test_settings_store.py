@@ -0,0 +1,70 @@
+import os
+import json
+
+import pytest
+
+import services.settings_store as settings_store
+from services.settings_store import SettingsStore
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_update_writes_atomically_and_keeps_other_keys(tmp_path):
+    path = tmp_path / "printer_config.json"
+    path.write_text(json.dumps({"selected_printer": "A", "printer_pools": {}}), encoding="utf-8")
+    store = SettingsStore(str(path), watch_interval=0)
+
+    store.update({"selected_printer": "B"})
+
+    assert read_json(path) == {"selected_printer": "B", "printer_pools": {}}
+    assert not os.path.exists(f"{path}.tmp")
+    # Lo que retorna get() es una copia: modificarla no altera la configuración
+    store.get("printer_pools")["envios"] = ["A"]
+    assert store.get("printer_pools") == {}
+
+
+def test_failed_write_leaves_file_and_memory_untouched(tmp_path, monkeypatch):
+    path = tmp_path / "printer_config.json"
+    path.write_text(json.dumps({"selected_printer": "A"}), encoding="utf-8")
+    store = SettingsStore(str(path), watch_interval=0)
+
+    def failing_replace(src, dst):
+        raise OSError("disco lleno")
+    monkeypatch.setattr(settings_store.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        store.update({"selected_printer": "B"})
+    monkeypatch.undo()
+
+    assert read_json(path) == {"selected_printer": "A"}
+    assert store.get("selected_printer") == "A"
+
+
+def test_subscribers_receive_every_change(tmp_path):
+    store = SettingsStore(str(tmp_path / "config" / "credentials.json"), watch_interval=0)
+    received = []
+    store.subscribe(received.append)
+
+    store.update({"email": "op@example.com"})
+    store.replace({"token_data": None})
+    store.unsubscribe(received.append)
+    store.clear()
+
+    assert received == [{"email": "op@example.com"}, {"token_data": None}]
+    assert not store.exists()
+
+
+def test_external_edits_are_reloaded_and_notified(tmp_path, wait_for):
+    path = tmp_path / "printer_config.json"
+    store = SettingsStore(str(path), watch_interval=0.02)
+    store.update({"selected_printer": "A"})
+    received = []
+    store.subscribe(received.append)
+
+    # Otro proceso (o el usuario) edita el archivo: cambia el tamaño y la firma
+    path.write_text(json.dumps({"selected_printer": "Zebra GK420"}), encoding="utf-8")
+
+    assert wait_for(lambda: received == [{"selected_printer": "Zebra GK420"}])
+    assert store.get("selected_printer") == "Zebra GK420"
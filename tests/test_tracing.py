@@ -0,0 +1,84 @@
+import json
+import threading
+
+import pytest
+
+from services.tracing import Tracer, JsonlSpanExporter, STATUS_ERROR, STATUS_OK
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span_dict):
+        self.spans.append(span_dict)
+
+
+def by_name(spans):
+    return {span["name"]: span for span in spans}
+
+
+def test_nested_spans_share_the_trace_and_record_errors():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=True)
+
+    with pytest.raises(RuntimeError):
+        with tracer.span("confirm", order_id=7) as confirm:
+            with tracer.span("post") as post:
+                post.set_attribute("status_code", 200)
+            raise RuntimeError("sin etiqueta")
+
+    spans = by_name(exporter.spans)
+    assert spans["post"]["trace_id"] == spans["confirm"]["trace_id"]
+    assert spans["post"]["parent_id"] == confirm.span_id
+    assert spans["post"]["attributes"] == {"status_code": 200}
+    assert (spans["confirm"]["status"], spans["confirm"]["error"]) == (STATUS_ERROR, "sin etiqueta")
+    assert spans["post"]["status"] == STATUS_OK
+    assert tracer.current_span() is None
+
+
+def test_spans_can_hang_from_a_span_of_another_thread():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=True)
+    order = tracer.start_span("order", order_id=7)
+
+    def worker(context):
+        # En otro hilo no hay span activo: sin parent sería una traza nueva
+        assert tracer.current_span() is None
+        tracer.record("print", start=10.0, end=10.25, parent=context)
+    thread = threading.Thread(target=worker, args=(order.context(),))
+    thread.start()
+    thread.join(5)
+    order.end()
+    order.end()
+
+    spans = by_name(exporter.spans)
+    assert len(exporter.spans) == 2
+    assert spans["print"]["parent_id"] == order.span_id
+    assert spans["print"]["duration_ms"] == 250.0
+    assert tracer.start_span("otro", root=True).trace_id != order.trace_id
+
+
+def test_disabled_tracer_exports_nothing():
+    exporter = ListExporter()
+    tracer = Tracer(exporter, enabled=False)
+    with tracer.span("scan") as span:
+        span.set_attribute("code", "841")
+    assert exporter.spans == []
+
+
+def test_jsonl_exporter_writes_and_rotates(tmp_path):
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = JsonlSpanExporter(path=str(path), max_bytes=1)
+    tracer = Tracer(exporter, enabled=True)
+
+    for i in range(2):
+        with tracer.span("scan", index=i):
+            pass
+        exporter.flush()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    rotated = [json.loads(line) for line in (tmp_path / "traces" / "spans.jsonl.1").read_text(encoding="utf-8").splitlines()]
+    # Al superar max_bytes el archivo pasa a .1 y se empieza uno nuevo
+    assert [span["attributes"]["index"] for span in rotated] == [0]
+    assert [span["attributes"]["index"] for span in lines] == [1]
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+from components.tree_model import TreeModel
+
+
+class RecordingTree:
+    """Treeview plano en memoria que anota cada llamada que haría a Tk."""
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.items = {}
+        self.order = []
+        self.calls = []
+        self._selection = ()
+
+    def __getitem__(self, option):
+        return self.columns
+
+    def insert(self, parent, index, iid, values=(), tags=(), image=None):
+        self.calls.append(("insert", iid))
+        self.items[iid] = {"values": list(values), "tags": tuple(tags)}
+        self.order.insert(index, iid)
+
+    def delete(self, *iids):
+        self.calls.append(("delete",) + iids)
+        for iid in iids:
+            del self.items[iid]
+            self.order.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid, index))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def set(self, iid, column, value):
+        self.calls.append(("set", iid, column))
+        self.items[iid]["values"][self.columns.index(column)] = value
+
+    def item(self, iid, values=None, tags=None, image=None):
+        self.calls.append(("item", iid))
+        if values is not None:
+            self.items[iid]["values"] = list(values)
+        if tags is not None:
+            self.items[iid]["tags"] = tuple(tags)
+
+    def selection(self):
+        return self._selection
+
+    def shown(self):
+        return [(iid, tuple(self.items[iid]["values"])) for iid in self.order]
+
+
+def product(product_id, scanned, required=2):
+    return SimpleNamespace(id=product_id, sku=f"SKU-{product_id}", scanned=scanned, required=required)
+
+
+def make_model(tree):
+    return TreeModel(
+        tree, key=lambda p: p.id,
+        row_values=lambda p: (p.sku, p.scanned, p.required),
+        row_tags=lambda p: ("complete",) if p.scanned >= p.required else ()
+    )
+
+
+def test_sync_inserts_then_writes_only_changed_cells():
+    tree = RecordingTree(["sku", "scanned", "required"])
+    model = make_model(tree)
+    model.sync([product(1, 0), product(2, 0)])
+    assert tree.shown() == [("1", ("SKU-1", 0, 2)), ("2", ("SKU-2", 0, 2))]
+
+    tree.calls.clear()
+    model.sync([product(1, 1), product(2, 0)])
+    # Un escaneo reescribe una sola celda de una sola fila
+    assert tree.calls == [("set", "1", "scanned")]
+
+    tree.calls.clear()
+    model.sync([product(1, 2), product(2, 0)])
+    assert tree.calls == [("set", "1", "scanned"), ("item", "1")]
+    assert tree.items["1"]["tags"] == ("complete",)
+
+    tree.calls.clear()
+    model.sync([product(1, 2), product(2, 0)])
+    assert tree.calls == []
+
+
+def test_sync_deletes_moves_and_inserts_by_key():
+    tree = RecordingTree(["sku", "scanned", "required"])
+    model = make_model(tree)
+    model.sync([product(1, 0), product(2, 0), product(3, 0)])
+
+    tree.calls.clear()
+    model.sync([product(3, 0), product(1, 0), product(4, 0)])
+
+    assert tree.shown() == [("3", ("SKU-3", 0, 2)), ("1", ("SKU-1", 0, 2)), ("4", ("SKU-4", 0, 2))]
+    assert ("delete", "2") in tree.calls
+    assert ("insert", "4") in tree.calls
+    # Las filas que siguen se mueven, nunca se borran y reinsertan
+    assert not any(call[0] == "insert" and call[1] in ("1", "3") for call in tree.calls)
+    assert [row.id for row in model.rows()] == [3, 1, 4]
+
+
+def test_update_rewrites_a_single_row_and_keeps_the_selection():
+    tree = RecordingTree(["sku", "scanned", "required"])
+    model = make_model(tree)
+    model.sync([product(1, 0), product(2, 0)])
+    tree._selection = ("2",)
+
+    tree.calls.clear()
+    assert model.update(product(2, 1))
+    assert not model.update(product(9, 1))
+    assert tree.calls == [("set", "2", "scanned")]
+    assert model.selected_row().scanned == 1
+
+    model.clear()
+    assert tree.shown() == [] and len(model) == 0
@@ -0,0 +1,184 @@
+import time
+
+import pytest
+
+import services.waiting_feed as waiting_feed
+from services.api_client import ApiClient
+from services.waiting_feed import WaitingProcessesFeed, MODE_PUSH, MODE_POLL
+from tools.fake_event_server import FakePackingServer
+
+
+@pytest.fixture
+def fast_feed(monkeypatch):
+    """Intervalos de sondeo y reconexión cortos para que las pruebas no esperen segundos."""
+    monkeypatch.setattr(waiting_feed, "POLL_MIN_INTERVAL", 0.02)
+    monkeypatch.setattr(waiting_feed, "POLL_MAX_INTERVAL", 0.1)
+    monkeypatch.setattr(waiting_feed, "PUSH_RECONNECT_DELAY", 0.01)
+
+
+@pytest.fixture
+def make_server(api_url):
+    servers = []
+
+    def make(**kwargs):
+        server = FakePackingServer(**kwargs).start()
+        api_url(server.base_url)
+        servers.append(server)
+        return server
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_feed(fast_feed):
+    feeds = []
+
+    def make(use_push=True):
+        feed = WaitingProcessesFeed(ApiClient(), use_push=use_push).start()
+        feeds.append(feed)
+        return feed
+    yield make
+    for feed in feeds:
+        feed.stop()
+
+
+class Collector:
+    """Acumula lo que drain() va devolviendo, como hace el panel de la vista."""
+    def __init__(self, feed):
+        self.feed = feed
+        self.events = []
+
+    def has(self, kind, match=lambda payload: True):
+        self.events += self.feed.drain()
+        return any(k == kind and match(payload) for k, payload in self.events)
+
+    def snapshots(self):
+        self.events += self.feed.drain()
+        return [payload for kind, payload in self.events if kind == "snapshot"]
+
+
+def ids(processes):
+    return sorted(p["id"] for p in processes)
+
+
+def test_push_delivers_snapshot_upsert_and_remove(make_server, make_feed, wait_for):
+    server = make_server(push=True)
+    first = server.add_process()
+    feed = make_feed()
+    events = Collector(feed)
+
+    assert wait_for(lambda: events.has("snapshot", lambda processes: ids(processes) == [first["id"]]))
+    assert feed.mode == MODE_PUSH
+
+    second = server.add_process()
+    assert wait_for(lambda: events.has("upsert", lambda process: process["id"] == second["id"]))
+    server.update_process(second["id"], name="Renombrado")
+    assert wait_for(lambda: events.has("upsert", lambda process: process.get("name") == "Renombrado"))
+    server.remove_process(first["id"])
+    assert wait_for(lambda: events.has("remove", lambda process_id: process_id == first["id"]))
+    # En push no se sondea el listado
+    assert server.list_requests == 0
+
+
+def test_without_push_polls_with_etag_and_backs_off(make_server, make_feed, wait_for):
+    server = make_server(push=False)
+    first = server.add_process()
+    feed = make_feed()
+    events = Collector(feed)
+
+    assert wait_for(lambda: events.has("snapshot", lambda processes: ids(processes) == [first["id"]]))
+    assert feed.mode == MODE_POLL
+
+    # Sin cambios el servidor responde 304 y el intervalo se alarga hasta el máximo
+    assert wait_for(lambda: server.not_modified >= 3)
+    assert wait_for(lambda: feed.interval == waiting_feed.POLL_MAX_INTERVAL)
+    assert len(events.snapshots()) == 1
+
+    # Un cambio llega como snapshot completo y el intervalo vuelve al mínimo
+    second = server.add_process()
+    assert wait_for(lambda: any(ids(s) == [first["id"], second["id"]] for s in events.snapshots()))
+    server.remove_process(first["id"])
+    assert wait_for(lambda: any(ids(s) == [second["id"]] for s in events.snapshots()))
+
+
+def test_refresh_resets_the_poll_interval(make_server, make_feed, wait_for):
+    server = make_server(push=False)
+    feed = make_feed()
+    assert wait_for(lambda: feed.interval == waiting_feed.POLL_MAX_INTERVAL)
+    requests_before = server.list_requests
+    feed.drain()
+
+    feed.refresh()
+    # Sin ETag ni huella se vuelve a pedir el listado completo (200, no 304)
+    events = Collector(feed)
+    assert wait_for(lambda: events.has("snapshot"))
+    assert server.list_requests > requests_before
+
+
+def test_short_lived_streams_fall_back_to_polling(make_server, make_feed, wait_for):
+    # Un proxy que corta cada stream enseguida: no se reconecta en bucle
+    server = make_server(push=True, stream_lifetime=0.05)
+    server.add_process()
+    feed = make_feed()
+
+    assert wait_for(lambda: feed.mode == MODE_POLL)
+    assert wait_for(lambda: server.list_requests >= 2)
+    assert not server._subscribers
+
+
+def test_pause_stops_push_and_polling_until_resume(make_server, make_feed, wait_for):
+    # Pings frecuentes: el servidor solo ve el stream cerrado al volver a escribir
+    server = make_server(push=True, ping_interval=0.05)
+    server.add_process()
+    feed = make_feed()
+    events = Collector(feed)
+    assert wait_for(lambda: events.has("snapshot") and server._subscribers)
+
+    started = time.monotonic()
+    feed.pause()
+    # pause() se llama desde el hilo de Tk: no espera al siguiente ping del servidor
+    assert time.monotonic() - started < 0.5
+    assert feed.paused
+    assert wait_for(lambda: not feed._thread.is_alive() or feed._stream is None)
+    assert wait_for(lambda: not server._subscribers)
+    added = server.add_process()
+    assert not wait_for(lambda: events.has("upsert"), timeout=0.3)
+
+    feed.resume()
+    # Al reconectar llega un snapshot nuevo con lo que cambió durante la pausa
+    assert wait_for(lambda: any(added["id"] in ids(s) for s in events.snapshots()))
+    assert feed.mode == MODE_PUSH
+
+
+def test_pause_cuts_a_silent_stream(make_server, make_feed, wait_for):
+    # Tras el snapshot el servidor no vuelve a escribir: la lectura solo acaba si se corta el socket
+    server = make_server(push=True, ping_interval=3600)
+    server.add_process()
+    feed = make_feed()
+    events = Collector(feed)
+    assert wait_for(lambda: events.has("snapshot") and feed._stream is not None)
+
+    started = time.monotonic()
+    feed.pause()
+    assert time.monotonic() - started < 0.5
+    assert wait_for(lambda: feed._stream is None, timeout=2.0)
+
+    added = server.add_process()
+    feed.resume()
+    assert wait_for(lambda: any(added["id"] in ids(s) for s in events.snapshots()))
+
+
+def test_pause_stops_polling(make_server, make_feed, wait_for):
+    server = make_server(push=False)
+    feed = make_feed(use_push=False)
+    assert wait_for(lambda: server.list_requests >= 2)
+
+    feed.pause()
+    wait_for(lambda: False, timeout=0.2)   # Deja terminar una consulta en curso
+    requests_paused = server.list_requests
+    wait_for(lambda: False, timeout=0.3)
+    assert server.list_requests == requests_paused
+
+    feed.resume()
+    assert wait_for(lambda: server.list_requests > requests_paused)
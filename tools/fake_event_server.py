@@ -0,0 +1,223 @@
+"""
+Servidor falso de procesos en espera para probar el panel "Contenedores sin
+Procesar" sin el backend real.
+
+Sirve PACKING_LIST (con ETag / 304) y PACKING_EVENTS (Server-Sent Events) y
+simula la llegada de contenedores desde picking. Con --no-push el canal de
+eventos responde 404 y la aplicación debe pasar a sondeo. Con --stream-lifetime
+el servidor corta cada stream a los N segundos, como un proxy que no deja
+respuestas largas abiertas.
+
+Uso:
+    python -m tools.fake_event_server --port 8765 --churn 5
+    set CEREBRO_API_URL=http://127.0.0.1:8765/api/auth/scanner   (y arrancar main.py)
+"""
+import json
+import queue
+import argparse
+import itertools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.api_routes import API_ROUTES
+
+
+class FakePackingServer:
+    """
+    Servidor HTTP con los procesos de picking en espera en memoria.
+
+    :param host: Dirección en la que escucha.
+    :param port: Puerto (0 = uno libre elegido por el sistema).
+    :param push: False para no ofrecer el canal de eventos (404).
+    :param ping_interval: Segundos entre comentarios ': ping' del stream.
+    :param stream_lifetime: Segundos tras los que se corta cada stream (None = nunca).
+    """
+    def __init__(self, host="127.0.0.1", port=0, push=True, ping_interval=15.0, stream_lifetime=None):
+        self.host = host
+        self.push = push
+        self.ping_interval = ping_interval
+        self.stream_lifetime = stream_lifetime
+        self.processes = []
+        self.version = 0
+        self.list_requests = 0
+        self.not_modified = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Valor para CEREBRO_API_URL."""
+        return f"http://{self.host}:{self.port}/api/auth/scanner"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="FakePackingServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(None)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    # ------------------------------------------------------------------
+    # Simulación
+    # ------------------------------------------------------------------
+    def add_process(self, name=None, barcode=None):
+        process_id = next(self._ids)
+        process = {
+            "id": process_id,
+            "name": name or f"Picking {process_id}",
+            "containers": [{"container": {"bar_code": barcode or f"CST{process_id:05d}"}}],
+        }
+        with self._lock:
+            self.processes.append(process)
+            self._changed("upsert", process)
+        return process
+
+    def update_process(self, process_id, **changes):
+        with self._lock:
+            for process in self.processes:
+                if process["id"] == process_id:
+                    process.update(changes)
+                    self._changed("upsert", process)
+                    return process
+        return None
+
+    def remove_process(self, process_id):
+        with self._lock:
+            before = len(self.processes)
+            self.processes = [p for p in self.processes if p["id"] != process_id]
+            if len(self.processes) != before:
+                self._changed("remove", {"id": process_id})
+
+    def _changed(self, event, payload):
+        # Se llama con el lock tomado
+        self.version += 1
+        message = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode("utf-8")
+        for subscriber in self._subscribers:
+            subscriber.put(message)
+
+    def _snapshot(self):
+        with self._lock:
+            return [dict(p) for p in self.processes], self.version
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path.endswith(API_ROUTES["PACKING_EVENTS"]):
+                    self._events()
+                elif path.endswith(API_ROUTES["PACKING_LIST"]):
+                    self._list()
+                else:
+                    self.send_error(404)
+
+            def _list(self):
+                processes, version = server._snapshot()
+                etag = f'"v{version}"'
+                server.list_requests += 1
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = json.dumps({
+                    "success": True,
+                    "data": {
+                        "packing_processes": {"data": [], "current_page": 1, "last_page": 1, "total": 0},
+                        "picking_processes": processes,
+                    },
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _events(self):
+                if not server.push:
+                    self.send_error(404)
+                    return
+                subscriber = queue.Queue()
+                with server._lock:
+                    snapshot = {"picking_processes": [dict(p) for p in server.processes]}
+                    server._subscribers.append(subscriber)
+                try:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+                    self.wfile.write(f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    deadline = time.monotonic() + server.stream_lifetime if server.stream_lifetime else None
+                    while True:
+                        timeout = server.ping_interval
+                        if deadline is not None:
+                            timeout = min(timeout, deadline - time.monotonic())
+                            if timeout <= 0:
+                                return
+                        try:
+                            message = subscriber.get(timeout=timeout)
+                        except queue.Empty:
+                            if deadline is not None and time.monotonic() >= deadline:
+                                return
+                            message = b": ping\n\n"
+                        if message is None:
+                            return
+                        self.wfile.write(message)
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    with server._lock:
+                        server._subscribers.remove(subscriber)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor falso de procesos en espera (SSE + sondeo).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-push", action="store_true", help="Sin canal de eventos (fuerza el sondeo)")
+    parser.add_argument("--churn", type=float, default=5.0, help="Segundos entre llegadas de contenedores")
+    parser.add_argument("--max", type=int, default=8, help="Procesos en espera como máximo")
+    parser.add_argument("--stream-lifetime", type=float, help="Cortar cada stream de eventos a los N segundos")
+    args = parser.parse_args()
+
+    server = FakePackingServer(args.host, args.port, push=not args.no_push,
+                               stream_lifetime=args.stream_lifetime).start()
+    print(f"Servidor falso en {server.base_url} (push={'no' if args.no_push else 'sí'}). Ctrl+C para salir.")
+    try:
+        while True:
+            time.sleep(args.churn)
+            process = server.add_process()
+            print(f"[FAKE SERVER] Llega {process['name']} ({process['containers'][0]['container']['bar_code']})")
+            if len(server.processes) > args.max:
+                oldest = server.processes[0]
+                server.remove_process(oldest["id"])
+                print(f"[FAKE SERVER] {oldest['name']} ya no está en espera")
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+API falsa de packing para probar el motor de packing sin el backend real.
+
+Sirve LOGIN, PACKING_VIEW y PACKING_CONFIRM sobre procesos sintéticos en
+memoria (N órdenes de M líneas) y valida las confirmaciones como el backend:
+las cantidades enviadas deben ser las requeridas. Con --latency cada petición
+tarda ese tiempo extra (red + base de datos).
+
+Uso:
+    python -m tools.fake_packing_api --port 8766 --orders 200 --lines 5
+    python packing_cli.py --api-url http://127.0.0.1:8766/api/auth/scanner --process 1 --auto
+"""
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.api_routes import API_ROUTES
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def sample_line(order_index, line_index):
+    product_id = order_index * 100 + line_index
+    return {
+        "id": product_id,
+        "quantity": 1 + line_index % 3,
+        "product": {
+            "id": product_id,
+            "name": f"Producto {product_id}",
+            "sku": f"SKU-{product_id:07d}",
+            "bar_code": f"84{product_id:011d}",
+            "warehouse_code": f"A-{line_index % 40:02d}",
+            "image_url": f"https://cdn.example.com/img/{product_id}.jpg",
+        },
+    }
+
+def sample_process_order(i, lines, finished=None):
+    if finished is None:
+        finished = bool(i % 2)
+    return {
+        "id": 500000 + i,
+        "started_at": "2024-03-01 10:00:00" if finished else None,
+        "finished_at": "2024-03-01 10:02:30" if finished else None,
+        "order": {
+            "id": 100000 + i,
+            "name": f"Cliente {i}",
+            "email": f"cliente{i}@example.com",
+            "phone": "600000000",
+            "address": "Calle Falsa 123",
+            "address_2": "Piso 2" if i % 3 else None,
+            "city": "Madrid",
+            "province": "Madrid",
+            "zip": "28001",
+            "country_code": "ES",
+            "shipping_method_name": "Estándar",
+            "tracking_code": f"TRK{i:09d}",
+            "created_at": "2024-02-28 18:00:00",
+        },
+        "packing_process_order_product": [sample_line(i, j) for j in range(lines)],
+    }
+
+def sample_process(process_id, orders, lines, finished=None):
+    """Proceso de packing con 'orders' órdenes de 'lines' líneas cada una."""
+    return {
+        "id": process_id,
+        "name": f"Proceso de prueba {process_id}",
+        "started_at": "2024-03-01 09:00:00",
+        "finished_at": None,
+        "created_by": {"id": 7, "name": "Operario"},
+        "containers": [{"container": {"id": c, "bar_code": f"C{c:05d}"}} for c in range(20)],
+        "packing_process_orders": [sample_process_order(i, lines, finished) for i in range(orders)],
+    }
+
+def sample_process_detail(orders, lines):
+    """Respuesta de PACKING_VIEW con 'orders' órdenes de 'lines' líneas (la mitad terminadas)."""
+    process = sample_process(1, orders, lines)
+    pending = next((o for o in process["packing_process_orders"] if not o["finished_at"]), None)
+    return {
+        "success": True,
+        "data": {"process": process, "pendingProcessOrder": pending, "confirmedOrders": {}},
+    }
+
+
+def _route_pattern(route):
+    return re.compile(re.sub(r"\\\{\w+\\\}", r"(\\d+)", re.escape(route)) + "$")
+
+_VIEW_RE = _route_pattern(API_ROUTES["PACKING_VIEW"])
+_CONFIRM_RE = _route_pattern(API_ROUTES["PACKING_CONFIRM"])
+
+
+class FakePackingApi:
+    """
+    Servidor HTTP con procesos de packing en memoria.
+
+    :param orders: Órdenes de cada proceso creado con add_process().
+    :param lines: Líneas por orden.
+    :param latency: Segundos extra por petición.
+    """
+    def __init__(self, host="127.0.0.1", port=0, orders=50, lines=5, latency=0.0):
+        self.host = host
+        self.orders = orders
+        self.lines = lines
+        self.latency = latency
+        self.processes = {}
+        self.views = 0
+        self.confirms = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+    @property
+    def base_url(self):
+        """Valor para CEREBRO_API_URL / --api-url."""
+        return f"http://{self.host}:{self.port}/api/auth/scanner"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, name="FakePackingApi", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def add_process(self, process_id=None, orders=None, lines=None):
+        """Crea un proceso con todas sus órdenes pendientes. Retorna su id."""
+        with self._lock:
+            process_id = process_id or max(self.processes, default=0) + 1
+            self.processes[process_id] = sample_process(
+                process_id, self.orders if orders is None else orders,
+                self.lines if lines is None else lines, finished=False
+            )
+        return process_id
+
+    # ------------------------------------------------------------------
+    # Lógica del backend
+    # ------------------------------------------------------------------
+    def _detail(self, process_id):
+        with self._lock:
+            process = self.processes.get(process_id)
+            if process is None:
+                return 404, {"success": False, "message": "Proceso no encontrado"}
+            self.views += 1
+            orders = process["packing_process_orders"]
+            pending = next((o for o in orders if not o["finished_at"]), None)
+            confirmed = {
+                str(o["id"]): {
+                    "order_id": o["order"]["id"],
+                    "started_at": o["started_at"],
+                    "finished_at": o["finished_at"],
+                    "products": [
+                        {"name": line["product"]["name"], "quantity": line["quantity"]}
+                        for line in o["packing_process_order_product"]
+                    ],
+                }
+                for o in orders if o["finished_at"]
+            }
+            body = {"success": True, "data": {"process": process, "pendingProcessOrder": pending, "confirmedOrders": confirmed}}
+            # Se serializa con el lock: el proceso puede cambiar mientras se envía
+            return 200, json.dumps(body).encode("utf-8")
+
+    def _confirm(self, order_id, process_id, payload):
+        with self._lock:
+            process = self.processes.get(process_id)
+            order = next((o for o in (process or {}).get("packing_process_orders", []) if o["id"] == order_id), None)
+            if order is None or order["finished_at"]:
+                self.rejected += 1
+                return 422, {"success": False, "message": "Orden no encontrada o ya confirmada"}
+            required = {line["product"]["id"]: line["quantity"] for line in order["packing_process_order_product"]}
+            sent = {p.get("product_id"): p.get("quantity") for p in (payload or {}).get("completedProducts", [])}
+            if sent != required:
+                self.rejected += 1
+                return 422, {"success": False, "message": "Cantidades incompletas"}
+            now = time.strftime(DATE_FORMAT)
+            order["started_at"] = order["started_at"] or now
+            order["finished_at"] = now
+            if all(o["finished_at"] for o in process["packing_process_orders"]):
+                process["finished_at"] = now
+            self.confirms += 1
+            return 200, {"success": True, "label_url": None}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    return json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return {}
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                match = _VIEW_RE.search(self.path.split("?", 1)[0])
+                if match:
+                    self._send(*server._detail(int(match.group(1))))
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                path = self.path.split("?", 1)[0]
+                payload = self._read_json()
+                match = _CONFIRM_RE.search(path)
+                if match:
+                    self._send(*server._confirm(int(match.group(1)), int(match.group(2)), payload))
+                elif path.endswith(API_ROUTES["LOGIN"]):
+                    self._send(200, {
+                        "access_token": "fake-token",
+                        "expires_in": 3600,
+                        "user": {"id": 7, "name": "Operario", "email": payload.get("email")},
+                    })
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API falsa de packing (detalle y confirmación de órdenes).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--processes", type=int, default=1, help="Procesos a crear (ids 1..N)")
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Segundos extra por petición")
+    args = parser.parse_args()
+
+    server = FakePackingApi(args.host, args.port, args.orders, args.lines, args.latency)
+    for _ in range(args.processes):
+        server.add_process()
+    server.start()
+    print(f"API falsa en {server.base_url} con {args.processes} procesos de {args.orders} órdenes. Ctrl+C para salir.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
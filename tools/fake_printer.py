@@ -0,0 +1,119 @@
+"""
+Impresora falsa para pruebas locales del backend raw (puerto 9100).
+
+Acepta conexiones TCP, guarda cada trabajo recibido en memoria (y opcionalmente
+en disco) y permite simular una impresora lenta o caída.
+
+Uso:
+    python -m tools.fake_printer --port 9100 --out jobs/
+"""
+import os
+import socket
+import argparse
+import threading
+import time
+
+
+class FakePrinterServer:
+    """
+    Servidor TCP que imita una impresora térmica de red.
+
+    :param host: Dirección en la que escucha.
+    :param port: Puerto (0 = uno libre elegido por el sistema).
+    :param delay: Segundos que "tarda" en imprimir cada trabajo.
+    :param out_dir: Carpeta donde guardar cada trabajo recibido (opcional).
+    """
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0, out_dir=None):
+        self.host = host
+        self.delay = delay
+        self.out_dir = out_dir
+        self.jobs = []
+        self.online = True
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self.port = self._sock.getsockname()[1]
+        self._thread = None
+        self._lock = threading.Lock()
+        self._received = threading.Condition(self._lock)
+
+    @property
+    def address(self):
+        """Nombre de impresora tal como lo espera RawTcpBackend ("host:puerto")."""
+        return f"{self.host}:{self.port}"
+
+    def start(self):
+        self._sock.listen(16)
+        self._thread = threading.Thread(target=self._serve, name="FakePrinter", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.online = False
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+    def wait_for_jobs(self, count, timeout=5.0):
+        """Espera hasta haber recibido 'count' trabajos. Retorna True si se alcanzó."""
+        deadline = time.time() + timeout
+        with self._received:
+            while len(self.jobs) < count:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._received.wait(remaining)
+        return True
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn:
+            if not self.online:
+                return
+            chunks = []
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+        if self.delay:
+            time.sleep(self.delay)
+        payload = b"".join(chunks)
+        with self._received:
+            self.jobs.append(payload)
+            index = len(self.jobs)
+            self._received.notify_all()
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            with open(os.path.join(self.out_dir, f"job_{index:05d}.zpl"), "wb") as f:
+                f.write(payload)
+        print(f"[FAKE PRINTER {self.port}] Trabajo #{index} recibido ({len(payload)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Impresora falsa en TCP/9100 para pruebas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--delay", type=float, default=0.0, help="Segundos por trabajo")
+    parser.add_argument("--out", default=None, help="Carpeta donde guardar los trabajos")
+    args = parser.parse_args()
+
+    server = FakePrinterServer(args.host, args.port, args.delay, args.out).start()
+    print(f"Impresora falsa escuchando en {server.address}. Ctrl+C para salir.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Visor de las trazas del flujo escaneo -> etiqueta (traces/spans.jsonl).
+
+Sin argumentos muestra el desglose agregado: por cada tipo de span, cuántas
+veces aparece, su duración (media, p50, p95) y qué parte del tiempo total de
+los pedidos representa, y el tiempo desde que se abre el detalle de un proceso
+hasta que acepta escaneos y hasta el primer escaneo. Con --order muestra la
+línea de tiempo de un pedido.
+
+Uso:
+    python -m tools.trace_viewer                      # desglose agregado
+    python -m tools.trace_viewer --last 5             # últimas 5 trazas de pedido
+    python -m tools.trace_viewer --order 123456       # línea de tiempo del pedido
+"""
+import json
+import argparse
+import statistics
+from collections import defaultdict
+
+from services.tracing import TRACE_FILE
+
+BAR_WIDTH = 40
+
+
+def load_spans(path):
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return spans
+
+def group_traces(spans):
+    """{trace_id: [spans ordenados por inicio]}"""
+    traces = defaultdict(list)
+    for span in spans:
+        traces[span["trace_id"]].append(span)
+    for items in traces.values():
+        items.sort(key=lambda s: s["start"])
+    return traces
+
+def order_traces(traces):
+    """Trazas cuyo span raíz es un pedido, ordenadas por inicio."""
+    result = []
+    for items in traces.values():
+        root = next((s for s in items if s["name"] == "order" and not s["parent_id"]), None)
+        if root:
+            result.append((root, items))
+    result.sort(key=lambda pair: pair[0]["start"])
+    return result
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[max(0, int(round(len(values) * pct)) - 1)]
+
+
+def print_timeline(root, spans):
+    """Árbol de spans con su desplazamiento desde el inicio del pedido y una barra."""
+    children = defaultdict(list)
+    for span in spans:
+        if span is not root:
+            children[span["parent_id"]].append(span)
+    total = max(root["duration_ms"], 1.0)
+    scale = BAR_WIDTH / total
+    attrs = root["attributes"]
+    print(f"Pedido {attrs.get('order_id')} (proceso {attrs.get('process_id')}) "
+          f"{total / 1000:.2f} s{'  [abandonado]' if attrs.get('abandoned') else ''}")
+
+    def walk(span, depth):
+        offset = (span["start"] - root["start"]) * 1000.0
+        bar_start = min(int(offset * scale), BAR_WIDTH - 1)
+        bar_len = max(1, min(int(span["duration_ms"] * scale), BAR_WIDTH - bar_start))
+        bar = " " * bar_start + "#" * bar_len
+        status = " ERROR" if span["status"] != "ok" else ""
+        name = "  " * depth + span["name"]
+        print(f"  {name:<32} +{offset:9.1f} ms {span['duration_ms']:9.1f} ms |{bar:<{BAR_WIDTH}}|{status}")
+        for child in sorted(children.get(span["span_id"], []), key=lambda s: s["start"]):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+
+def print_breakdown(orders):
+    """Desglose agregado por nombre de span sobre todas las trazas de pedido."""
+    durations = defaultdict(list)
+    order_total = 0.0
+    for root, spans in orders:
+        if root["attributes"].get("abandoned"):
+            continue
+        order_total += root["duration_ms"]
+        for span in spans:
+            durations[span["name"]].append(span["duration_ms"])
+
+    completed = len(durations.get("order", []))
+    print(f"{completed} pedidos confirmados, {order_total / 1000:.1f} s en total")
+    print(f"{'span':<24} {'n':>6} {'media ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'% pedido':>9}")
+    for name, values in sorted(durations.items(), key=lambda kv: -sum(kv[1])):
+        share = sum(values) / order_total * 100 if order_total else 0.0
+        print(f"{name:<24} {len(values):>6} {statistics.mean(values):>10.1f} "
+              f"{statistics.median(values):>10.1f} {percentile(values, 0.95):>10.1f} {share:>8.1f}%")
+
+
+def print_time_to_scan(spans):
+    """Tiempo hasta poder escanear / hasta el primer escaneo al abrir el detalle de un proceso."""
+    labels = {"show_view.scan_ready": "lista para escanear", "show_view.first_scan": "primer escaneo"}
+    print(f"{'apertura del detalle':<24} {'n':>6} {'media ms':>10} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, label in labels.items():
+        values = [s["duration_ms"] for s in spans if s["name"] == name]
+        if values:
+            print(f"{label:<24} {len(values):>6} {statistics.mean(values):>10.1f} "
+                  f"{statistics.median(values):>10.1f} {percentile(values, 0.95):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", default=TRACE_FILE, help="Archivo JSONL de trazas")
+    parser.add_argument("--order", help="Muestra la línea de tiempo de este pedido")
+    parser.add_argument("--last", type=int, help="Muestra la línea de tiempo de las últimas N trazas")
+    args = parser.parse_args()
+
+    try:
+        spans = load_spans(args.file)
+    except FileNotFoundError:
+        print(f"No existe el archivo de trazas '{args.file}'.")
+        return
+    orders = order_traces(group_traces(spans))
+    if not args.order and not args.last and any(s["name"].startswith("show_view.") for s in spans):
+        print_time_to_scan(spans)
+        print()
+    if not orders:
+        print("No hay trazas de pedidos.")
+        return
+
+    if args.order:
+        selected = [pair for pair in orders if str(pair[0]["attributes"].get("order_id")) == args.order]
+        if not selected:
+            print(f"No hay trazas del pedido {args.order}.")
+        for root, items in selected:
+            print_timeline(root, items)
+            print()
+    elif args.last:
+        for root, items in orders[-args.last:]:
+            print_timeline(root, items)
+            print()
+    else:
+        print_breakdown(orders)
+
+
+if __name__ == "__main__":
+    main()
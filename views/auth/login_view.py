@@ -1,15 +1,22 @@
 import os
 import sys 
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 
 from controllers.auth.login_controller import LoginController
-from views.warehouse.packing.list_view import PackingListView
 from assets.css.styles import (
     PRIMARY_COLOR, LABEL_STYLE, BUTTON_STYLE, CHECKBOX_STYLE,
     INPUT_WIDTH, INPUT_BG_COLOR, INPUT_FG_COLOR, LOGO_SIZE
 )
+from services.logger import get_logger, fields
+
+logger = get_logger(__name__)
+
+# Cada cuánto se mira (en el hilo de Tk) si alguna petición avisó de que la sesión expiró
+TOKEN_EXPIRED_POLL_MS = 250
+
 def obtener_ruta_relativa(ruta_archivo):
     """ Retorna la ruta correcta para PyInstaller """
     if getattr(sys, 'frozen', False):  # Si está empaquetado como .exe
@@ -23,10 +30,18 @@ class LoginView(tk.Frame):
         super().__init__(master, bg=PRIMARY_COLOR)
         self.master = master
 
-        # Controlador con callback (SOLO para login manual)
+        # ApiClient avisa de la sesión expirada desde el hilo de la petición; el
+        # aviso se marca aquí y _poll_token_expired lo muestra en el hilo de Tk
+        self._token_expired = threading.Event()
+        self._token_poll_id = self.after(TOKEN_EXPIRED_POLL_MS, self._poll_token_expired)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+        # Controlador con callback (SOLO para login manual). El autologin se hace
+        # en segundo plano cuando la ventana ya está visible (ver _start_auto_login)
         self.controller = LoginController(
             on_token_expired_callback=self.on_token_expired,
-            on_login_success_callback=self._login_success_callback
+            on_login_success_callback=self._login_success_callback,
+            auto_login=False
         )
         
         self.pack(expand=True, fill="both")
@@ -37,20 +52,34 @@ class LoginView(tk.Frame):
         self.logo_image = self._load_image(obtener_ruta_relativa("assets/img/favicon.png"))
         self.create_widgets()
 
-        # Si el autologin tuvo éxito en el constructor,
-        # self.controller.user_data no será None
-        if self.controller.get_logged_user() is not None:
-            # Diferimos para que Tkinter termine de cargar la vista de login
+        # Con un token guardado aún vigente se entra directamente (sin petición de login);
+        # si caducó pero hay credenciales guardadas, se inicia sesión sin bloquear la ventana
+        if self.controller.restore_session():
             self.after(0, lambda: self._login_success_callback(self.controller.get_logged_user()))
-            
-    def _load_image(self, path):
-            try:
-                img = Image.open(path)
-                img = img.resize(LOGO_SIZE, Image.LANCZOS)
-                return ImageTk.PhotoImage(img)
-            except Exception as e:
-                print(f"Error cargando la imagen {path}: {e}")
-                return None
+        elif self.controller.has_saved_credentials():
+            self._start_auto_login()
+
+    def _start_auto_login(self):
+        self.login_button.config(state="disabled")
+        self.lbl_status.config(text="Iniciando sesión...")
+        results = queue.Queue()
+        threading.Thread(
+            target=lambda: results.put(self.controller.auto_login()), name="AutoLogin", daemon=True
+        ).start()
+        self._poll_auto_login(results)
+
+    def _poll_auto_login(self, results):
+        if not self.winfo_exists():
+            return
+        try:
+            success = results.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_auto_login, results)
+            return
+        self.login_button.config(state="normal")
+        self.lbl_status.config(text="")
+        if success:
+            self._login_success_callback(self.controller.get_logged_user())
 
     def create_widgets(self):
         self.logo_label = tk.Label(self.container, image=self.logo_image, bg=PRIMARY_COLOR)
@@ -88,11 +117,14 @@ class LoginView(tk.Frame):
         )
         self.login_button.pack(pady=20)
 
+        self.lbl_status = tk.Label(self.container, text="", **LABEL_STYLE)
+        self.lbl_status.pack()
+
     def handle_login(self):
         email = self.entry_user.get()
         password = self.entry_password.get()
 
-        print("DEBUG: handle_login invocado con:", email, password)
+        logger.debug("handle_login invocado", extra=fields(email=email))
         success = self.controller.do_login(email, password, save_credentials=self.save_credentials_var.get())
 
         if not success:
@@ -106,7 +138,7 @@ class LoginView(tk.Frame):
         El controlador llama a esta función cuando el login es exitoso (manual).
         O si detectamos user_data != None, la llamamos con 'after(0, ...)' para autologin.
         """
-        print("DEBUG: _login_success_callback con user_data =", user_data)
+        logger.debug("_login_success_callback", extra=fields(user_data=user_data))
         self.go_to_warehouse(user_data)
 
     def go_to_warehouse(self, user_data):
@@ -129,8 +161,23 @@ class LoginView(tk.Frame):
             on_logout=create_login
         )
     def on_token_expired(self):
-        print("El token expiró, vuelve a iniciar sesión.")
-        messagebox.showwarning("Sesión expirada", "Tu sesión expiró, vuelve a iniciar sesión.")
+        # Puede llegar desde cualquier hilo (PaginatedSource, WaitingProcessesFeed...):
+        # no se toca Tk aquí. Varios 401 seguidos se quedan en un solo aviso
+        self._token_expired.set()
+
+    def _poll_token_expired(self):
+        if self._token_expired.is_set():
+            self._token_expired.clear()
+            logger.info("El token expiró, vuelve a iniciar sesión.")
+            messagebox.showwarning("Sesión expirada", "Tu sesión expiró, vuelve a iniciar sesión.")
+        self._token_poll_id = self.after(TOKEN_EXPIRED_POLL_MS, self._poll_token_expired)
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self._token_poll_id is not None:
+            self.after_cancel(self._token_poll_id)
+            self._token_poll_id = None
 
     def _load_image(self, path):
         try:
@@ -139,5 +186,5 @@ class LoginView(tk.Frame):
             img = img.resize(LOGO_SIZE, Image.LANCZOS)
             return ImageTk.PhotoImage(img)
         except Exception as e:
-            print(f"Error cargando la imagen {path}: {e}")
+            logger.error(f"Error cargando la imagen {path}: {e}")
             return None
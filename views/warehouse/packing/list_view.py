@@ -1,21 +1,32 @@
+import queue
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 import subprocess
-import os
 import tempfile
+import functools
+from urllib.parse import urlencode
 import requests
 import traceback
-import win32print
-import win32api
 import socket
-import json  # Import necesario para usar JSON
 
 from assets.css.styles import PRIMARY_COLOR, BACKGROUND_COLOR_VIEWS, LABEL_STYLE, BUTTON_STYLE
 from config.settings import API_BASE_URL
 from services.api_routes import API_ROUTES
 from components.header import Header
 from components.barcode_widget import create_barcode_widget
+from components.print_status import PrintStatusLabel
+from components.virtual_tree import VirtualTreeview
+from components.view_router import ViewRouter
+from components.print_component import get_printer_inventory, print_document, load_printer_settings
+from services.printer_router import LABEL_PROCESS, LABEL_ORDER
+from services.settings_store import get_printer_settings, PRINTER_CONFIG_FILE
+from services.paginated_source import PaginatedSource
+from services.search_index import SearchIndex
+from services.waiting_feed import WaitingProcessesFeed
+from services.logger import get_logger, fields
+
+logger = get_logger(__name__)
 
 CENTERED_LABEL_STYLE = {
     "bg": "white",
@@ -24,57 +35,76 @@ CENTERED_LABEL_STYLE = {
     "justify": "center"
 }
 
-# Puedes cambiar esta ruta a donde quieras guardar tu JSON
-JSON_CONFIG_FILE = "printer_config.json"
-
-def log_message(message):
-    """Logs debug messages a 'print_debug.log' y lo muestra en consola."""
-    try:
-        with open("print_debug.log", "a", encoding="utf-8") as f:
-            f.write(message + "\n")
-    except Exception as log_ex:
-        print("Error writing to log:", log_ex)
-    print(message)
+def process_row_values(process):
+    """Columnas de la tabla de procesos para un proceso de packing."""
+    finished_at = process.get("finished_at", "")
+    return (
+        process.get("id", ""),
+        process.get("name", ""),
+        process.get("started_at", ""),
+        finished_at,
+        "Proceso Finalizado" if finished_at else "Packing - En Proceso",
+        (process.get("created_by") or {}).get("name", ""),
+        "Ver Proceso",
+    )
+
+def process_search_fields(process):
+    """Textos por los que se puede buscar un proceso: nombre, id, usuario y cestas."""
+    yield process.get("name")
+    yield process.get("id")
+    yield (process.get("created_by") or {}).get("name")
+    for c in process.get("containers") or []:
+        yield (c.get("container") or {}).get("bar_code")
 
 def load_printer_config():
     """
-    Carga la impresora seleccionada desde un archivo JSON.
+    Retorna la impresora seleccionada de la configuración en memoria.
     Estructura esperada del JSON:
     {
         "selected_printer": "Nombre de la impresora"
     }
     """
-    if not os.path.exists(JSON_CONFIG_FILE):
-        log_message("No existe archivo de configuración JSON. Se usará la impresora por defecto.")
-        return None
-    
-    try:
-        with open(JSON_CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            printer_name = data.get("selected_printer", None)
-            log_message(f"Impresora cargada desde JSON: {printer_name}")
-            return printer_name
-    except Exception as e:
-        log_message("No se pudo cargar la impresora desde JSON: " + str(e))
-        return None
-
-def save_printer_config(printer_name):
+    printer_name = get_printer_settings().get("selected_printer")
+    if printer_name is None:
+        logger.info("No hay impresora en la configuración. Se usará la impresora por defecto.")
+    else:
+        logger.info(f"Impresora cargada desde JSON: {printer_name}")
+    return printer_name
+
+def save_printer_config(printer_name, pools=None, rules=None):
     """
-    Guarda la impresora seleccionada en un archivo JSON.
+    Guarda la impresora seleccionada en la configuración (escritura atómica).
+    Si se indican, también guarda los pools de impresoras y las reglas de enrutado.
+    Se conservan el resto de claves (backend, raw_printers, ...).
     Estructura que se guarda:
     {
-        "selected_printer": "Nombre de la impresora"
+        "selected_printer": "Nombre de la impresora",
+        "printer_pools": {...},
+        "routing_rules": [...],
+        ...
     }
     """
-    data = {
-        "selected_printer": printer_name
-    }
+    changes = {"selected_printer": printer_name}
+    if pools is not None:
+        changes["printer_pools"] = pools
+    if rules is not None:
+        changes["routing_rules"] = rules
     try:
-        with open(JSON_CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        log_message(f"Impresora '{printer_name}' guardada en {JSON_CONFIG_FILE}")
-    except Exception as e:
-        log_message("Error al guardar la impresora en JSON: " + str(e))
+        get_printer_settings().update(changes)
+        logger.info(f"Impresora '{printer_name}' guardada en {PRINTER_CONFIG_FILE}")
+    except Exception:
+        logger.exception("Error al guardar la impresora en JSON")
+
+def save_printer_pools(pools, rules):
+    """
+    Guarda solo los pools de impresoras y las reglas de enrutado; la impresora
+    seleccionada se queda como estaba guardada (no la del combo sin guardar).
+    """
+    try:
+        get_printer_settings().update({"printer_pools": pools, "routing_rules": rules})
+        logger.info(f"Pools de impresoras guardados en {PRINTER_CONFIG_FILE}")
+    except Exception:
+        logger.exception("Error al guardar los pools de impresoras en JSON")
 
 class PackingListView(tk.Frame):
     def __init__(self, master=None, user_data=None, login_controller=None, on_logout=None):
@@ -83,11 +113,35 @@ class PackingListView(tk.Frame):
         self.user_data = user_data or {}
         self.login_controller = login_controller
         self.on_logout = on_logout
+        # La lista se mantiene viva (oculta) mientras se muestra el detalle de un proceso
+        self.router = ViewRouter(master, self)
 
         # Se carga la impresora guardada desde JSON o, si no existe, la default del sistema
+        # (la default llega con el inventario de impresoras, que se enumera en segundo plano)
         loaded_printer = load_printer_config()
-        self.selected_printer = loaded_printer or win32print.GetDefaultPrinter()
-        log_message("Impresora inicial: " + self.selected_printer)
+        self.printer_inventory = get_printer_inventory()
+        self.selected_printer = loaded_printer or self.printer_inventory.get()[1]
+        self._printer_events = queue.Queue()
+        # Procesos de packing paginados en el servidor (se cargan por páginas al desplazarse)
+        self.process_source = PaginatedSource(self._fetch_processes_page, key=lambda process: process.get("id"))
+        self._process_poll_id = None
+        self._keep_table_position = False
+        # Búsqueda: índice local sobre lo cargado y, si aún faltan páginas, consulta al servidor
+        self.search_query = ""
+        self.search_index = SearchIndex(process_search_fields, key=lambda process: process.get("id"))
+        self._indexed_rows = None
+        self._indexed_count = 0
+        self.search_source = None
+        self._search_after_id = None
+        self._server_search_after_id = None
+        # Panel de procesos en espera: se actualiza solo (push o sondeo) y se parchea por id
+        self.waiting_feed = WaitingProcessesFeed(self.login_controller.api_client)
+        self.waiting_data = []
+        self._waiting_items = {}   # id -> (proceso, item_frame, separador)
+        self._waiting_order = []
+        self._waiting_empty_label = None
+        self._waiting_poll_id = None
+        logger.info("Impresora inicial: " + str(self.selected_printer))
 
         self.pack(expand=True, fill="both")
         
@@ -116,6 +170,8 @@ class PackingListView(tk.Frame):
         
         self.create_widgets()
         self.fetch_and_populate()
+        self.waiting_feed.start()
+        self._poll_waiting_feed()
 
     def create_widgets(self):
         # Header
@@ -131,6 +187,16 @@ class PackingListView(tk.Frame):
         )
         title_lbl.pack(side="left", padx=5)
 
+        from components.print_component import get_print_spooler  # Importamos aquí para evitar circular imports
+        self.print_status = PrintStatusLabel(
+            header_frame,
+            spooler=get_print_spooler(),
+            font=("Arial", 10),
+            bg=PRIMARY_COLOR,
+            fg="white"
+        )
+        self.print_status.pack(side="left", padx=15)
+
         my_header = Header(
             master=header_frame,
             controller=self.login_controller,
@@ -154,6 +220,8 @@ class PackingListView(tk.Frame):
         self.search_entry.config(fg="gray")
         self.search_entry.bind("<FocusIn>", lambda event: self._clear_placeholder(event, placeholder))
         self.search_entry.bind("<FocusOut>", lambda event: self._add_placeholder(event, placeholder))
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)
+        self.search_entry.bind("<Return>", lambda event: self.search())
 
         search_btn = tk.Button(
             search_frame,
@@ -187,6 +255,22 @@ class PackingListView(tk.Frame):
         )
         save_config_btn.pack(side="left", padx=5)
 
+        pools_btn = tk.Button(
+            printer_frame,
+            text="Pools de Impresoras",
+            command=self.open_printer_pools_dialog,
+            **BUTTON_STYLE
+        )
+        pools_btn.pack(side="left", padx=5)
+
+        refresh_printers_btn = tk.Button(
+            printer_frame,
+            text="Actualizar",
+            command=self.refresh_printer_list,
+            **BUTTON_STYLE
+        )
+        refresh_printers_btn.pack(side="left", padx=5)
+
         # ----- Área principal -----
         main_frame = tk.Frame(self, bg=BACKGROUND_COLOR_VIEWS)
         main_frame.pack(expand=True, fill="both", padx=10, pady=10)
@@ -201,9 +285,49 @@ class PackingListView(tk.Frame):
         self.create_waiting_panel(right_frame)
 
     def populate_printer_list(self):
-        """Lista las impresoras instaladas y establece la selección."""
-        printer_list, default_printer = self.listar_impresoras()
+        """
+        Llena el combobox con el inventario de impresoras en caché y se suscribe
+        a sus cambios: la enumeración real ocurre en segundo plano y el combobox
+        se actualiza cuando termina, sin bloquear la vista.
+        """
+        self.printer_inventory.subscribe(self._on_printer_inventory_changed)
+        self.bind("<Destroy>", self._on_destroy_printer_list, add="+")
+        if self.printer_inventory.is_loaded():
+            self.apply_printer_list(*self.listar_impresoras())
+        elif self.selected_printer:
+            # Mientras se enumera, se muestra al menos la impresora guardada
+            self.printer_combobox['values'] = [self.selected_printer]
+            self.printer_combobox.current(0)
+        self._printer_poll_id = self.after(200, self._poll_printer_inventory)
+
+    def refresh_printer_list(self):
+        """Vuelve a enumerar las impresoras en segundo plano."""
+        logger.info("Actualizando lista de impresoras...")
+        self.printer_inventory.refresh_async()
+
+    def _on_printer_inventory_changed(self, printer_list, default_printer):
+        # Hilo del inventario: no se toca Tk aquí
+        self._printer_events.put((printer_list, default_printer))
+
+    def _poll_printer_inventory(self):
+        latest = None
+        while True:
+            try:
+                latest = self._printer_events.get_nowait()
+            except queue.Empty:
+                break
+        if latest is not None:
+            self.apply_printer_list(*latest)
+        self._printer_poll_id = self.after(200, self._poll_printer_inventory)
+
+    def _on_destroy_printer_list(self, event):
+        if event.widget is not self:
+            return
+        self.printer_inventory.unsubscribe(self._on_printer_inventory_changed)
+        self.after_cancel(self._printer_poll_id)
 
+    def apply_printer_list(self, printer_list, default_printer):
+        """Establece las impresoras del combobox y la selección actual."""
         # Si la impresora cargada no está en la lista, usar la default
         if self.selected_printer not in printer_list:
             self.selected_printer = default_printer
@@ -215,15 +339,17 @@ class PackingListView(tk.Frame):
             index = printer_list.index(self.selected_printer)
         except ValueError:
             index = 0
-        self.printer_combobox.current(index)
+        if printer_list:
+            self.printer_combobox.current(index)
 
-        log_message("Impresoras disponibles: " + str(printer_list))
-        log_message("Impresora actualmente seleccionada: " + self.selected_printer)
+        logger.info("Impresoras disponibles", extra=fields(
+            count=len(printer_list), printers=printer_list, selected=self.selected_printer
+        ))
 
     def on_printer_selected(self, event):
         selected = self.printer_combobox.get()
         self.selected_printer = selected
-        log_message(f"Impresora seleccionada (combo): {selected}")
+        logger.info(f"Impresora seleccionada (combo): {selected}")
 
     def save_printer_settings(self):
         """
@@ -233,6 +359,68 @@ class PackingListView(tk.Frame):
         save_printer_config(self.selected_printer)
         messagebox.showinfo("Configuración", f"La impresora '{self.selected_printer}' se ha guardado correctamente.")
 
+    def open_printer_pools_dialog(self):
+        """
+        Ventana para repartir las etiquetas entre varias impresoras:
+        un pool para las etiquetas de proceso y otro para las de pedido.
+        El spooler balancea entre las impresoras de cada pool y hace failover
+        si alguna deja de responder. Las reglas por método de envío se
+        conservan tal como estén en el JSON.
+        """
+        settings = load_printer_settings()
+        pools = settings.get("printer_pools", {})
+        printers = list(self.printer_combobox["values"])
+
+        top = tk.Toplevel(self)
+        top.title("Pools de Impresoras")
+        top.configure(bg=BACKGROUND_COLOR_VIEWS)
+        top.transient(self.master)
+        top.grab_set()
+
+        listboxes = {}
+        for col, (label_type, title) in enumerate([
+            (LABEL_PROCESS, "Etiquetas de proceso"),
+            (LABEL_ORDER, "Etiquetas de pedido"),
+        ]):
+            frame = tk.Frame(top, bg=BACKGROUND_COLOR_VIEWS)
+            frame.grid(row=0, column=col, padx=10, pady=10, sticky="nsew")
+            tk.Label(frame, text=title, font=("Arial", 12, "bold"), bg=BACKGROUND_COLOR_VIEWS).pack(pady=5)
+            listbox = tk.Listbox(frame, selectmode="multiple", exportselection=False, height=8, width=30)
+            listbox.pack(fill="both", expand=True)
+            for idx, printer in enumerate(printers):
+                listbox.insert(tk.END, printer)
+                if printer in pools.get(label_type, []):
+                    listbox.selection_set(idx)
+            listboxes[label_type] = listbox
+
+        tk.Label(
+            top,
+            text="Sin selección se usa la impresora por defecto.",
+            font=("Arial", 10),
+            bg=BACKGROUND_COLOR_VIEWS
+        ).grid(row=1, column=0, columnspan=2, pady=5)
+
+        def save():
+            new_pools = dict(pools)
+            # Se conservan las reglas que no son las de tipo de etiqueta gestionadas aquí
+            rules = [
+                rule for rule in settings.get("routing_rules", [])
+                if not (set(rule) == {"label_type", "pool"} and rule["pool"] == rule["label_type"])
+            ]
+            for label_type, listbox in listboxes.items():
+                selected = [listbox.get(i) for i in listbox.curselection()]
+                if selected:
+                    new_pools[label_type] = selected
+                    rules.append({"label_type": label_type, "pool": label_type})
+                else:
+                    new_pools.pop(label_type, None)
+            save_printer_pools(new_pools, rules)
+            logger.info(f"Pools de impresoras guardados: {new_pools}")
+            top.destroy()
+            messagebox.showinfo("Configuración", "Pools de impresoras guardados correctamente.")
+
+        tk.Button(top, text="Guardar", command=save, **BUTTON_STYLE).grid(row=2, column=0, columnspan=2, pady=10)
+
     def _clear_placeholder(self, event, placeholder):
         """Elimina el placeholder cuando el Entry recibe el foco."""
         if self.search_entry.get() == placeholder:
@@ -253,24 +441,17 @@ class PackingListView(tk.Frame):
                 temp_file.write("Si aparece, significa que se imprimió correctamente.\n")
                 temp_file_path = temp_file.name
 
-            log_message(f"Archivo de prueba creado en: {temp_file_path}")
+            logger.info(f"Archivo de prueba creado en: {temp_file_path}")
             self.print_document(temp_file_path)
         except Exception as e:
-            log_message("Error en la impresión de prueba: " + str(e))
+            logger.exception("Error en la impresión de prueba")
             messagebox.showerror("Error", f"Error en la impresión de prueba: {str(e)}")
 
     def listar_impresoras(self):
-        try:
-            flags = win32print.PRINTER_ENUM_LOCAL | win32print.PRINTER_ENUM_CONNECTIONS
-            printers = win32print.EnumPrinters(flags)
-            printer_list = [printer[2] for printer in printers]
-            default_printer = win32print.GetDefaultPrinter()
-            log_message("Impresoras enumeradas: " + str(printer_list))
-            log_message("Impresora por defecto: " + str(default_printer))
-            return printer_list, default_printer
-        except Exception as e:
-            log_message("Error listando impresoras: " + str(e))
-            return [], None
+        """Retorna (impresoras, impresora por defecto) del inventario en caché."""
+        printer_list, default_printer = self.printer_inventory.get()
+        logger.debug("Impresoras enumeradas", extra=fields(printers=printer_list, default=default_printer))
+        return printer_list, default_printer
 
     def create_table(self, parent):
         """
@@ -278,23 +459,26 @@ class PackingListView(tk.Frame):
         """
         columns = ("#", "Nombre", "Fecha Inicio", "Fecha Fin", "Estado", "Usuario", "Acciones")
 
-        # Frame to hold the Treeview + scrollbar
-        table_frame = tk.Frame(parent, bg="white")
-        table_frame.pack(expand=True, fill="both", padx=5, pady=5)
-
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings", style="Treeview")
+        self.lbl_process_count = tk.Label(parent, text="Cargando procesos...", bg="white", font=("Arial", 10), anchor="w")
+        self.lbl_process_count.pack(fill="x", padx=5, pady=(5, 0))
+
+        # Tabla virtualizada: solo se crean las filas visibles y, al acercarse
+        # al final de lo cargado, se pide la siguiente página al servidor
+        self.process_table = VirtualTreeview(
+            parent,
+            columns=columns,
+            row_values=process_row_values,
+            on_near_end=self._load_more_processes,
+            key=lambda process: process.get("id")
+        )
+        self.process_table.pack(expand=True, fill="both", padx=5, pady=5)
+        self.tree = self.process_table.tree
         for col in columns:
             self.tree.heading(col, text=col.capitalize())
             self.tree.column(col, anchor="center", width=120)
 
-        # Vertical scrollbar
-        tree_scroll_y = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scroll_y.set)
-        tree_scroll_y.pack(side="right", fill="y")
-
-        self.tree.pack(side="left", expand=True, fill="both")
-
         self.tree.bind("<Double-1>", self.on_row_double_click)
+        self.bind("<Destroy>", self._on_destroy_process_table, add="+")
 
     def create_waiting_panel(self, parent):
         title = tk.Label(
@@ -339,102 +523,218 @@ class PackingListView(tk.Frame):
             "<Configure>",
             lambda e: self.waiting_canvas.configure(scrollregion=self.waiting_canvas.bbox("all"))
         )
+        self.bind("<Destroy>", self._on_destroy_waiting_panel, add="+")
 
     def fetch_and_populate(self):
-        log_message("Solicitando procesos de packing...")
-        response = self.login_controller.api_client._make_get_request(API_ROUTES["PACKING_LIST"])
-        #log_message("Respuesta de packing: " + str(response))
-
+        logger.info("Solicitando procesos de packing...")
+        # Un refresco conserva selección y desplazamiento; una búsqueda nueva vuelve arriba.
+        # Se vuelven a pedir todas las páginas cargadas, no solo la primera (ver PaginatedSource.refresh)
+        self._keep_table_position = True
+        self.process_source.refresh(self._fetch_processes_page)
+        self._schedule_process_poll()
+        self.waiting_feed.refresh()
+
+    def _fetch_processes_page(self, page, query=None, cancelled=None):
+        """
+        Pide una página del listado de procesos (hilo de la fuente paginada).
+        Retorna el paginador de Laravel de 'packing_processes'.
+        Con 'cancelled' activado (búsqueda sustituida) retorna None sin
+        descargar ni decodificar la respuesta.
+        """
+        if cancelled is not None and cancelled.is_set():
+            return None
+        params = {"page": page}
+        if query:
+            params["q"] = query
+        url = f"{API_ROUTES['PACKING_LIST']}?{urlencode(params)}"
+        response = self.login_controller.api_client._make_get_request(url, cancelled=cancelled)
+        if cancelled is not None and cancelled.is_set():
+            return None
         if response is None or not isinstance(response, dict) or not response.get("success"):
-            messagebox.showerror("Error", "No se pudo obtener el listado de procesos.")
-            return
-
-        data = response.get("data", {})
-        packing_obj = data.get("packing_processes", {})
-        processes = packing_obj.get("data", [])
-        #log_message("Procesos de packing obtenidos: " + str(processes))
-
-        # Clear current table rows
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        # Insert updated rows
-        for process in processes:
-            pid = process.get("id", "")
-            name = process.get("name", "")
-            started_at = process.get("started_at", "")
-            finished_at = process.get("finished_at", "")
-            status = "Proceso Finalizado" if finished_at else "Packing - En Proceso"
-            user = process.get("created_by", {}).get("name", "")
-            actions = "Ver Proceso"
-            self.tree.insert("", "end", values=(pid, name, started_at, finished_at, status, user, actions))
-
-        self.populate_waiting_panel()
-
-    def populate_waiting_panel(self):
-        # Clear existing items
-        for widget in self.waiting_frame.winfo_children():
-            widget.destroy()
+            raise RuntimeError("No se pudo obtener el listado de procesos.")
+        packing_obj = response.get("data", {}).get("packing_processes", {})
+        logger.debug("Página de procesos de packing obtenida", extra=fields(page=page, query=query, payload=packing_obj))
+        return packing_obj
+
+    def _load_more_processes(self):
+        source = self.search_source if self.search_query and self.search_source else self.process_source
+        if source.load_more():
+            self._schedule_process_poll()
+
+    def _schedule_process_poll(self):
+        if self._process_poll_id is None:
+            self._process_poll_id = self.after(100, self._poll_process_source)
+
+    def _poll_process_source(self):
+        """Aplica en la tabla las páginas recibidas; sigue consultando mientras haya una en curso."""
+        self._process_poll_id = None
+        source = self.process_source
+        changed = source.drain()
+        if changed:
+            self._update_search_index()
+            if source.error is not None and not source.rows:
+                self.lbl_process_count.config(text="Error al cargar los procesos.")
+                messagebox.showerror("Error", "No se pudo obtener el listado de procesos.")
+        if self.search_source is not None and self.search_source.drain():
+            changed = True
+        if changed:
+            self._refresh_process_table()
+        if source.loading or (self.search_source is not None and self.search_source.loading):
+            self._schedule_process_poll()
+
+    def _update_search_index(self):
+        """Indexa las filas nuevas de la fuente (o reindexa todo si se reinició)."""
+        rows = self.process_source.rows
+        if rows is not self._indexed_rows:
+            self.search_index.clear()
+            self._indexed_rows = rows
+            self._indexed_count = 0
+        self.search_index.add_many(rows[self._indexed_count:])
+        self._indexed_count = len(rows)
+
+    def _refresh_process_table(self):
+        """Muestra todo lo cargado o, si hay búsqueda, los resultados locales + los del servidor."""
+        source = self.process_source
+        if not self.search_query:
+            rows = source.rows
+            count_text = f"Procesos: {len(source.rows)} de {source.total}"
+        else:
+            rows = self.search_index.search(self.search_query)
+            if self.search_source is not None and self.search_source.rows:
+                seen = {process.get("id") for process in rows}
+                rows += [p for p in self.search_source.rows if p.get("id") not in seen]
+            count_text = f"Resultados: {len(rows)}"
+            if self.search_source is not None and self.search_source.loading:
+                count_text += " (buscando en el servidor...)"
+        if self.process_table.rows is not rows:
+            self.process_table.set_rows(rows, keep_position=self._keep_table_position)
+        else:
+            self.process_table.refresh()
+        self.lbl_process_count.config(text=count_text)
 
-        #log_message("Solicitando procesos de picking en espera...")
-        waiting_response = self.login_controller.api_client._make_get_request(API_ROUTES["PACKING_LIST"])
-        #log_message("Respuesta de picking en espera: " + str(waiting_response))
-
-        waiting_data = []
-        if waiting_response and isinstance(waiting_response, dict):
-            data = waiting_response.get("data", {})
-            waiting_data = data.get("picking_processes", [])
-        self.waiting_data = waiting_data
-
-        if not waiting_data:
-            log_message("No se han encontrado procesos de picking en espera.")
-            no_content_label = tk.Label(
-                self.waiting_frame, 
-                text="No hay procesos de picking en espera.",
-                bg="white", 
-                font=("Arial", 10), 
-                anchor="center", 
-                justify="center"
-            )
-            no_content_label.pack(pady=10)
+    def _on_destroy_process_table(self, event):
+        if event.widget is not self:
             return
-        else:
-            log_message("Procesos de picking en espera obtenidos: " + str(waiting_data))
-
-        # Populate the waiting items
-        for process in waiting_data:
-            item_frame = tk.Frame(self.waiting_frame, bg="white", bd=1, relief="solid")
-            item_frame.pack(fill="x", pady=5, padx=(30, 10))
-
-            name_lbl = tk.Label(item_frame, text=f"Nombre: {process.get('name', '')}",
-                                **CENTERED_LABEL_STYLE)
-            name_lbl.pack(anchor="center", padx=5, pady=2)
-
-            codes = ", ".join([
-                c.get("container", {}).get("bar_code", "") for c in process.get("containers", [])
-            ])
-            codes_lbl = tk.Label(item_frame, text=f"Código de cesta: {codes}",
-                                **CENTERED_LABEL_STYLE)
-            codes_lbl.pack(anchor="center", padx=5, pady=2)
-
-            # Si hay contenedores, tomamos el primero para generar el barcode
-            if process.get("containers"):
-                first_barcode = process.get("containers")[0].get("container", {}).get("bar_code", "")
-                if first_barcode:
-                    barcode_w = create_barcode_widget(item_frame, first_barcode)
-                    barcode_w.pack(anchor="center", padx=5, pady=5)
-
-            btn_start = tk.Button(
-                item_frame, 
-                text="Iniciar Packing",
-                command=lambda p=process: self.start_packing(p),
-                **BUTTON_STYLE
-            )
-            btn_start.pack(anchor="center", padx=5, pady=5)
-
-            # Agregar una línea separadora
-            separator = tk.Frame(self.waiting_frame, height=2, bg="white")
-            separator.pack(fill="x", padx=20, pady=10)
+        for attr in ("_process_poll_id", "_search_after_id", "_server_search_after_id"):
+            after_id = getattr(self, attr)
+            if after_id is not None:
+                self.after_cancel(after_id)
+                setattr(self, attr, None)
+
+    def _poll_waiting_feed(self):
+        """Aplica en el panel los cambios recibidos por el feed de procesos en espera."""
+        self._waiting_poll_id = None
+        events = self.waiting_feed.drain()
+        if events:
+            self.apply_waiting_events(events)
+        self._waiting_poll_id = self.after(250, self._poll_waiting_feed)
+
+    def _on_destroy_waiting_panel(self, event):
+        if event.widget is not self:
+            return
+        self.waiting_feed.stop()
+        if self._waiting_poll_id is not None:
+            self.after_cancel(self._waiting_poll_id)
+            self._waiting_poll_id = None
+
+    def apply_waiting_events(self, events):
+        """Actualiza self.waiting_data con los eventos del feed y parchea el panel."""
+        for kind, payload in events:
+            if kind == "snapshot":
+                self.waiting_data = list(payload)
+            elif kind == "upsert":
+                process_id = payload.get("id")
+                for i, process in enumerate(self.waiting_data):
+                    if process.get("id") == process_id:
+                        self.waiting_data[i] = payload
+                        break
+                else:
+                    self.waiting_data.append(payload)
+            elif kind == "remove":
+                self.waiting_data = [p for p in self.waiting_data if p.get("id") != payload]
+        logger.info("Procesos de picking en espera actualizados", extra=fields(count=len(self.waiting_data)))
+        logger.debug("Payload de picking en espera", extra=fields(payload=self.waiting_data))
+        self.patch_waiting_panel()
+
+    def patch_waiting_panel(self):
+        """
+        Ajusta el panel a self.waiting_data sin reconstruirlo: solo se crean
+        los ítems nuevos (con su código de barras), se destruyen los que ya no
+        están y se rehacen los que cambiaron. Si cambia el orden se reempaquetan.
+        """
+        wanted = {process.get("id"): process for process in self.waiting_data}
+        for process_id, (process, item_frame, separator) in list(self._waiting_items.items()):
+            if wanted.get(process_id) != process:
+                item_frame.destroy()
+                separator.destroy()
+                del self._waiting_items[process_id]
+
+        if not self.waiting_data:
+            if self._waiting_empty_label is None:
+                self._waiting_empty_label = tk.Label(
+                    self.waiting_frame, 
+                    text="No hay procesos de picking en espera.",
+                    bg="white", 
+                    font=("Arial", 10), 
+                    anchor="center", 
+                    justify="center"
+                )
+                self._waiting_empty_label.pack(pady=10)
+            self._waiting_order = []
+            return
+        if self._waiting_empty_label is not None:
+            self._waiting_empty_label.destroy()
+            self._waiting_empty_label = None
+
+        created = False
+        order = list(wanted)
+        for process_id, process in wanted.items():
+            if process_id not in self._waiting_items:
+                self._waiting_items[process_id] = (process, *self._create_waiting_item(process))
+                created = True
+        if created or order != self._waiting_order:
+            for _, item_frame, separator in self._waiting_items.values():
+                item_frame.pack_forget()
+                separator.pack_forget()
+            for process_id in order:
+                _, item_frame, separator = self._waiting_items[process_id]
+                item_frame.pack(fill="x", pady=5, padx=(30, 10))
+                separator.pack(fill="x", padx=20, pady=10)
+            self._waiting_order = order
+
+    def _create_waiting_item(self, process):
+        """Crea (sin empaquetar) la tarjeta de un proceso en espera y su separador."""
+        item_frame = tk.Frame(self.waiting_frame, bg="white", bd=1, relief="solid")
+
+        name_lbl = tk.Label(item_frame, text=f"Nombre: {process.get('name', '')}",
+                            **CENTERED_LABEL_STYLE)
+        name_lbl.pack(anchor="center", padx=5, pady=2)
+
+        codes = ", ".join([
+            c.get("container", {}).get("bar_code", "") for c in process.get("containers", [])
+        ])
+        codes_lbl = tk.Label(item_frame, text=f"Código de cesta: {codes}",
+                            **CENTERED_LABEL_STYLE)
+        codes_lbl.pack(anchor="center", padx=5, pady=2)
+
+        # Si hay contenedores, tomamos el primero para generar el barcode
+        if process.get("containers"):
+            first_barcode = process.get("containers")[0].get("container", {}).get("bar_code", "")
+            if first_barcode:
+                barcode_w = create_barcode_widget(item_frame, first_barcode)
+                barcode_w.pack(anchor="center", padx=5, pady=5)
+
+        btn_start = tk.Button(
+            item_frame, 
+            text="Iniciar Packing",
+            command=lambda p=process: self.start_packing(p),
+            **BUTTON_STYLE
+        )
+        btn_start.pack(anchor="center", padx=5, pady=5)
+
+        # Agregar una línea separadora
+        separator = tk.Frame(self.waiting_frame, height=2, bg="white")
+        return item_frame, separator
 
     def search_by_barcode(self):
         """Búsqueda rápida de un proceso de picking en espera por código de barras."""
@@ -443,7 +743,7 @@ class PackingListView(tk.Frame):
             messagebox.showwarning("Advertencia", "Por favor ingresa un código de barras.")
             return
 
-        log_message("Buscando proceso de picking con código de barras: " + barcode_value)
+        logger.info("Buscando proceso de picking con código de barras: " + barcode_value)
         process_to_pack = None
         for process in self.waiting_data:
             containers = process.get("containers", [])
@@ -456,54 +756,76 @@ class PackingListView(tk.Frame):
                 break
 
         if not process_to_pack:
-            log_message("No se encontró proceso de picking con el código: " + barcode_value)
+            logger.info("No se encontró proceso de picking con el código: " + barcode_value)
             messagebox.showerror("Error", f"No se encontró proceso de picking con el código de barras: {barcode_value}.")
             return
 
         # Iniciar el packing
         self.start_packing(process_to_pack)
 
-    def search(self):
-        query = self.search_entry.get().strip()
-        log_message(f"Buscando procesos con query: {query}")
-        url = f"{API_ROUTES['PACKING_LIST']}?q={query}"
-        response = self.login_controller.api_client._make_get_request(url)
-        log_message(f"Respuesta de búsqueda: {response}")
+    # Espera tras la última tecla antes de filtrar y antes de preguntar al servidor
+    SEARCH_DEBOUNCE_MS = 150
+    SERVER_SEARCH_DEBOUNCE_MS = 600
 
-        if response is None or not isinstance(response, dict) or not response.get("success"):
-            messagebox.showerror("Error", "No se pudo obtener los resultados de búsqueda.")
+    def _on_search_key(self, event):
+        if event.keysym == "Return":
             return
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DEBOUNCE_MS, self.search)
 
-        data = response.get("data", {})
-        packing_obj = data.get("packing_processes", {})
-        processes = packing_obj.get("data", [])
-        log_message("Procesos encontrados: " + str(processes))
-
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
-        for process in processes:
-            pid = process.get("id", "")
-            name = process.get("name", "")
-            started_at = process.get("started_at", "")
-            finished_at = process.get("finished_at", "")
-            status = "Proceso Finalizado" if finished_at else "Packing - En Proceso"
-            user = process.get("created_by", {}).get("name", "")
-            actions = "Ver Proceso"
-            self.tree.insert("", "end", values=(pid, name, started_at, finished_at, status, user, actions))
+    def search(self):
+        """
+        Filtra al instante con el índice local. Si no están cargadas todas las
+        páginas, pide además al servidor (?q=) lo que falte. Una consulta nueva
+        cancela la anterior: su petición no se corta a medias, pero la respuesta
+        no se descarga ni se decodifica y nunca llega a la tabla.
+        """
+        self._search_after_id = None
+        query = self.search_entry.get().strip()
+        if query == "Buscar por nombre":
+            query = ""
+        if query == self.search_query:
+            return
+        logger.info(f"Buscando procesos con query: {query}")
+        self.search_query = query
+        self._keep_table_position = False
+
+        if self._server_search_after_id is not None:
+            self.after_cancel(self._server_search_after_id)
+            self._server_search_after_id = None
+        # La consulta anterior aún en curso se cancela (ver _fetch_processes_page)
+        if self.search_source is not None:
+            self.search_source.cancel()
+        self.search_source = None
+
+        self._refresh_process_table()
+        if query and self.process_source.has_more:
+            self._server_search_after_id = self.after(self.SERVER_SEARCH_DEBOUNCE_MS, self._search_server)
+
+    def _search_server(self):
+        self._server_search_after_id = None
+        if not self.search_query:
+            return
+        source = PaginatedSource(None)
+        source.fetch_page = functools.partial(self._fetch_processes_page, query=self.search_query, cancelled=source.cancelled)
+        self.search_source = source
+        source.reset()
+        self._refresh_process_table()
+        self._schedule_process_poll()
 
     def start_packing(self, process):
         """
         Llama a la API para crear/iniciar el proceso de packing (POST).
         Si es exitoso, imprime la etiqueta desde la URL proporcionada y navega a la vista de detalle.
         """
-        from components.print_component import print_from_url  # Importamos aquí para evitar circular imports
+        from components.print_component import print_process_label  # Importamos aquí para evitar circular imports
 
         process_id = process.get("id")
-        log_message(f"Iniciando proceso de packing para id: {process_id}")
+        logger.info(f"Iniciando proceso de packing para id: {process_id}")
         endpoint = API_ROUTES["PACKING_CREATE"].format(id=process_id)
         result = self.login_controller.api_client._make_post_request(endpoint, {})
-        log_message(f"Resultado de iniciar packing: {result}")
+        logger.debug("Resultado de iniciar packing", extra=fields(payload=result))
 
         if result and isinstance(result, dict) and result.get("success"):
             # Extraemos los datos de la respuesta
@@ -512,74 +834,73 @@ class PackingListView(tk.Frame):
             process_name = process.get("name", "Sin nombre")
 
             # Mostramos notificación de éxito
-            log_message(f"Proceso de packing iniciado para: {process_name}")
+            logger.info(f"Proceso de packing iniciado para: {process_name}")
             messagebox.showinfo("Proceso Iniciado", f"Se inició el proceso de packing para {process_name}.")
 
-            # Imprimimos la etiqueta si hay una URL válida
+            # Encolamos la etiqueta si hay una URL válida (se imprime en segundo plano)
             if label_url:
-                log_message(f"Imprimiendo etiqueta desde URL: {label_url}")
+                logger.info(f"Imprimiendo etiqueta desde URL: {label_url}")
                 try:
-                    print_from_url(label_url)
-                    log_message("Etiqueta enviada a impresión correctamente.")
+                    print_process_label(process, label_url, description=f"proceso {process_name}")
+                    logger.info("Etiqueta encolada para impresión.")
                 except Exception as e:
-                    log_message(f"Error al imprimir la etiqueta: {str(e)}")
+                    logger.exception(f"Error al imprimir la etiqueta: {e}")
                     messagebox.showerror("Error de Impresión", f"No se pudo imprimir la etiqueta: {str(e)}")
             else:
-                log_message("No se proporcionó URL de etiqueta en la respuesta.")
+                logger.info("No se proporcionó URL de etiqueta en la respuesta.")
 
             # Navegamos a la vista de detalle
             # Usamos el ID del proceso de packing devuelto por la API si está disponible,
             # de lo contrario, usamos el process_id original
             new_process_id = packing_process.get("id", process_id)
-            log_message(f"Navegando a detalle con ID: {new_process_id}")
+            logger.info(f"Navegando a detalle con ID: {new_process_id}")
             self.on_show_detail(new_process_id)
 
         else:
             # Manejo de error
             error_msg = result.get("message", "Error desconocido") if result else "Respuesta inválida de la API"
-            log_message(f"Error al iniciar el proceso de packing para id: {process_id} - {error_msg}")
+            logger.error(f"Error al iniciar el proceso de packing para id: {process_id} - {error_msg}")
             messagebox.showerror("Error", f"No se pudo iniciar el proceso de packing: {error_msg}")
 
     def on_row_double_click(self, event):
         """
         Al hacer doble clic en un proceso de la tabla, mostramos su detalle.
         """
-        try:
-            item_id = self.tree.selection()[0]
-        except IndexError:
-            log_message("No se ha seleccionado ningún elemento.")
+        process = self.process_table.selected_row()
+        if process is None:
+            logger.debug("No se ha seleccionado ningún elemento.")
             return
 
-        item = self.tree.item(item_id)
-        values = item["values"]
-        process_id = values[0]
-        log_message(f"Mostrando detalles para el proceso id: {process_id}")
+        process_id = process.get("id")
+        logger.info(f"Mostrando detalles para el proceso id: {process_id}")
         self.on_show_detail(process_id)
 
     def on_show_detail(self, process_id):
-        # En lugar de self.destroy():
-        self.pack_forget()  # o self.grid_forget() si usas grid
-
         from views.warehouse.packing.show_view import PackingShowView
-        self.detail_view = PackingShowView(
-            master=self.master,
+        self.detail_view = self.router.push(lambda master: PackingShowView(
+            master=master,
             process_id=process_id,
             login_controller=self.login_controller,
             on_back=self.show_list_view  # cuando vuelvas, restauras la lista
-        )
-        self.detail_view.pack(expand=True, fill="both")
-
+        ))
 
     def show_list_view(self):
         """
-        Cuando volvemos desde la vista de detalle a esta vista (opcional).
+        Vuelve desde la vista de detalle: destruye el detalle y muestra esta
+        misma vista tal como se dejó (ver on_view_shown).
         """
-        for widget in self.master.winfo_children():
-            widget.destroy()
+        self.router.back()
+        self.detail_view = None
 
-        # Volvemos a crear la vista actual
-        list_view = PackingListView(master=self.master, login_controller=self.login_controller)
-        list_view.pack(expand=True, fill="both")
+    def on_view_hidden(self):
+        """Con el detalle abierto encima el panel no se ve: el feed deja de escuchar y sondear."""
+        self.waiting_feed.pause()
+
+    def on_view_shown(self):
+        """Al volver a mostrarse: refresco suave en segundo plano (conserva scroll y selección)."""
+        logger.info("Vista de procesos restaurada; refrescando en segundo plano")
+        self.waiting_feed.resume()
+        self.fetch_and_populate()
 
     def handle_logout(self):
         for widget in self.master.winfo_children():
@@ -592,11 +913,11 @@ class PackingListView(tk.Frame):
         Imprime el documento especificado usando la impresora seleccionada.
         """
         try:
-            log_message(f"Enviando {file_path} a la impresora: {self.selected_printer}")
-            win32api.ShellExecute(0, "print", file_path, f'/d:"{self.selected_printer}"', ".", 0)
+            logger.info(f"Enviando {file_path} a la impresora: {self.selected_printer}")
+            print_document(file_path, self.selected_printer)
             messagebox.showinfo("Impresión", f"Documento enviado a {self.selected_printer}")
         except Exception as e:
-            log_message(f"Error al imprimir: {e}")
+            logger.exception(f"Error al imprimir: {e}")
             messagebox.showerror("Error", f"Error al imprimir: {str(e)}")
 
 
@@ -1,47 +1,64 @@
-import math
-import os
+import time
+import queue
+import threading
 import subprocess
 import tempfile
 import requests
 import tkinter as tk
 from tkinter import messagebox, ttk
-from datetime import datetime
-import json
-import winsound
+from urllib.parse import urlencode
 import webbrowser
-from playsound import playsound
-
-import win32api
-import win32print
 
 from PIL import Image, ImageTk
 from io import BytesIO
 from config.settings import API_BASE_URL
 from services.api_routes import API_ROUTES
 from assets.css.styles import PRIMARY_COLOR, BACKGROUND_COLOR_VIEWS, LABEL_STYLE, BUTTON_STYLE
-from components.print_component import print_from_url
-
-JSON_CONFIG_FILE = "printer_config.json"
+from components.print_component import (
+    print_from_url, print_order_label, reprint_cached_label, get_print_spooler, get_default_printer
+)
+from components.print_status import PrintStatusLabel
+from components.tree_model import TreeModel
+from models.confirmed_orders import ConfirmedOrders, COLUMNS as CONFIRMED_COLUMNS
+from controllers.warehouse.packing_engine import PackingEngine, SCAN_NOT_IN_ORDER, SCAN_ALREADY_COMPLETE
+from services.paginated_source import PaginatedSource
+from services.settings_store import get_printer_settings
+from services.logger import get_logger, fields
+from services.tracing import get_tracer, traced
+from services.audio_cues import get_audio_cues, CUE_ERROR
+from services.scan_journal import get_scan_journal
+
+logger = get_logger(__name__)
 
 
 def load_printer_config():
     """
-    Carga la impresora seleccionada desde un archivo JSON.
+    Retorna la impresora seleccionada de la configuración en memoria.
     Estructura esperada:
     {
         "selected_printer": "NombreDeLaImpresora"
     }
     """
-    if not os.path.exists(JSON_CONFIG_FILE):
-        return None
+    return get_printer_settings().get("selected_printer")
+
+
+def decode_thumbnail(content, size=(50, 50)):
+    """Miniatura (PIL) de la imagen descargada de un producto."""
+    image = Image.open(BytesIO(content))
+    image.thumbnail(size)
+    return image
 
-    try:
-        with open(JSON_CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("selected_printer", None)
-    except Exception as e:
-        print(f"Error al cargar la impresora desde {JSON_CONFIG_FILE}: {e}")
-        return None
+def product_row_values(info):
+    """Columnas de la tabla de productos del pedido actual."""
+    return (info["name"], info["referencia"], info["sku"], f"{info['scanned']}/{info['required']}")
+
+def product_scan_tag(info):
+    """Tag de color de la fila de un producto según lo escaneado."""
+    if info["scanned"] == 0:
+        return "pending"
+    if info["scanned"] < info["required"]:
+        return "partial"
+    return "complete"
 
 
 class PackingShowView(tk.Frame):
@@ -73,16 +90,30 @@ class PackingShowView(tk.Frame):
         self.on_back = on_back
 
         # Carga impresora seleccionada o default
-        self.selected_printer = load_printer_config() or win32print.GetDefaultPrinter()
-        print(f"[DEBUG] Impresora inicial (PackingShowView): {self.selected_printer}")
+        self.selected_printer = load_printer_config() or get_default_printer()
+        logger.debug(f"Impresora inicial (PackingShowView): {self.selected_printer}")
 
         # Variables de estado
-        self.pending_process_order = None   # Orden actual (packing_process_order)
-        self.current_order_products = []    # Productos del pedido actual
-        self.scanned_quantities = {}        # { product_id: {...} }
-        self.confirmed_orders_data = []     # Lista de órdenes confirmadas
+        # Pedido en curso, escaneos y confirmación (pending_process_order y
+        # scanned_quantities son los del motor)
+        self.engine = PackingEngine(login_controller.api_client, process_id, journal=get_scan_journal())
+        self.confirmed_orders = ConfirmedOrders()  # Órdenes confirmadas (columnas ya parseadas)
+        self.confirmed_source = None        # PaginatedSource si la API pagina las confirmadas
+        self._confirmed_poll_id = None
         self.total_orders_count = 0         # Cantidad total de pedidos en este packing
         self.completed_orders_count = 0     # Cuántas ya finalizadas
+        self._order_span = None             # Traza del pedido en curso (escaneo -> etiqueta)
+
+        # Carga progresiva: esqueleto -> proceso + productos -> órdenes confirmadas e imágenes
+        self._opened_at = time.time()       # Para medir el tiempo hasta el primer escaneo
+        self._scan_ready_at = None
+        self._first_scan_done = False
+        self._detail_poll_id = None
+        self._image_poll_id = None
+        self._image_results = queue.Queue()
+        self._images_loading = set()        # product_id con imagen en descarga
+        self.confirmed_model = None         # La tabla de confirmadas se construye al final
+        self.lbl_orders_counter = None
 
         # Diccionarios para imágenes y mapeo entre fila y producto
         self.product_images = {}            # Almacena PhotoImage de cada producto
@@ -103,13 +134,27 @@ class PackingShowView(tk.Frame):
         self.order_progress = None
         self.lbl_order_progress_info = None
 
-        # Construye la interfaz
+        # Construye el esqueleto y pide los datos en segundo plano
         self.create_widgets()
-        # Carga datos iniciales
-        self.fetch_process_detail()
+        self.bind("<Destroy>", self._on_destroy_progressive, add="+")
+        self.lbl_scan_message.config(text="Cargando proceso...", fg="blue")
+        self.entry_barcode.config(state="disabled")
+        self._load_process_detail_async()
+
+    @property
+    def pending_process_order(self):
+        """Orden actual (models.packing.PackingProcessOrder) o None."""
+        return self.engine.pending_order
+
+    @property
+    def scanned_quantities(self):
+        """{ product_id: {...} }: filas de la tabla de productos del pedido actual."""
+        return self.engine.scanned_quantities
+
     def play_error_sound(self):
-            mp3_path = os.path.join("assets", "mp3", "error_alert.mp3")
-            playsound(mp3_path)
+        # Asíncrono: el sonido ya está cargado y el escaneo siguiente no espera a que termine
+        get_audio_cues().play(CUE_ERROR)
+
     # --------------------------------------------------------------------------
     # Creación de widgets y distribución visual
     # --------------------------------------------------------------------------
@@ -195,10 +240,13 @@ class PackingShowView(tk.Frame):
         self.products_frame.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
         self.create_products_table_panel(self.products_frame)
 
-        # Fila 1: Órdenes confirmadas
+        # Fila 1: Órdenes confirmadas (la tabla se construye cuando ya se puede escanear)
         self.confirmed_orders_frame = tk.Frame(bottom_content_frame, bg="white", bd=2, relief="ridge")
         self.confirmed_orders_frame.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
-        self.create_confirmed_orders_table()
+        self.lbl_confirmed_loading = tk.Label(
+            self.confirmed_orders_frame, text="Cargando órdenes confirmadas...", font=("Arial", 12), bg="white"
+        )
+        self.lbl_confirmed_loading.pack(pady=10)
 
     def create_header(self):
         """
@@ -216,6 +264,16 @@ class PackingShowView(tk.Frame):
         )
         title_lbl.pack(side="left", padx=5)
 
+        # Estado de la cola de impresión (se actualiza desde el spooler)
+        self.print_status = PrintStatusLabel(
+            header_frame,
+            spooler=get_print_spooler(),
+            font=("Arial", 10),
+            bg=PRIMARY_COLOR,
+            fg="white"
+        )
+        self.print_status.pack(side="left", padx=15)
+
         btn_container = tk.Frame(header_frame, bg=PRIMARY_COLOR, padx=5, pady=5)
         btn_container.pack(side="right", padx=2, pady=2)
 
@@ -297,6 +355,9 @@ class PackingShowView(tk.Frame):
         self.lbl_scan_message = tk.Label(scan_frame, text="", font=("Arial", 12), bg="white", fg="blue")
         self.lbl_scan_message.pack(side="left", padx=5)
 
+        # Solo se muestra si falla la carga inicial del proceso (ver _offer_detail_retry)
+        self.btn_retry_detail = tk.Button(scan_frame, text="Reintentar", command=self._retry_process_detail, **BUTTON_STYLE)
+
     # --------------------------------------------------------------------------
     # Panel: Información del Proceso (Columna 2)
     # --------------------------------------------------------------------------
@@ -463,6 +524,15 @@ class PackingShowView(tk.Frame):
 
         self.current_order_tree.bind("<Double-1>", self.on_product_double_click)
 
+        # Filas con clave = id de producto: un escaneo solo reescribe su celda
+        self.current_order_model = TreeModel(
+            self.current_order_tree,
+            key=lambda info: info["product_id"],
+            row_values=product_row_values,
+            row_tags=lambda info: (product_scan_tag(info),),
+            row_image=lambda info: self.product_images.get(info["product_id"])
+        )
+
     # --------------------------------------------------------------------------
     # Tabla de Órdenes Confirmadas
     # --------------------------------------------------------------------------
@@ -482,7 +552,7 @@ class PackingShowView(tk.Frame):
         )
         self.lbl_orders_counter.pack()
 
-        columns = ("Orden #", "Productos", "Duración (seg)", "Acciones")
+        columns = CONFIRMED_COLUMNS
         self.confirmed_tree = ttk.Treeview(
             self.confirmed_orders_frame,
             columns=columns,
@@ -492,7 +562,7 @@ class PackingShowView(tk.Frame):
             self.confirmed_tree.heading(
                 col,
                 text=col,
-                command=lambda _col=col: self.sort_column(_col, False)
+                command=lambda _col=col: self.sort_column(_col, self.sort_directions.get(_col, False))
             )
             width = 200 if col == "Acciones" else 140
             self.confirmed_tree.column(col, anchor="center", width=width)
@@ -503,6 +573,8 @@ class PackingShowView(tk.Frame):
         self.confirmed_tree.pack(expand=True, fill="both")
 
         self.confirmed_tree.bind("<Double-1>", self.on_confirmed_order_double_click)
+        self.confirmed_tree.bind("<Button-1>", self.on_tree_click)
+        self.confirmed_model = TreeModel(self.confirmed_tree, key=lambda row: row[0], row_values=lambda row: row)
 
         pag_frame = tk.Frame(self.confirmed_orders_frame, bg="white")
         pag_frame.pack(fill="x", padx=10, pady=5)
@@ -520,6 +592,7 @@ class PackingShowView(tk.Frame):
     # Botón "Salir"
     # --------------------------------------------------------------------------
     def on_back_button(self):
+        self._end_order_trace()
         if self.on_back:
             self.on_back()
         else:
@@ -530,8 +603,7 @@ class PackingShowView(tk.Frame):
     # --------------------------------------------------------------------------
     def update_progress_bars(self):
         # PRODUCTOS
-        total_required = sum(info["required"] for info in self.scanned_quantities.values())
-        total_scanned = sum(info["scanned"] for info in self.scanned_quantities.values())
+        total_scanned, total_required = self.engine.product_progress()
 
         if total_required > 0:
             prod_progress_value = (total_scanned / total_required) * 100
@@ -560,40 +632,114 @@ class PackingShowView(tk.Frame):
     # --------------------------------------------------------------------------
     # Fetch data & Update UI
     # --------------------------------------------------------------------------
+    def _request_process_detail(self):
+        """Pide el detalle y lo decodifica a ProcessDetail (None si falla), fuera de la interfaz si se llama desde un hilo."""
+        return self.engine.fetch_detail()
+
+    @traced("fetch_process_detail")
     def fetch_process_detail(self):
-        endpoint = API_ROUTES["PACKING_VIEW"].format(id=self.process_id)
-        response = self.login_controller.api_client._make_get_request(endpoint)
-        if not response or not response.get("success"):
+        self.apply_process_detail(self._request_process_detail())
+
+    def _load_process_detail_async(self):
+        """Primera carga: la petición va en un hilo para que el esqueleto se pinte ya."""
+        results = queue.Queue()
+
+        def worker():
+            with get_tracer().span("fetch_process_detail", process_id=self.process_id, background=True):
+                results.put(self._request_process_detail())
+
+        threading.Thread(target=worker, name="PackingDetail", daemon=True).start()
+        self._poll_process_detail(results)
+
+    def _poll_process_detail(self, results):
+        try:
+            detail = results.get_nowait()
+        except queue.Empty:
+            self._detail_poll_id = self.after(30, self._poll_process_detail, results)
+            return
+        self._detail_poll_id = None
+        self.lbl_scan_message.config(text="")
+        self.apply_process_detail(detail)
+        if detail is None:
+            self._offer_detail_retry()
+            return
+        # Lo que no hace falta para escanear, después de pintar lo anterior
+        self.after_idle(self._build_confirmed_orders_table)
+
+    def _offer_detail_retry(self):
+        """La carga inicial falló: sin detalle no se puede escanear, se ofrece repetirla."""
+        self.entry_barcode.config(state="disabled")
+        self.lbl_scan_message.config(text="No se pudo cargar el proceso.", fg="red")
+        self.btn_retry_detail.pack(side="left", padx=5)
+
+    def _retry_process_detail(self):
+        logger.info("Reintentando la carga del proceso", extra=fields(process_id=self.process_id))
+        self.btn_retry_detail.pack_forget()
+        self.lbl_scan_message.config(text="Cargando proceso...", fg="blue")
+        self._load_process_detail_async()
+
+    def _build_confirmed_orders_table(self):
+        if self.confirmed_model is not None or not self.winfo_exists():
+            return
+        self.lbl_confirmed_loading.destroy()
+        self.create_confirmed_orders_table()
+        self.refresh_table_page()
+        self.refresh_orders_counter_label()
+
+    def _on_destroy_progressive(self, event):
+        if event.widget is not self:
+            return
+        for attr in ("_detail_poll_id", "_image_poll_id", "_confirmed_poll_id"):
+            after_id = getattr(self, attr)
+            if after_id is not None:
+                self.after_cancel(after_id)
+                setattr(self, attr, None)
+
+    def _mark_scan_ready(self):
+        """Registra (una vez) cuánto tardó la vista en aceptar escaneos desde que se abrió."""
+        if self._scan_ready_at is not None:
+            return
+        self._scan_ready_at = time.time()
+        ready_ms = (self._scan_ready_at - self._opened_at) * 1000.0
+        get_tracer().record("show_view.scan_ready", self._opened_at, self._scan_ready_at, process_id=self.process_id)
+        logger.info(f"Vista lista para escanear en {ready_ms:.0f} ms",
+                    extra=fields(process_id=self.process_id, scan_ready_ms=round(ready_ms, 1)))
+
+    def _mark_first_scan(self):
+        """Registra el tiempo hasta el primer escaneo (apertura de la vista -> primer código leído)."""
+        if self._first_scan_done:
+            return
+        self._first_scan_done = True
+        now = time.time()
+        first_scan_ms = (now - self._opened_at) * 1000.0
+        get_tracer().record("show_view.first_scan", self._opened_at, now, process_id=self.process_id)
+        logger.info(f"Primer escaneo a los {first_scan_ms:.0f} ms de abrir la vista",
+                    extra=fields(process_id=self.process_id, first_scan_ms=round(first_scan_ms, 1)))
+
+    def apply_process_detail(self, detail):
+        """Pinta el detalle del proceso (ProcessDetail): cabecera, pedido en curso y sus productos."""
+        if detail is None:
             messagebox.showerror("Error", "No se pudo obtener el detalle del proceso de Packing.")
             return
 
-        data = response.get("data", {})
-        process = data.get("process", {})
+        process = detail.process
 
-        self.lbl_nombre.config(text=f"Nombre: {process.get('name', 'N/A')}")
-        self.lbl_iniciado.config(text=f"Iniciado: {process.get('started_at', 'N/A')}")
-        finished_at = process.get("finished_at")
-        fin_text = finished_at if finished_at else "En Proceso"
+        self.lbl_nombre.config(text=f"Nombre: {process.name}")
+        self.lbl_iniciado.config(text=f"Iniciado: {process.started_at or 'N/A'}")
+        fin_text = process.finished_at if process.finished_at else "En Proceso"
         self.lbl_finalizado.config(text=f"Finalizado: {fin_text}")
+        self.lbl_creado_por.config(text=f"Creado por: {process.created_by_name}")
 
-        creador = process.get("created_by", "N/A")
-        if isinstance(creador, dict):
-            creador = creador.get("name", "N/A")
-        self.lbl_creado_por.config(text=f"Creado por: {creador}")
-
-        confirmed_orders = data.get("confirmedOrders", {})
-        self.update_confirmed_orders_table(confirmed_orders)
+        self.update_confirmed_orders_table(detail.confirmed_orders)
 
-        packing_orders = process.get("packing_process_orders", [])
-        self.total_orders_count = len(packing_orders)
+        self.total_orders_count = len(process.orders)
+        self.completed_orders_count = process.completed_count
 
-        finished_list = [po for po in packing_orders if po.get("finished_at")]
-        self.completed_orders_count = len(finished_list)
+        # Orden pendiente (y lo ya escaneado de ella, si quedó en el diario)
+        self.engine.load(detail)
 
-        all_finished = (len(packing_orders) > 0 and all(o.get("finished_at") for o in packing_orders))
-
-        if finished_at or all_finished:
-            self.pending_process_order = None
+        if self.engine.finished:
+            self._end_order_trace()
             self.clear_current_order_table()
             self.lbl_order_id.config(text="Pedido ID: -- (Finalizado)")
             self.lbl_shipping_method.config(text="Método de envío: -- (Finalizado)", fg="black")
@@ -603,42 +749,32 @@ class PackingShowView(tk.Frame):
                 self.on_back()
             return
 
-        # Orden pendiente
-        self.pending_process_order = data.get("pendingProcessOrder")
-        if not self.pending_process_order:
-            not_finished = [po for po in packing_orders if not po.get("finished_at")]
-            if not_finished:
-                self.pending_process_order = not_finished[0]
-
         if not self.pending_process_order:
+            self._end_order_trace()
             self.clear_current_order_table()
             self.refresh_orders_counter_label()
             return
 
-        order_data = self.pending_process_order.get("order", {})
-        self.lbl_order_id.config(text=f"Pedido ID: {order_data.get('id', '')}")
-        self.lbl_order_name.config(text=f"Cliente: {order_data.get('name', '')}")
-
-        address_line = order_data.get("address", "")
-        address_line_2 = order_data.get("address_2", "")
-        if address_line_2:
-            address_line += f" / {address_line_2}"
-        self.lbl_order_address.config(text=f"Dirección: {address_line}")
-        self.lbl_order_city.config(text=f"Ciudad: {order_data.get('city', '')}")
-        self.lbl_order_province.config(text=f"Provincia: {order_data.get('province', '')}")
-        self.lbl_order_zip.config(text=f"C.P.: {order_data.get('zip', '')}")
-        self.lbl_order_country.config(text=f"País: {order_data.get('country_code', '')}")
-
-        shipping_method = order_data.get("shipping_method_name", "N/A")
+        order = self.pending_process_order.order
+        self._start_order_trace(order)
+        self.lbl_order_id.config(text=f"Pedido ID: {order.id or ''}")
+        self.lbl_order_name.config(text=f"Cliente: {order.name}")
+        self.lbl_order_address.config(text=f"Dirección: {order.address_line}")
+        self.lbl_order_city.config(text=f"Ciudad: {order.city}")
+        self.lbl_order_province.config(text=f"Provincia: {order.province}")
+        self.lbl_order_zip.config(text=f"C.P.: {order.zip}")
+        self.lbl_order_country.config(text=f"País: {order.country_code}")
+
+        shipping_method = order.shipping_method_name or "N/A"
         self.lbl_shipping_method.config(text=f"Método de envío: {shipping_method}", fg="red")
 
-        self.scanned_quantities = {}
-        self.current_order_products = self.pending_process_order.get("packing_process_order_product", [])
         self.populate_current_order_products_table()
+        self._report_restored_scans()
 
         self.entry_barcode.config(state="normal")
         self.entry_barcode.delete(0, tk.END)
         self.entry_barcode.focus()
+        self._mark_scan_ready()
 
         self.refresh_orders_counter_label()
         self.update_progress_bars()
@@ -647,56 +783,77 @@ class PackingShowView(tk.Frame):
     # Tabla de productos
     # --------------------------------------------------------------------------
     def clear_current_order_table(self):
-        for row in self.current_order_tree.get_children():
-            self.current_order_tree.delete(row)
+        self.current_order_model.clear()
 
     def populate_current_order_products_table(self):
-        self.clear_current_order_table()
         self.tree_row_to_product = {}
 
-        for line in self.current_order_products:
-            product_data = line.get("product", {})
-            p_id = product_data.get("id")
-            p_name = product_data.get("name", "")
-            p_sku = product_data.get("sku", "")
-            p_bar = product_data.get("bar_code", "")
-            p_qty = line.get("quantity", 0)
-            warehouse_code = product_data.get("warehouse_code", "N/A")
-            referencia = f"{warehouse_code} - {p_name} - {p_sku}"
-
-            image_url = product_data.get("image_url")
-            photo = None
-            if image_url:
+        for p_id, info in self.scanned_quantities.items():
+            row_id = TreeModel.iid_for(p_id)
+            info["row_id"] = row_id
+            self.tree_row_to_product[row_id] = p_id
+
+        # Se reconcilia con lo que ya muestra la tabla (mismo pedido = sin cambios)
+        self.current_order_model.sync(list(self.scanned_quantities.values()))
+        # Las imágenes llegan después (en segundo plano) y rellenan la columna #0
+        self._load_product_images_async()
+
+    def _report_restored_scans(self):
+        """
+        Avisa si el motor recuperó del diario lo escaneado del pedido (la app se
+        cerró a mitad de pedido). Si ya estaba todo escaneado (p.ej. se cortó
+        durante la confirmación), se vuelve a pedir la confirmación.
+        """
+        total = self.engine.restored_units
+        if not total:
+            return
+        logger.info(f"Progreso del pedido recuperado del diario: {total} unidades escaneadas",
+                    extra=fields(process_id=self.process_id, packing_process_order_id=self.pending_process_order.id))
+        self.lbl_scan_message.config(text=f"Progreso recuperado: {total} unidades ya escaneadas.", fg="blue")
+        if self.all_products_complete():
+            self.after_idle(self.confirm_current_order)
+
+    def _load_product_images_async(self):
+        missing = [
+            (p_id, info["image_url"]) for p_id, info in self.scanned_quantities.items()
+            if info["image_url"] and p_id not in self.product_images and p_id not in self._images_loading
+        ]
+        if not missing:
+            return
+        self._images_loading.update(p_id for p_id, _ in missing)
+
+        def worker():
+            for p_id, image_url in missing:
+                pil_image = None
                 try:
-                    resp = requests.get(image_url)
+                    resp = requests.get(image_url, timeout=10)
                     if resp.status_code == 200:
-                        image_data = BytesIO(resp.content)
-                        pil_image = Image.open(image_data)
-                        pil_image.thumbnail((50, 50))
-                        photo = ImageTk.PhotoImage(pil_image)
-                        self.product_images[p_id] = photo
+                        pil_image = decode_thumbnail(resp.content)
                 except Exception as e:
-                    print(f"Error al cargar imagen {image_url}: {e}")
-
-            row_id = self.current_order_tree.insert(
-                "",
-                "end",
-                text="",
-                image=photo,
-                values=(p_name, referencia, p_sku, f"0/{p_qty}"),
-                tags=("pending",)
-            )
-            self.scanned_quantities[p_id] = {
-                "scanned": 0,
-                "required": p_qty,
-                "row_id": row_id,
-                "sku": p_sku,
-                "bar_code": p_bar,
-                "image_url": image_url,
-                "name": p_name,
-                "warehouse_code": warehouse_code
-            }
-            self.tree_row_to_product[row_id] = p_id
+                    logger.error(f"Error al cargar imagen {image_url}: {e}")
+                self._image_results.put((p_id, pil_image))
+
+        threading.Thread(target=worker, name="PackingImages", daemon=True).start()
+        if self._image_poll_id is None:
+            self._image_poll_id = self.after(100, self._poll_product_images)
+
+    def _poll_product_images(self):
+        """Crea los PhotoImage en el hilo de Tk y actualiza solo la fila de cada producto."""
+        self._image_poll_id = None
+        while True:
+            try:
+                p_id, pil_image = self._image_results.get_nowait()
+            except queue.Empty:
+                break
+            self._images_loading.discard(p_id)
+            if pil_image is None:
+                continue
+            self.product_images[p_id] = ImageTk.PhotoImage(pil_image)
+            info = self.scanned_quantities.get(p_id)
+            if info is not None:
+                self.current_order_model.update(info)
+        if self._images_loading:
+            self._image_poll_id = self.after(100, self._poll_product_images)
 
     # --------------------------------------------------------------------------
     # Escaneo de productos
@@ -707,64 +864,44 @@ class PackingShowView(tk.Frame):
 
         if not self.pending_process_order:
             return
+        self._mark_first_scan()
 
-        matched_id = self.find_product_id_by_scan(scanned_code)
-        if matched_id is None:
-            self.play_error_sound()
-            self.lbl_scan_message.config(text="Producto NO pertenece al pedido.", fg="red")
-            return
-
-        info = self.scanned_quantities.get(matched_id)
-        if not info:
-            self.play_error_sound()
-            self.lbl_scan_message.config(text="Error interno al escanear.", fg="red")
-            return
+        with get_tracer().span("scan", parent=self._order_span, code=scanned_code) as span:
+            status, matched_id = self.engine.scan(scanned_code)
+            if status == SCAN_NOT_IN_ORDER:
+                span.set_attribute("result", status)
+                self.play_error_sound()
+                self.lbl_scan_message.config(text="Producto NO pertenece al pedido.", fg="red")
+                return
 
-        if info["scanned"] >= info["required"]:
-            self.play_error_sound()
-            self.lbl_scan_message.config(text="Este producto ya está completo.", fg="red")
-            return
+            if status == SCAN_ALREADY_COMPLETE:
+                span.set_attribute("result", status)
+                self.play_error_sound()
+                self.lbl_scan_message.config(text="Este producto ya está completo.", fg="red")
+                return
 
-        info["scanned"] += 1
-        self.update_product_row(matched_id)
-        self.lbl_scan_message.config(text="")
+            span.set_attributes(result=status, product_id=matched_id)
+            self.update_product_row(matched_id)
+            self.lbl_scan_message.config(text="")
 
-        self.update_progress_bars()
+            self.update_progress_bars()
 
         if self.all_products_complete():
             self.confirm_current_order()
 
 
     def find_product_id_by_scan(self, scanned_code):
-        for p_id, info in self.scanned_quantities.items():
-            if scanned_code == info.get("bar_code") or scanned_code == info.get("sku"):
-                return p_id
-        return None
+        return self.engine.find_product_id_by_scan(scanned_code)
 
     def update_product_row(self, product_id):
         info = self.scanned_quantities.get(product_id)
         if not info:
             return
 
-        row_id = info["row_id"]
-        scanned = info["scanned"]
-        required = info["required"]
-
-        old_vals = self.current_order_tree.item(row_id, "values")
-        new_col = f"{scanned}/{required}"
-        new_values = (old_vals[0], old_vals[1], old_vals[2], new_col)
-
-        if scanned == 0:
-            tag = "pending"
-        elif scanned < required:
-            tag = "partial"
-        else:
-            tag = "complete"
-
-        self.current_order_tree.item(row_id, values=new_values, tags=(tag,))
+        self.current_order_model.update(info)
 
     def all_products_complete(self):
-        return all(info["scanned"] >= info["required"] for info in self.scanned_quantities.values())
+        return self.engine.all_products_complete()
 
 
 
@@ -848,47 +985,67 @@ class PackingShowView(tk.Frame):
     def confirm_current_order(self):
         if not self.pending_process_order:
             return
-        order_data = self.pending_process_order.get("order", {})
-        expected_tracking_code = order_data.get("tracking_code", "")
-
-        if not self.verify_tracking_code(expected_tracking_code):
-            return
-
-        order_id = self.pending_process_order.get("id")
-        endpoint = API_ROUTES["PACKING_CONFIRM"].format(
-            packingProcessOrder_id=order_id,
-            packingProcess_id=self.process_id
+        order = self.pending_process_order.order
+        expected_tracking_code = order.tracking_code
+        order_span = self._order_span
+
+        with get_tracer().span("confirm", parent=order_span, order_id=order.id) as span:
+            with get_tracer().span("tracking_modal"):
+                verified = self.verify_tracking_code(expected_tracking_code)
+            span.set_attribute("tracking_verified", verified)
+            if not verified:
+                return
+
+            # Envía lo escaneado y, si la API lo acepta, lo quita del diario
+            result = self.engine.confirm()
+            if not result:
+                span.set_error("confirmación rechazada por la API")
+                messagebox.showerror("Error", "No se pudo confirmar la orden en la API.")
+                return
+
+            label_url = result.get("label_url")
+            success_message = "La orden se ha completado correctamente."
+
+            if label_url:
+                try:
+                    if label_url == 0:
+                        success_message += "\nPacking Finalizado!!!."
+                    else:
+                        print_order_label(order.to_dict(), label_url, description=f"pedido {order.id or ''}")
+                        success_message += "\nEtiqueta encolada para imprimir."
+                except Exception as e:
+                    messagebox.showwarning(
+                        "Advertencia", 
+                        f"Orden completada pero error al imprimir etiqueta: {str(e)}"
+                    )
+
+            self.completed_orders_count += 1
+            # El pedido confirmado queda cerrado; fetch_process_detail abre la traza del siguiente
+            self._order_span = None
+            # messagebox.showinfo("Pedido Finalizado", success_message)
+            self.fetch_process_detail()
+        if order_span is not None and self._order_span is not order_span:
+            order_span.end()
+
+    def _start_order_trace(self, order):
+        """Abre la traza del pedido mostrado (si no es el mismo que ya se está trazando)."""
+        order_id = order.id
+        if self._order_span is not None:
+            if self._order_span.attributes.get("order_id") == order_id:
+                return
+            self._end_order_trace()
+        self._order_span = get_tracer().start_span(
+            "order", root=True, order_id=order_id, process_id=self.process_id,
+            shipping_method=order.shipping_method_name,
+            products=len(self.pending_process_order.lines)
         )
 
-        completed_products = []
-        for p_id, info in self.scanned_quantities.items():
-            completed_products.append({"product_id": p_id, "quantity": info["scanned"]})
-
-        payload = {"completedProducts": completed_products}
-        result = self.login_controller.api_client._make_post_request(endpoint, payload)
-        if not result or not result.get("success"):
-            messagebox.showerror("Error", "No se pudo confirmar la orden en la API.")
-            return
-
-        label_url = result.get("label_url")
-        success_message = "La orden se ha completado correctamente."
-        
-        if label_url:
-            try:
-                if label_url == 0:
-                    success_message += "\nPacking Finalizado!!!."
-                else:
-                    print_from_url(label_url)
-                    success_message += "\nEtiqueta enviada a imprimir."
-            except Exception as e:
-                messagebox.showwarning(
-                    "Advertencia", 
-                    f"Orden completada pero error al imprimir etiqueta: {str(e)}"
-                )
-
-        self.completed_orders_count += 1
-        # messagebox.showinfo("Pedido Finalizado", success_message)
-        self.fetch_process_detail()
+    def _end_order_trace(self):
+        """Cierra la traza del pedido en curso sin confirmar (salir de la vista, proceso finalizado...)."""
+        if self._order_span is not None:
+            self._order_span.set_attribute("abandoned", True)
+            self._order_span.end()
+            self._order_span = None
 
     # --------------------------------------------------------------------------
     # Verificación de Tracking Code
@@ -956,52 +1113,66 @@ class PackingShowView(tk.Frame):
     # Órdenes Confirmadas (FILA 1)
     # --------------------------------------------------------------------------
     def update_confirmed_orders_table(self, confirmed):
-        self.confirmed_orders_data = []
-        if not confirmed:
-            self.confirmed_orders_data.append(("Sin órdenes confirmadas", "", "", ""))
+        if isinstance(confirmed, dict) and isinstance(confirmed.get("data"), list):
+            # La API pagina las confirmadas: las páginas siguientes se piden al llegar a ellas
+            if self.confirmed_source is None:
+                self.confirmed_source = PaginatedSource(self._fetch_confirmed_page)
+            self.confirmed_source.prime(confirmed)
+            self.confirmed_orders.load(self.confirmed_source.rows, total=self.confirmed_source.total)
         else:
-            for _, order_info in confirmed.items():
-                order_id = order_info.get("order_id", "")
-                products = order_info.get("products", [])
-                prod_text = "; ".join([f"{p.get('name','')}({p.get('quantity',0)})" for p in products])
-                started_at = order_info.get("started_at", "")
-                finished_at = order_info.get("finished_at", "")
-                if started_at and finished_at:
-                    try:
-                        dt_start = datetime.strptime(started_at, "%Y-%m-%d %H:%M:%S")
-                        dt_finish = datetime.strptime(finished_at, "%Y-%m-%d %H:%M:%S")
-                        duration_seconds = int((dt_finish - dt_start).total_seconds())
-                    except:
-                        duration_seconds = "N/A"
-                else:
-                    duration_seconds = "N/A"
-
-                actions = "Imprimir"
-                self.confirmed_orders_data.append((order_id, prod_text, duration_seconds, actions))
+            self.confirmed_source = None
+            self.confirmed_orders.load(confirmed)
 
         self.current_page = 1
-        self.total_pages = max(1, math.ceil(len(self.confirmed_orders_data) / self.page_size))
+        self.total_pages = self.confirmed_orders.page_count(self.page_size)
         self.refresh_table_page()
         self.refresh_orders_counter_label()
 
+    def _fetch_confirmed_page(self, page):
+        """Página 'page' de las órdenes confirmadas (hilo de la fuente paginada)."""
+        endpoint = API_ROUTES["PACKING_VIEW"].format(id=self.process_id)
+        response = self.login_controller.api_client._make_get_request(
+            f"{endpoint}?{urlencode({'confirmed_page': page})}"
+        )
+        if not response or not response.get("success"):
+            raise RuntimeError("No se pudieron obtener las órdenes confirmadas.")
+        return response.get("data", {}).get("confirmedOrders", {})
+
+    def _poll_confirmed_source(self):
+        self._confirmed_poll_id = None
+        source = self.confirmed_source
+        if source is None:
+            return
+        if source.drain():
+            self.confirmed_orders.load(source.rows, total=source.total)
+            self.total_pages = self.confirmed_orders.page_count(self.page_size)
+            self.refresh_table_page()
+        if source.loading:
+            self._confirmed_poll_id = self.after(100, self._poll_confirmed_source)
+
     def refresh_orders_counter_label(self):
+        if self.lbl_orders_counter is None:
+            return
         self.lbl_orders_counter.config(
             text=f"{self.completed_orders_count}/{self.total_orders_count}"
         )
 
     def refresh_table_page(self):
-        for row in self.confirmed_tree.get_children():
-            self.confirmed_tree.delete(row)
-
-        start_idx = (self.current_page - 1) * self.page_size
-        end_idx = start_idx + self.page_size
-        page_data = self.confirmed_orders_data[start_idx:end_idx]
-
-        for data in page_data:
-            self.confirmed_tree.insert("", "end", values=data)
-
-        self.lbl_page_info.config(text=f"Página {self.current_page} de {self.total_pages}")
-        self.confirmed_tree.bind("<Button-1>", self.on_tree_click)
+        if self.confirmed_model is None:
+            return
+        page_data = self.confirmed_orders.page(self.current_page, self.page_size)
+        if not page_data and not len(self.confirmed_orders):
+            page_data = [("Sin órdenes confirmadas", "", "", "")]
+        self.confirmed_model.sync(page_data)
+
+        page_text = f"Página {self.current_page} de {self.total_pages}"
+        source = self.confirmed_source
+        if source is not None and self.current_page * self.page_size > len(self.confirmed_orders) and source.has_more:
+            # Página aún no descargada (paginación en el servidor)
+            if source.load_more() and self._confirmed_poll_id is None:
+                self._confirmed_poll_id = self.after(100, self._poll_confirmed_source)
+            page_text += " (cargando...)"
+        self.lbl_page_info.config(text=page_text)
 
     def previous_page(self):
         if self.current_page > 1:
@@ -1014,31 +1185,8 @@ class PackingShowView(tk.Frame):
             self.refresh_table_page()
 
     def sort_column(self, col, reverse):
-        col_map = {
-            "Orden #": 0,
-            "Productos": 1,
-            "Duración (seg)": 2,
-            "Acciones": 3
-        }
-        idx = col_map.get(col)
-        if idx is None:
-            return
-
-        if col == "Orden #":
-            try:
-                self.confirmed_orders_data.sort(key=lambda t: int(t[idx]), reverse=reverse)
-            except ValueError:
-                self.confirmed_orders_data.sort(key=lambda t: t[idx], reverse=reverse)
-        elif col == "Duración (seg)":
-            self.confirmed_orders_data.sort(
-                key=lambda t: int(t[idx]) if (isinstance(t[idx], int) or
-                                              (isinstance(t[idx], str) and t[idx].isdigit()))
-                else 0,
-                reverse=reverse
-            )
-        else:
-            self.confirmed_orders_data.sort(key=lambda t: t[idx], reverse=reverse)
-
+        # El modelo guarda la permutación de cada columna: reordenar no reparsea nada
+        self.confirmed_orders.sort(col, reverse)
         self.sort_directions[col] = not reverse
         self.refresh_table_page()
 
@@ -1048,10 +1196,10 @@ class PackingShowView(tk.Frame):
         except IndexError:
             messagebox.showerror("Error", "No se ha seleccionado ninguna orden confirmada.")
             return
-        item = self.confirmed_tree.item(sel_id)
-        values = item["values"]
-        order_val = values[0]
-        order_str = str(order_val)
+        row = self.confirmed_model.row(sel_id)
+        if row is None:
+            return
+        order_str = str(row[0])
         if not order_str.isdigit():
             return
         self.show_order_detail(int(order_str))
@@ -1062,12 +1210,17 @@ class PackingShowView(tk.Frame):
         if not item or column != "#4":  # "#4" = columna "Acciones"
             return
 
-        values = self.confirmed_tree.item(item, "values")
-        order_id = values[0]
+        row = self.confirmed_model.row(item)
+        order_id = str(row[0]) if row else ""
         if order_id.isdigit():
             self.print_order(int(order_id))
 
     def print_order(self, order_id):
+        # Reimpresión: si la etiqueta del pedido está en caché se envía directamente
+        if reprint_cached_label(order_id, description=f"pedido {order_id}"):
+            messagebox.showinfo("Éxito", f"Etiqueta de la orden #{order_id} encolada para impresión.")
+            return
+
         endpoint = API_ROUTES["PACKING_PRINT_ORDER"].format(order_id=order_id)
         response = self.login_controller.api_client._make_get_request(endpoint)
         if not response or not response.get("success"):
@@ -1080,8 +1233,8 @@ class PackingShowView(tk.Frame):
             return
 
         try:
-            print_from_url(label_url)
-            messagebox.showinfo("Éxito", f"Etiqueta de la orden #{order_id} enviada a la impresora.")
+            print_from_url(label_url, description=f"pedido {order_id}", order_id=order_id)
+            messagebox.showinfo("Éxito", f"Etiqueta de la orden #{order_id} encolada para impresión.")
         except Exception as e:
             messagebox.showerror("Error", f"Error al imprimir la orden #{order_id}: {str(e)}")
 